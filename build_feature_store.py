@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import argparse
+import sys
+
+from core.config import load_settings
+from engines.ml_features import MLFeatureBuilder, build_feature_store
+from providers.historical_loader import HistoricalLoader
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Build an offline ML feature store from historical events.")
+    parser.add_argument("--file", required=True, action="append", help="Path to JSON/CSV historical events (repeatable)")
+    parser.add_argument("--out", required=True, help="Output .npz feature store")
+    args = parser.parse_args(argv)
+
+    cfg = load_settings().ui.get("ml_features") or {}
+    events = []
+    for path in args.file:
+        loader = HistoricalLoader()
+        if path.lower().endswith(".json"):
+            loader.load_json(path)
+        else:
+            loader.load_csv(path)
+        events.extend(loader.loaded_events)
+    events.sort(key=lambda e: e.timestamp)
+
+    builder = MLFeatureBuilder(window=int(cfg.get("window", 20)), long_window=int(cfg.get("long_window", 200)))
+    store = build_feature_store(events, builder)
+    store.save(args.out)
+    for symbol in store.symbols:
+        print(f"[FeatureStore] {symbol}: {len(store.timestamps(symbol))} rows x {builder.schema.width} features")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -18,6 +18,7 @@ class EventBus:
     - Non-blocking publish (queue-backed)
     - Per-event-type subscription with optional wildcard "*"
     - Safe shutdown that drains the queue
+    - Event types can be blocked (``block``/``unblock``): dropped at dispatch, queued ones included
     """
 
     def __init__(self, queue_maxsize: int = 0) -> None:
@@ -27,6 +28,8 @@ class EventBus:
         self._running = threading.Event()
         self._running.set()
         self.allowed_sources: set[str] | None = None
+        self.blocked_types: frozenset[str] = frozenset()
+        self.blocked_count = 0
 
         self._worker = threading.Thread(target=self._dispatch_loop, daemon=True)
         self._worker.start()
@@ -69,6 +72,15 @@ class EventBus:
                 if callback in subs:
                     subs[:] = [cb for cb in subs if cb is not callback]
 
+    def block(self, event_types: Iterable[str]) -> None:
+        """Drop events of these types until ``unblock`` (e.g. order flow behind a kill switch)."""
+        with self._lock:
+            self.blocked_types = self.blocked_types | frozenset(event_types)
+
+    def unblock(self, event_types: Iterable[str]) -> None:
+        with self._lock:
+            self.blocked_types = self.blocked_types - frozenset(event_types)
+
     # --------------------------------------------------------
     # PUBLISH
     # --------------------------------------------------------
@@ -87,6 +99,7 @@ class EventBus:
             internal_sources = {
                 "",
                 "microstructure",
+                "ml_features",
                 "liquidity",
                 "liquidity_map",
                 "liquidity_map_engine",
@@ -103,12 +116,17 @@ class EventBus:
                 "ui",
                 "tape",
                 "delta",
+                "delta_engine",
                 "footprint",
                 "sim",
                 "ohlc_engine",
+                "bar_engine",
+                "timer",
+                "metrics",
                 "spoof_detector",
                 "iceberg_detector",
                 "large_trade_detector",
+                "sweep_detector",
                 "simple_strategy",
             }
             if src_key not in allowed and src_key not in internal_sources:
@@ -143,6 +161,10 @@ class EventBus:
                 log.error("Discarding event without type: %s", event)
                 continue
 
+            if event_type in self.blocked_types:
+                self.blocked_count += 1
+                continue
+
             with self._lock:
                 callbacks = list(self._subscribers.get(event_type, [])) + list(self._subscribers.get("*", []))
 
@@ -1,13 +1,123 @@
 from __future__ import annotations
 
-from typing import Dict
+import re
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
 
+# Exchange/venue minimum price increments for the instruments we trade.
+SYMBOL_TICK_SIZES: Dict[str, float] = {
+    "XAUUSD": 0.01,
+    "XAGUSD": 0.001,
+    "EURUSD": 0.00001,
+    "GBPUSD": 0.00001,
+    "AUDUSD": 0.00001,
+    "NZDUSD": 0.00001,
+    "USDCAD": 0.00001,
+    "USDCHF": 0.00001,
+    "USDJPY": 0.001,
+    "BTCUSDT": 0.01,
+    "ETHUSDT": 0.01,
+    "XAUUSDT": 0.01,
+    "GOLDUSDT": 0.01,
+    "XAUTUSDT": 0.01,
+}
+FUTURES_TICK_SIZES: Dict[str, float] = {
+    "GC": 0.1,
+    "MGC": 0.1,
+    "SI": 0.005,
+    "CL": 0.01,
+    "ES": 0.25,
+    "MES": 0.25,
+    "NQ": 0.25,
+    "MNQ": 0.25,
+}
+TYPE_TICK_SIZES: Dict[str, float] = {
+    "FX": 0.00001,
+    "CFD": 0.01,
+    "CRYPTO_BINANCE": 0.01,
+    "CRYPTO_OKX": 0.01,
+    "FUTURES": 0.01,
+    "SIM": 0.01,
+}
+_FUTURES_CONTRACT = re.compile(r"^([A-Z]+?)[FGHJKMNQUVXZ]\d{1,2}$")
 
-def detect_instrument(symbol: str) -> Dict[str, str]:
+
+def _decimals(tick_size: float) -> int:
+    return max(0, -int(Decimal(str(tick_size)).normalize().as_tuple().exponent))
+
+
+class TickSizeRegistry:
+    """
+    Per-instrument tick sizes plus price <-> integer tick index conversion.
+
+    Engines key their hot-path state by ``to_tick(symbol, price)``; ``to_price`` is
+    meant for display/serialization only. ``fixed`` forces one tick size for every
+    symbol without an explicit override (synthetic feeds, tests).
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, float]] = None, fixed: Optional[float] = None) -> None:
+        self._overrides: Dict[str, float] = {k.upper(): float(v) for k, v in (overrides or {}).items()}
+        self._fixed = fixed
+        self._cache: Dict[str, Tuple[float, float, int]] = {}
+
+    def register(self, symbol: str, tick_size: float) -> None:
+        if tick_size <= 0:
+            raise ValueError(f"tick_size must be positive for {symbol}")
+        self._overrides[symbol.upper()] = float(tick_size)
+        self._cache.pop(symbol, None)
+        self._cache.pop(symbol.upper(), None)
+
+    def tick_size(self, symbol: str) -> float:
+        return self._entry(symbol)[0]
+
+    def decimals(self, symbol: str) -> int:
+        return self._entry(symbol)[2]
+
+    def to_tick(self, symbol: str, price: float) -> int:
+        return int(round(price * self._entry(symbol)[1]))
+
+    def to_price(self, symbol: str, tick: int) -> float:
+        size, _, decimals = self._entry(symbol)
+        return round(tick * size, decimals)
+
+    def _entry(self, symbol: str) -> Tuple[float, float, int]:
+        entry = self._cache.get(symbol)
+        if entry is None:
+            size = self._resolve(symbol)
+            entry = self._cache[symbol] = (size, 1.0 / size, _decimals(size))
+        return entry
+
+    def _resolve(self, symbol: str) -> float:
+        sym = symbol.upper()
+        if sym in self._overrides:
+            return self._overrides[sym]
+        if self._fixed:
+            return float(self._fixed)
+        info = _classify(sym)
+        for candidate in (sym, info["normalized_symbol"]):
+            if candidate in SYMBOL_TICK_SIZES:
+                return SYMBOL_TICK_SIZES[candidate]
+            if candidate in FUTURES_TICK_SIZES:
+                return FUTURES_TICK_SIZES[candidate]
+            match = _FUTURES_CONTRACT.match(candidate)
+            if match and match.group(1) in FUTURES_TICK_SIZES:
+                return FUTURES_TICK_SIZES[match.group(1)]
+        return TYPE_TICK_SIZES.get(info["instrument_type"], 0.01)
+
+
+TICK_SIZES = TickSizeRegistry()
+
+
+def detect_instrument(symbol: str) -> Dict[str, Any]:
     """
     Basic heuristic instrument detector.
     """
-    sym = symbol.upper()
+    res: Dict[str, Any] = dict(_classify(symbol.upper()))
+    res["tick_size"] = TICK_SIZES.tick_size(symbol)
+    return res
+
+
+def _classify(sym: str) -> Dict[str, str]:
     res = {
         "instrument_type": "SIM",
         "market_provider": "SIM",
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+
+class RollingStats:
+    """
+    Fixed-window sum/mean/std over a ring buffer; each push is O(1) regardless of window.
+    """
+
+    __slots__ = ("window", "_buf", "_pos", "count", "total", "total_sq")
+
+    def __init__(self, window: int) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._buf = np.zeros(window, dtype=np.float64)
+        self._pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float) -> None:
+        if self.count == self.window:
+            old = self._buf[self._pos]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        self._buf[self._pos] = value
+        self._pos = (self._pos + 1) % self.window
+        self.total += value
+        self.total_sq += value * value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        mean = self.total / self.count
+        return math.sqrt(max(0.0, self.total_sq / self.count - mean * mean))
+
+
+class MonotonicWindow:
+    """
+    Min/max over the last ``window`` values using monotonic deques (amortised O(1) push).
+    """
+
+    __slots__ = ("window", "_seq", "_max", "_min")
+
+    def __init__(self, window: int) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self._seq = 0
+        self._max: Deque[Tuple[int, float]] = deque()
+        self._min: Deque[Tuple[int, float]] = deque()
+
+    def push(self, value: float) -> None:
+        seq = self._seq
+        self._seq += 1
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((seq, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((seq, value))
+        oldest = seq - self.window
+        if self._max[0][0] <= oldest:
+            self._max.popleft()
+        if self._min[0][0] <= oldest:
+            self._min.popleft()
+
+    @property
+    def count(self) -> int:
+        return min(self._seq, self.window)
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1] if self._max else 0.0
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1] if self._min else 0.0
+
+    @property
+    def range(self) -> float:
+        return self.max - self.min
+
+
+class TimeWindowSum:
+    """
+    Sum of values pushed during the last ``seconds`` (amortised O(1) push/expire).
+
+    Values that age out are forwarded to ``spill`` when given, so two chained windows hold
+    the current and the previous period.
+    """
+
+    __slots__ = ("seconds", "spill", "_items", "total")
+
+    def __init__(self, seconds: float, spill: Optional[TimeWindowSum] = None) -> None:
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+        self.seconds = seconds
+        self.spill = spill
+        self._items: Deque[Tuple[float, float]] = deque()
+        self.total = 0.0
+
+    def push(self, ts: float, value: float) -> None:
+        self._items.append((ts, value))
+        self.total += value
+        self.expire(ts)
+
+    def expire(self, now: float) -> None:
+        cutoff = now - self.seconds
+        items = self._items
+        while items and items[0][0] <= cutoff:
+            ts, value = items.popleft()
+            self.total -= value
+            if self.spill is not None:
+                self.spill.push(ts, value)
+        if not items:
+            self.total = 0.0  # drop accumulated float error
+        if self.spill is not None:
+            self.spill.expire(now - self.seconds)
+
+    def __len__(self) -> int:
+        return len(self._items)
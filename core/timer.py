@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+
+from core.event_bus import EventBus
+from models.market_event import MarketEvent
+
+
+class BusTimer:
+    """
+    Publishes a ``timer`` event on a fixed interval.
+
+    Periodic work (flushes, scheduled evaluations) subscribes to ``timer`` and filters on
+    ``payload["name"]``, so it runs on the EventBus dispatch thread alongside the market
+    data handlers and needs no extra locking.
+    """
+
+    def __init__(self, bus: EventBus, name: str, interval_seconds: float) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.bus = bus
+        self.name = name
+        self.interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._seq = 0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"BusTimer-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._seq += 1
+            try:
+                self.bus.publish(
+                    MarketEvent(
+                        event_type="timer",
+                        timestamp=datetime.now(timezone.utc),
+                        source="timer",
+                        symbol="",
+                        payload={"name": self.name, "seq": self._seq},
+                    )
+                )
+            except Exception:
+                logging.getLogger(__name__).exception("[BusTimer] publish failed name=%s", self.name)
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Type
+
+from core.event_bus import EventBus
+from models.market_event import MarketEvent
+
+BUY_SIDES = ("buy", "B", "BUY")
+SELL_SIDES = ("sell", "S", "SELL")
+_NO_BARS: tuple = ()
+
+
+class BarState:
+    """
+    Mutable in-progress bar. One instance per symbol, reset in place on close.
+    """
+
+    __slots__ = ("time", "open", "high", "low", "close", "volume", "buy_volume", "sell_volume", "trades")
+
+    def __init__(self) -> None:
+        self.time = 0.0
+        self.open = 0.0
+        self.high = 0.0
+        self.low = 0.0
+        self.close = 0.0
+        self.volume = 0.0
+        self.buy_volume = 0.0
+        self.sell_volume = 0.0
+        self.trades = 0
+
+    @property
+    def delta(self) -> float:
+        return self.buy_volume - self.sell_volume
+
+    def start(self, ts: float, price: float) -> None:
+        self.time = ts
+        self.open = self.high = self.low = self.close = price
+        self.volume = self.buy_volume = self.sell_volume = 0.0
+        self.trades = 0
+
+    def add(self, price: float, size: float, side: Optional[str]) -> None:
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += size
+        if side in BUY_SIDES:
+            self.buy_volume += size
+        elif side in SELL_SIDES:
+            self.sell_volume += size
+        self.trades += 1
+
+    def to_payload(self, bar_type: str) -> Dict[str, float | str | int]:
+        """chart_ohlc payload; same keys as OHLCEngine plus bar metadata."""
+        return {
+            "time": self.time,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "delta": self.delta,
+            "trades": self.trades,
+            "bar_type": bar_type,
+        }
+
+
+class BarBuilder(ABC):
+    """
+    Incremental aggregation core shared by every non-time bar type.
+    Subclasses only decide when the in-progress bar is complete.
+    """
+
+    bar_type = "base"
+
+    def __init__(self, threshold: float) -> None:
+        if threshold <= 0:
+            raise ValueError(f"{self.bar_type} bar threshold must be positive")
+        self.threshold = float(threshold)
+        self.bars: Dict[str, BarState] = {}
+
+    def update(self, symbol: str, ts: float, price: float, size: float, side: Optional[str] = None) -> Sequence[Dict]:
+        """
+        Feed one trade; returns payloads of the bars it closed (usually empty).
+        """
+        bar = self.bars.get(symbol)
+        if bar is None:
+            bar = self.bars[symbol] = BarState()
+            bar.start(ts, price)
+        elif bar.trades == 0:
+            bar.start(ts, price)
+        bar.add(price, size, side)
+        if not self._is_complete(bar):
+            return _NO_BARS
+        closed = bar.to_payload(self.bar_type)
+        bar.trades = 0
+        return (closed,)
+
+    def current(self, symbol: str) -> Optional[Dict]:
+        bar = self.bars.get(symbol)
+        if bar is None or bar.trades == 0:
+            return None
+        return bar.to_payload(self.bar_type)
+
+    @abstractmethod
+    def _is_complete(self, bar: BarState) -> bool:
+        ...
+
+
+class TickBarBuilder(BarBuilder):
+    """Closes every N trades."""
+
+    bar_type = "tick"
+
+    def _is_complete(self, bar: BarState) -> bool:
+        return bar.trades >= self.threshold
+
+
+class VolumeBarBuilder(BarBuilder):
+    """Closes once traded volume reaches the threshold."""
+
+    bar_type = "volume"
+
+    def _is_complete(self, bar: BarState) -> bool:
+        return bar.volume >= self.threshold
+
+
+class RangeBarBuilder(BarBuilder):
+    """Closes once high-low spans the configured price range."""
+
+    bar_type = "range"
+
+    def _is_complete(self, bar: BarState) -> bool:
+        return bar.high - bar.low >= self.threshold
+
+
+class DeltaBarBuilder(BarBuilder):
+    """Closes once absolute buy-sell delta reaches the threshold."""
+
+    bar_type = "delta"
+
+    def _is_complete(self, bar: BarState) -> bool:
+        return abs(bar.delta) >= self.threshold
+
+
+class RenkoBarBuilder(BarBuilder):
+    """
+    Fixed box-size bricks. A single trade may complete several bricks on a gap;
+    volume/delta of the move is attributed to the first brick.
+    """
+
+    bar_type = "renko"
+
+    def update(self, symbol: str, ts: float, price: float, size: float, side: Optional[str] = None) -> Sequence[Dict]:
+        bar = self.bars.get(symbol)
+        if bar is None:
+            bar = self.bars[symbol] = BarState()
+            bar.start(ts, price)
+        elif bar.trades == 0:
+            bar.start(ts, bar.open)
+        bar.add(price, size, side)
+        box = self.threshold
+        if abs(price - bar.open) < box:
+            return _NO_BARS
+        closed: List[Dict] = []
+        while abs(price - bar.open) >= box:
+            brick_close = bar.open + box if price > bar.open else bar.open - box
+            bar.close = brick_close
+            bar.high = max(bar.open, brick_close)
+            bar.low = min(bar.open, brick_close)
+            closed.append(bar.to_payload(self.bar_type))
+            bar.start(ts, brick_close)
+        return closed
+
+    def _is_complete(self, bar: BarState) -> bool:  # pragma: no cover - update() is overridden
+        return False
+
+
+BAR_BUILDERS: Dict[str, Type[BarBuilder]] = {
+    "tick": TickBarBuilder,
+    "volume": VolumeBarBuilder,
+    "range": RangeBarBuilder,
+    "renko": RenkoBarBuilder,
+    "delta": DeltaBarBuilder,
+}
+
+
+def build_bar_builder(bar_type: str, threshold: float) -> BarBuilder:
+    try:
+        cls = BAR_BUILDERS[bar_type.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown bar type: {bar_type!r} (expected one of {sorted(BAR_BUILDERS)})") from None
+    return cls(threshold)
+
+
+class BarEngine:
+    """
+    Non-time bar aggregator from trades (tick/volume/range/renko/delta).
+    Emits chart_ohlc events with the OHLCEngine payload shape, once per closed bar.
+    """
+
+    def __init__(self, bus: EventBus, bar_type: str = "tick", threshold: float = 100.0) -> None:
+        self.bus = bus
+        self.builder = build_bar_builder(bar_type, threshold)
+        self.bus.subscribe("trade", self.on_trade)
+        self._subs = ("trade",)
+
+    def stop(self) -> None:
+        for et in getattr(self, "_subs", ()):
+            self.bus.unsubscribe(et, self.on_trade)
+
+    def on_trade(self, evt: MarketEvent) -> None:
+        payload = evt.payload or {}
+        price = payload.get("price")
+        if price is None:
+            return
+        try:
+            p = float(price)
+            s = float(payload.get("size", 0.0) or 0.0)
+        except Exception:
+            return
+        side = payload.get("side") or payload.get("aggressor")
+        for bar in self.builder.update(evt.symbol, evt.timestamp.timestamp(), p, s, side):
+            self._emit(evt.symbol, bar)
+
+    def _emit(self, symbol: str, bar: Dict) -> None:
+        evt = MarketEvent(
+            event_type="chart_ohlc",
+            timestamp=datetime.fromtimestamp(bar["time"], tz=timezone.utc),
+            source="bar_engine",
+            symbol=symbol,
+            payload=bar,
+        )
+        self.bus.publish(evt)
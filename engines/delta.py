@@ -1,55 +1,230 @@
 from __future__ import annotations
 
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Deque, Dict, List, Optional
 
 from core.event_bus import EventBus
+from core.rolling import RollingStats
+from engines.detectors.records import normalize_side
 from models.market_event import MarketEvent
-from models.state import DeltaBar, SymbolState
+from models.state import DeltaBar
+
+_DAY = 86400
+
+
+class ClosedBar:
+    __slots__ = ("start", "high", "low", "close", "delta", "cvd")
+
+    def __init__(self, start: float, high: float, low: float, close: float, delta: float, cvd: float) -> None:
+        self.start = start
+        self.high = high
+        self.low = low
+        self.close = close
+        self.delta = delta
+        self.cvd = cvd
+
+
+class DeltaState:
+    __slots__ = (
+        "session",
+        "bar_index",
+        "delta_bar",
+        "open",
+        "high",
+        "low",
+        "last_price",
+        "session_cvd",
+        "rolling",
+        "bars",
+        "swing_high",
+        "swing_low",
+    )
+
+    def __init__(self, rolling_bars: int, swing_strength: int) -> None:
+        self.session: Optional[int] = None
+        self.bar_index: Optional[int] = None
+        self.delta_bar = DeltaBar()
+        self.open = self.high = self.low = 0.0
+        self.last_price: Optional[float] = None
+        self.session_cvd = 0.0
+        self.rolling = RollingStats(rolling_bars)
+        self.bars: Deque[ClosedBar] = deque(maxlen=2 * swing_strength + 1)
+        self.swing_high: Optional[ClosedBar] = None
+        self.swing_low: Optional[ClosedBar] = None
+
+    @property
+    def bar_delta(self) -> float:
+        return self.delta_bar.buys - self.delta_bar.sells
 
 
 class DeltaEngine:
     """
-    Lightweight delta/footprint accumulator from trade events.
+    Single source of order-flow delta per symbol:
+    - bar delta over ``bar_seconds`` time bars
+    - session CVD, reset at ``session_start`` (UTC "HH:MM") every day
+    - rolling CVD over the last ``rolling_bars`` closed bars plus the open one
+
+    Divergences are found incrementally at bar close: a bar is a swing high/low once
+    ``swing_strength`` bars on each side are lower/higher; a new swing high above the previous
+    one with CVD not above it is bearish, a lower swing low with CVD not below is bullish.
+    Swings and all totals reset with the session. Emits delta_update once per closed bar and
+    delta_divergence when one is confirmed.
     """
 
-    def __init__(self, bus: EventBus) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        bar_seconds: int = 60,
+        rolling_bars: int = 20,
+        session_start: str = "00:00",
+        swing_strength: int = 2,
+    ) -> None:
         self.bus = bus
-        self.state: Dict[str, SymbolState] = {}
+        self.bar_seconds = bar_seconds
+        self.rolling_bars = rolling_bars
+        hours, minutes = session_start.split(":")
+        self.session_offset = int(hours) * 3600 + int(minutes) * 60
+        self.swing_strength = swing_strength
+        self.state: Dict[str, DeltaState] = {}
         self.bus.subscribe("trade", self.on_trade)
+        self._subs = ("trade",)
+
+    def stop(self) -> None:
+        for et in getattr(self, "_subs", ()):
+            self.bus.unsubscribe(et, self.on_trade)
+
+    def _state(self, symbol: str) -> DeltaState:
+        st = self.state.get(symbol)
+        if st is None:
+            st = self.state[symbol] = DeltaState(self.rolling_bars, self.swing_strength)
+        return st
+
+    def session_of(self, ts: float) -> int:
+        return int((ts - self.session_offset) // _DAY)
 
     def on_trade(self, evt: MarketEvent) -> None:
-        sym = evt.symbol
-        st = self.state.setdefault(sym, SymbolState())
-        payload = evt.payload
-        price = float(payload.get("price", 0.0))
-        size = float(payload.get("size", 0.0))
-        aggressor = payload.get("aggressor", payload.get("side", "unknown"))
-
-        st.delta_bar.volume += size
-        if aggressor == "buy":
-            st.delta_bar.buys += size
-        elif aggressor == "sell":
-            st.delta_bar.sells += size
+        payload = evt.payload or {}
+        try:
+            price = float(payload.get("price", 0.0))
+            size = float(payload.get("size", 0.0) or 0.0)
+        except Exception:
+            return
+        if price <= 0:
+            return
+        st = self._state(evt.symbol)
+        ts = evt.timestamp.timestamp()
+        index = int(ts // self.bar_seconds)
+        if st.bar_index != index:
+            if st.bar_index is not None:
+                self._close_bar(evt.symbol, st)
+            session = self.session_of(ts)
+            if session != st.session:
+                self._reset_session(st, session)
+            st.bar_index = index
+            st.open = st.high = st.low = price
+        st.high = max(st.high, price)
+        st.low = min(st.low, price)
         st.last_price = price
-        # emit delta_update
-        delta_val = st.delta_bar.buys - st.delta_bar.sells
-        evt_out = MarketEvent(
-            event_type="delta_update",
-            timestamp=datetime.now(timezone.utc),
-            source="delta_engine",
-            symbol=sym,
-            payload={"delta": delta_val, "buys": st.delta_bar.buys, "sells": st.delta_bar.sells, "price": price},
+        bar = st.delta_bar
+        bar.volume += size
+        side = normalize_side(payload.get("aggressor", payload.get("side")))
+        if side == "buy":
+            bar.buys += size
+            st.session_cvd += size
+        elif side == "sell":
+            bar.sells += size
+            st.session_cvd -= size
+
+    def _reset_session(self, st: DeltaState, session: int) -> None:
+        st.session = session
+        st.session_cvd = 0.0
+        st.rolling = RollingStats(self.rolling_bars)
+        st.bars.clear()
+        st.swing_high = st.swing_low = None
+
+    def rolling_cvd(self, symbol: str) -> float:
+        st = self.state[symbol]
+        return st.rolling.total + st.bar_delta
+
+    def snapshot(self, symbol: str) -> Dict[str, float]:
+        """Live view of the open bar."""
+        st = self.state[symbol]
+        bar = st.delta_bar
+        return {
+            "delta": st.bar_delta,
+            "buys": bar.buys,
+            "sells": bar.sells,
+            "volume": bar.volume,
+            "open": st.open,
+            "high": st.high,
+            "low": st.low,
+            "close": st.last_price or 0.0,
+            "session_cvd": st.session_cvd,
+            "rolling_cvd": self.rolling_cvd(symbol),
+            "bar_start": float((st.bar_index or 0) * self.bar_seconds),
+            "session": st.session,
+        }
+
+    def _close_bar(self, symbol: str, st: DeltaState) -> None:
+        payload = self.snapshot(symbol)
+        delta = st.bar_delta
+        st.rolling.push(delta)
+        st.bars.append(ClosedBar(payload["bar_start"], st.high, st.low, payload["close"], delta, st.session_cvd))
+        st.delta_bar = DeltaBar()
+        self._publish("delta_update", symbol, payload)
+        for divergence in self._divergences(st):
+            self._publish("delta_divergence", symbol, divergence)
+
+    def _divergences(self, st: DeltaState) -> List[Dict[str, float]]:
+        bars = st.bars
+        if len(bars) < bars.maxlen:
+            return []
+        k = self.swing_strength
+        pivot = bars[k]
+        others = [b for i, b in enumerate(bars) if i != k]
+        found = []
+        if all(pivot.high > b.high for b in others):
+            prev, st.swing_high = st.swing_high, pivot
+            if prev is not None and pivot.high > prev.high and pivot.cvd <= prev.cvd:
+                found.append(self._divergence("bearish", pivot.high, prev.high, pivot, prev))
+        if all(pivot.low < b.low for b in others):
+            prev, st.swing_low = st.swing_low, pivot
+            if prev is not None and pivot.low < prev.low and pivot.cvd >= prev.cvd:
+                found.append(self._divergence("bullish", pivot.low, prev.low, pivot, prev))
+        return found
+
+    @staticmethod
+    def _divergence(kind: str, price: float, prev_price: float, pivot: ClosedBar, prev: ClosedBar) -> Dict[str, float]:
+        return {
+            "type": kind,
+            "price": price,
+            "prev_price": prev_price,
+            "cvd": pivot.cvd,
+            "prev_cvd": prev.cvd,
+            "bar_start": pivot.start,
+            "prev_bar_start": prev.start,
+        }
+
+    def _publish(self, event_type: str, symbol: str, payload: Dict) -> None:
+        self.bus.publish(
+            MarketEvent(
+                event_type=event_type,
+                timestamp=datetime.now(timezone.utc),
+                source="delta_engine",
+                symbol=symbol,
+                payload=payload,
+            )
         )
-        self.bus.publish(evt_out)
 
     def emit_delta(self, symbol: str) -> MarketEvent:
-        st = self.state.setdefault(symbol, SymbolState())
+        st = self._state(symbol)
         ts = datetime.now(timezone.utc)
         payload = {
             "buys": st.delta_bar.buys,
             "sells": st.delta_bar.sells,
             "volume": st.delta_bar.volume,
             "last_price": st.last_price,
+            "session_cvd": st.session_cvd,
         }
         return MarketEvent(event_type="delta_bar", timestamp=ts, source="delta_engine", symbol=symbol, payload=payload)
@@ -1,5 +1,19 @@
 from engines.detectors.spoofing_detector import SpoofingDetector
 from engines.detectors.iceberg_detector import IcebergDetector
 from engines.detectors.large_trade_detector import LargeTradeDetector
+from engines.detectors.sweep_detector import SweepDetector
+from engines.detectors.pipeline import DetectorPipeline, DetectorStats
+from engines.detectors.records import BookRecord, TradeRecord, parse_book, parse_trade
 
-__all__ = ["SpoofingDetector", "IcebergDetector", "LargeTradeDetector"]
+__all__ = [
+    "SpoofingDetector",
+    "IcebergDetector",
+    "LargeTradeDetector",
+    "SweepDetector",
+    "DetectorPipeline",
+    "DetectorStats",
+    "BookRecord",
+    "TradeRecord",
+    "parse_book",
+    "parse_trade",
+]
@@ -1,55 +1,206 @@
 from __future__ import annotations
 
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Deque, Dict, Optional, Set, Tuple
 
 from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from engines.detectors.records import BookRecord, TradeRecord, parse_book, parse_trade
 from models.market_event import MarketEvent
 
 
+class LevelActivity:
+    """
+    Bounded activity record for one price level: exponentially decayed traded volume plus
+    fixed-size rings of the latest prints and refill times.
+    """
+
+    __slots__ = ("is_bid", "volume", "last_ts", "displayed", "depleted", "prints", "refills")
+
+    def __init__(self, is_bid: bool, prints: int, refills: int) -> None:
+        self.is_bid = is_bid
+        self.volume = 0.0
+        self.last_ts = 0.0
+        self.displayed = 0.0
+        self.depleted = False
+        self.prints: Deque[Tuple[float, float]] = deque(maxlen=prints)
+        self.refills: Deque[float] = deque(maxlen=refills)
+
+    def decay(self, ts: float, half_life: float) -> None:
+        if self.last_ts and ts > self.last_ts:
+            self.volume *= 0.5 ** ((ts - self.last_ts) / half_life)
+        self.last_ts = max(self.last_ts, ts)
+
+
+class _SymbolBook:
+    __slots__ = ("bids", "asks", "best_bid", "best_ask", "levels", "pending")
+
+    def __init__(self) -> None:
+        self.bids: Dict[int, float] = {}
+        self.asks: Dict[int, float] = {}
+        self.best_bid: Optional[int] = None
+        self.best_ask: Optional[int] = None
+        self.levels: "OrderedDict[int, LevelActivity]" = OrderedDict()
+        self.pending: Set[int] = set()
+
+
 class IcebergDetector:
     """
-    Detects absorption/iceberg patterns: repeated trades at a price without depletion of resting liquidity.
-    Emits alert_event with type='iceberg'.
+    Joins the trade stream with the resting book at the traded price.
+
+    - iceberg: a level is traded through its displayed size and then shows size again at the
+      same price (refill); ``min_repeats`` refills within ``refill_window`` seconds raise an alert.
+    - absorption: decayed aggressive volume at a level reaches ``absorption_size`` while the
+      level still holds (best price on that side has not moved through it).
+
+    Traded volume decays with ``half_life`` seconds and each symbol tracks at most
+    ``max_levels`` levels (least recently touched evicted), so memory is constant over a session.
+    Emits alert_event with type='iceberg' or type='absorption'.
     """
 
-    def __init__(self, bus: EventBus, min_repeats: int = 3, min_size: float = 5.0) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        min_repeats: int = 2,
+        min_size: float = 5.0,
+        absorption_size: float = 200.0,
+        half_life: float = 30.0,
+        refill_window: float = 60.0,
+        max_levels: int = 64,
+        prints_per_level: int = 16,
+        ticks: TickSizeRegistry = TICK_SIZES,
+    ) -> None:
         self.bus = bus
         self.min_repeats = min_repeats
         self.min_size = min_size
-        self.repeats: Dict[str, Dict[float, int]] = {}
+        self.absorption_size = absorption_size
+        self.half_life = half_life
+        self.refill_window = refill_window
+        self.max_levels = max_levels
+        self.prints_per_level = prints_per_level
+        self.ticks = ticks
+        self.books: Dict[str, _SymbolBook] = {}
         self.bus.subscribe("trade", self.on_trade)
-        self._subs = ("trade",)
+        self.bus.subscribe("dom_snapshot", self.on_dom)
+        self._subs = ("trade", "dom_snapshot")
 
     def stop(self) -> None:
         for et in getattr(self, "_subs", ()):
-            self.bus.unsubscribe(et, self.on_trade)
+            self.bus.unsubscribe(et, self.on_trade if et == "trade" else self.on_dom)
 
-    def on_trade(self, evt: MarketEvent) -> None:
-        sym = evt.symbol
-        price = evt.payload.get("price")
-        size = evt.payload.get("size", 0.0)
-        if price is None:
-            return
-        try:
-            p = float(price)
-            s = float(size)
-        except Exception:
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = _SymbolBook()
+        return book
+
+    def on_dom(self, evt: MarketEvent) -> None:
+        rec = parse_book(evt, self.ticks)
+        if rec is not None:
+            self.on_book_record(rec)
+
+    def on_book_record(self, rec: BookRecord) -> None:
+        sym = rec.symbol
+        book = self._book(sym)
+        # trades deplete these in place, so keep private copies of the shared views
+        book.bids = dict(rec.bid_ticks)
+        book.asks = dict(rec.ask_ticks)
+        to_tick = self.ticks.to_tick
+        book.best_bid = to_tick(sym, rec.bids[0][0]) if rec.bids else None
+        book.best_ask = to_tick(sym, rec.asks[0][0]) if rec.asks else None
+        if not book.pending:
             return
+        ts = rec.ts
+        for tick in list(book.pending):
+            level = book.levels.get(tick)
+            if level is None:
+                book.pending.discard(tick)
+                continue
+            size = (book.bids if level.is_bid else book.asks).get(tick, 0.0)
+            if size <= 0:
+                if tick in (book.asks if level.is_bid else book.bids):
+                    book.pending.discard(tick)  # price moved through the level
+                continue
+            book.pending.discard(tick)
+            level.depleted = False
+            level.displayed = size
+            level.refills.append(ts)
+            if len(level.refills) >= self.min_repeats and ts - level.refills[0] <= self.refill_window:
+                self._emit(sym, "iceberg", tick, level, refills=len(level.refills), displayed=size)
+                level.refills.clear()
+
+    def on_trade(self, evt: MarketEvent) -> None:
+        rec = parse_trade(evt, self.ticks)
+        if rec is not None:
+            self.on_trade_record(rec)
+
+    def on_trade_record(self, rec: TradeRecord) -> None:
+        s = rec.size
         if s < self.min_size:
             return
-        book = self.repeats.setdefault(sym, {})
-        book[p] = book.get(p, 0) + 1
-        if book[p] >= self.min_repeats:
-            self._emit(sym, p, s, book[p])
-            book[p] = 0
+        sym = rec.symbol
+        book = self._book(sym)
+        tick = rec.tick
+        is_bid = self._resting_side(book, tick, rec.side)
+        if is_bid is None:
+            return
+        level = self._level(book, tick, is_bid)
+        ts = rec.ts
+        level.decay(ts, self.half_life)
+        level.volume += s
+        level.prints.append((ts, s))
+        resting = book.bids if is_bid else book.asks
+        displayed = resting.get(tick, 0.0)
+        if displayed > 0:
+            level.displayed = displayed
+            remaining = displayed - s
+            resting[tick] = max(0.0, remaining)
+            if remaining <= 0:
+                level.depleted = True
+                book.pending.add(tick)
+        best = book.best_bid if is_bid else book.best_ask
+        holding = best is None or (tick <= best if is_bid else tick >= best)
+        if level.volume >= self.absorption_size and holding:
+            self._emit(sym, "absorption", tick, level, volume=round(level.volume, 4), prints=len(level.prints))
+            level.volume = 0.0
+
+    def _resting_side(self, book: _SymbolBook, tick: int, side: Optional[str]) -> Optional[bool]:
+        if side == "buy":
+            return False  # buyer lifts resting asks
+        if side == "sell":
+            return True
+        if book.best_ask is not None and tick >= book.best_ask:
+            return False
+        if book.best_bid is not None and tick <= book.best_bid:
+            return True
+        return None
+
+    def _level(self, book: _SymbolBook, tick: int, is_bid: bool) -> LevelActivity:
+        level = book.levels.get(tick)
+        if level is None or level.is_bid != is_bid:
+            level = LevelActivity(is_bid, self.prints_per_level, max(1, self.min_repeats))
+            book.levels[tick] = level
+            book.pending.discard(tick)
+            if len(book.levels) > self.max_levels:
+                evicted, _ = book.levels.popitem(last=False)
+                book.pending.discard(evicted)
+        book.levels.move_to_end(tick)
+        return level
 
-    def _emit(self, symbol: str, price: float, size: float, repeats: int) -> None:
+    def _emit(self, symbol: str, kind: str, tick: int, level: LevelActivity, **extra) -> None:
+        payload = {
+            "type": kind,
+            "price": self.ticks.to_price(symbol, tick),
+            "side": "bid" if level.is_bid else "ask",
+            "size": level.prints[-1][1] if level.prints else 0.0,
+        }
+        payload.update(extra)
         evt = MarketEvent(
             event_type="alert_event",
             timestamp=datetime.now(timezone.utc),
             source="iceberg_detector",
             symbol=symbol,
-            payload={"type": "iceberg", "price": price, "size": size, "repeats": repeats},
+            payload=payload,
         )
         self.bus.publish(evt)
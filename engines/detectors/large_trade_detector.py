@@ -1,21 +1,23 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict
 
 from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from engines.detectors.records import TradeRecord, parse_trade
 from models.market_event import MarketEvent
 
 
 class LargeTradeDetector:
     """
-    Flags large trades or sweeps.
+    Flags individual large prints (multi-level sweeps are clustered by SweepDetector).
     Emits alert_event with type='large_trade'.
     """
 
-    def __init__(self, bus: EventBus, threshold: float = 50.0) -> None:
+    def __init__(self, bus: EventBus, threshold: float = 50.0, ticks: TickSizeRegistry = TICK_SIZES) -> None:
         self.bus = bus
         self.threshold = threshold
+        self.ticks = ticks
         self.bus.subscribe("trade", self.on_trade)
         self._subs = ("trade",)
 
@@ -24,16 +26,14 @@ class LargeTradeDetector:
             self.bus.unsubscribe(et, self.on_trade)
 
     def on_trade(self, evt: MarketEvent) -> None:
-        payload = evt.payload or {}
-        try:
-            size = float(payload.get("size", 0.0))
-        except Exception:
-            return
-        if size < self.threshold:
+        rec = parse_trade(evt, self.ticks)
+        if rec is not None:
+            self.on_trade_record(rec)
+
+    def on_trade_record(self, rec: TradeRecord) -> None:
+        if rec.size < self.threshold:
             return
-        price = payload.get("price")
-        side = payload.get("side", "unknown")
-        self._emit(evt.symbol, price, size, side)
+        self._emit(rec.symbol, rec.price, rec.size, rec.side or rec.payload.get("side", "unknown"))
 
     def _emit(self, symbol: str, price, size: float, side: str) -> None:
         evt = MarketEvent(
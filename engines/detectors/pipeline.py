@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from engines.detectors.records import parse_book, parse_trade
+from models.market_event import MarketEvent
+
+
+class DetectorStats:
+    """Call count and wall time spent in one pipeline stage."""
+
+    __slots__ = ("calls", "total_ns", "max_ns", "errors")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.errors = 0
+
+    def record(self, elapsed_ns: int) -> None:
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    @property
+    def mean_us(self) -> float:
+        return self.total_ns / self.calls / 1000.0 if self.calls else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.mean_us,
+            "max_us": self.max_ns / 1000.0,
+            "errors": self.errors,
+        }
+
+
+class DetectorPipeline:
+    """
+    Single trade/dom_snapshot subscriber for all detectors.
+
+    Each event is parsed once into a TradeRecord/BookRecord and handed to every registered
+    detector's ``on_trade_record``/``on_book_record`` in registration order. Registering a
+    detector takes over its own bus subscriptions for those event types. ``stats`` keeps
+    per-detector timing (plus ``parse``) so it is visible where dispatch time goes (the app
+    publishes ``timings()`` in its ``metrics`` event); a detector raising is logged and
+    counted without stopping the others.
+    """
+
+    PARSE = "parse"
+
+    def __init__(self, bus: EventBus, ticks: TickSizeRegistry = TICK_SIZES) -> None:
+        self.bus = bus
+        self.ticks = ticks
+        self._trade_handlers: List[Tuple[str, object]] = []
+        self._book_handlers: List[Tuple[str, object]] = []
+        self.detectors: Dict[str, object] = {}
+        self.stats: Dict[str, DetectorStats] = {self.PARSE: DetectorStats()}
+        self.bus.subscribe("trade", self.on_trade)
+        self.bus.subscribe("dom_snapshot", self.on_dom)
+        self._subs = ("trade", "dom_snapshot")
+
+    def stop(self) -> None:
+        for et in getattr(self, "_subs", ()):
+            self.bus.unsubscribe(et, self.on_trade if et == "trade" else self.on_dom)
+
+    def register(self, detector, name: Optional[str] = None):
+        name = name or type(detector).__name__
+        if name in self.detectors:
+            raise ValueError(f"Detector already registered: {name}")
+        on_trade = getattr(detector, "on_trade_record", None)
+        on_book = getattr(detector, "on_book_record", None)
+        if on_trade is None and on_book is None:
+            raise TypeError(f"{name} has neither on_trade_record nor on_book_record")
+        if on_trade is not None:
+            self._trade_handlers.append((name, on_trade))
+            if hasattr(detector, "on_trade"):
+                self.bus.unsubscribe("trade", detector.on_trade)
+        if on_book is not None:
+            self._book_handlers.append((name, on_book))
+            if hasattr(detector, "on_dom"):
+                self.bus.unsubscribe("dom_snapshot", detector.on_dom)
+        self.detectors[name] = detector
+        self.stats[name] = DetectorStats()
+        return detector
+
+    def on_trade(self, evt: MarketEvent) -> None:
+        start = time.perf_counter_ns()
+        rec = parse_trade(evt, self.ticks)
+        self.stats[self.PARSE].record(time.perf_counter_ns() - start)
+        if rec is not None:
+            self._dispatch(self._trade_handlers, rec)
+
+    def on_dom(self, evt: MarketEvent) -> None:
+        start = time.perf_counter_ns()
+        rec = parse_book(evt, self.ticks)
+        self.stats[self.PARSE].record(time.perf_counter_ns() - start)
+        if rec is not None:
+            self._dispatch(self._book_handlers, rec)
+
+    def _dispatch(self, handlers, rec) -> None:
+        clock = time.perf_counter_ns
+        for name, handler in handlers:
+            stats = self.stats[name]
+            start = clock()
+            try:
+                handler(rec)
+            except Exception:
+                stats.errors += 1
+                logging.getLogger(__name__).exception("[DetectorPipeline] %s failed on %s", name, rec.symbol)
+            stats.record(clock() - start)
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from core.instrument_detector import TickSizeRegistry
+from engines.microstructure.book import book_sides
+from models.market_event import MarketEvent
+
+_SIDES = {"buy": "buy", "b": "buy", "bid": "buy", "sell": "sell", "s": "sell", "ask": "sell"}
+
+
+def normalize_side(side: Any) -> Optional[str]:
+    """Aggressor side as 'buy'/'sell', or None when the feed does not say."""
+    if side is None:
+        return None
+    return _SIDES.get(str(side).lower())
+
+
+class TradeRecord(NamedTuple):
+    """A trade print parsed once: floats, tick index and normalized aggressor side."""
+
+    symbol: str
+    timestamp: datetime
+    ts: float
+    price: float
+    size: float
+    tick: int
+    side: Optional[str]
+    exchange_ts: Optional[float]
+    payload: Dict[str, Any]
+
+
+class BookRecord(NamedTuple):
+    """A book update parsed once: best-first (price, size) sides plus tick-indexed views."""
+
+    symbol: str
+    timestamp: datetime
+    ts: float
+    bids: List[Tuple[float, float]]
+    asks: List[Tuple[float, float]]
+    bid_ticks: Dict[int, float]
+    ask_ticks: Dict[int, float]
+    payload: Dict[str, Any]
+
+
+def parse_trade(evt: MarketEvent, ticks: TickSizeRegistry) -> Optional[TradeRecord]:
+    payload = evt.payload or {}
+    try:
+        price = float(payload["price"])
+        size = float(payload.get("size", 0.0) or 0.0)
+    except Exception:
+        return None
+    exchange_ts = payload.get("exchange_ts")
+    return TradeRecord(
+        evt.symbol,
+        evt.timestamp,
+        evt.timestamp.timestamp(),
+        price,
+        size,
+        ticks.to_tick(evt.symbol, price),
+        normalize_side(payload.get("side")),
+        float(exchange_ts) / 1000.0 if exchange_ts is not None else None,
+        payload,
+    )
+
+
+def parse_book(evt: MarketEvent, ticks: TickSizeRegistry) -> Optional[BookRecord]:
+    payload = evt.payload or {}
+    bids, asks = book_sides(payload)
+    if not bids and not asks:
+        return None
+    sym = evt.symbol
+    to_tick = ticks.to_tick
+    return BookRecord(
+        sym,
+        evt.timestamp,
+        evt.timestamp.timestamp(),
+        bids,
+        asks,
+        {to_tick(sym, p): s for p, s in bids},
+        {to_tick(sym, p): s for p, s in asks},
+        payload,
+    )
@@ -2,62 +2,152 @@ from __future__ import annotations
 
 from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Deque, Dict, Optional, Tuple
 
 from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from engines.detectors.records import BookRecord, TradeRecord, parse_book, parse_trade
 from models.market_event import MarketEvent
 
 
+class LevelLife:
+    """
+    Lifetime of the resting size at one price: when it appeared, when it became large,
+    recent size history and volume traded against it.
+    """
+
+    __slots__ = ("size", "added_ts", "large_ts", "peak", "traded", "history")
+
+    def __init__(self, ts: float, size: float, history: int) -> None:
+        self.size = size
+        self.added_ts = ts
+        self.large_ts: Optional[float] = None
+        self.peak = size
+        self.traded = 0.0
+        self.history: Deque[Tuple[float, float]] = deque(((ts, size),), maxlen=history)
+
+
+class _SideBook:
+    __slots__ = ("levels", "best", "worst")
+
+    def __init__(self) -> None:
+        self.levels: Dict[int, LevelLife] = {}
+        self.best: Optional[int] = None
+        self.worst: Optional[int] = None
+
+
 class SpoofingDetector:
     """
-    Simple spoofing detector: looks for rapid add/remove asymmetry on DOM levels.
+    Flags large resting orders cancelled shortly after being placed without trading.
+
+    The book is indexed by tick (not ladder position), so shifts in the ladder never misalign
+    prices. Each level tracks add time, size history and traded volume (trades at that price
+    are joined in); a reduction not explained by trades is a cancel. A cancel of at least
+    ``min_size`` from an order that had been large for at most ``max_lifetime_ms`` and had
+    traded less than ``max_fill_ratio`` of its peak raises an alert. Levels that merely scroll
+    out of the visible depth are not treated as cancels.
     Emits alert_event with type='spoof'.
     """
 
-    def __init__(self, bus: EventBus, window: int = 10, ratio: float = 3.0) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        min_size: float = 50.0,
+        max_lifetime_ms: float = 2000.0,
+        max_fill_ratio: float = 0.1,
+        history: int = 8,
+        ticks: TickSizeRegistry = TICK_SIZES,
+    ) -> None:
         self.bus = bus
-        self.window = window
-        self.ratio = ratio
-        self.history: Dict[str, deque[Dict[str, Any]]] = {}
+        self.min_size = min_size
+        self.max_lifetime = max_lifetime_ms / 1000.0
+        self.max_fill_ratio = max_fill_ratio
+        self.history = history
+        self.ticks = ticks
+        self.books: Dict[str, Tuple[_SideBook, _SideBook]] = {}
         self.bus.subscribe("dom_snapshot", self.on_dom)
-        self._subs = ("dom_snapshot",)
+        self.bus.subscribe("trade", self.on_trade)
+        self._subs = ("dom_snapshot", "trade")
 
     def stop(self) -> None:
         for et in getattr(self, "_subs", ()):
-            self.bus.unsubscribe(et, self.on_dom)
+            self.bus.unsubscribe(et, self.on_dom if et == "dom_snapshot" else self.on_trade)
+
+    def _book(self, symbol: str) -> Tuple[_SideBook, _SideBook]:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = (_SideBook(), _SideBook())
+        return book
 
     def on_dom(self, evt: MarketEvent) -> None:
-        sym = evt.symbol
-        payload = evt.payload or {}
-        dom = payload.get("dom") or payload.get("ladder") or []
-        dq = self.history.setdefault(sym, deque(maxlen=self.window))
-        levels = []
-        if isinstance(dom, list):
-            for level in dom:
-                try:
-                    price = float(level.get("price"))
-                    bid = float(level.get("bid_size", level.get("bid", 0.0)))
-                    ask = float(level.get("ask_size", level.get("ask", 0.0)))
-                    levels.append((price, bid, ask))
-                except Exception:
-                    continue
-        dq.append({"ts": evt.timestamp, "levels": levels})
-        if len(dq) < 2:
+        rec = parse_book(evt, self.ticks)
+        if rec is not None:
+            self.on_book_record(rec)
+
+    def on_book_record(self, rec: BookRecord) -> None:
+        bid_book, ask_book = self._book(rec.symbol)
+        self._apply(rec.symbol, "bid", bid_book, rec.bid_ticks, rec.ts)
+        self._apply(rec.symbol, "ask", ask_book, rec.ask_ticks, rec.ts)
+
+    def on_trade(self, evt: MarketEvent) -> None:
+        rec = parse_trade(evt, self.ticks)
+        if rec is not None:
+            self.on_trade_record(rec)
+
+    def on_trade_record(self, rec: TradeRecord) -> None:
+        book = self.books.get(rec.symbol)
+        if book is None:
+            return
+        for side in book:
+            level = side.levels.get(rec.tick)
+            if level is not None:
+                level.traded += rec.size
+
+    def _apply(self, sym: str, side: str, book: _SideBook, incoming: Dict[int, float], ts: float) -> None:
+        if not incoming:
             return
-        # Compare last vs prev
-        prev = dq[-2]["levels"]
-        added_bid = sum(max(b - pb, 0) for (p, b, a), (pp, pb, pa) in zip(levels, prev) if abs(p - pp) < 1e-6)
-        removed_bid = sum(max(pb - b, 0) for (p, b, a), (pp, pb, pa) in zip(levels, prev) if abs(p - pp) < 1e-6)
-        added_ask = sum(max(a - pa, 0) for (p, b, a), (pp, pb, pa) in zip(levels, prev) if abs(p - pp) < 1e-6)
-        removed_ask = sum(max(pa - a, 0) for (p, b, a), (pp, pb, pa) in zip(levels, prev) if abs(p - pp) < 1e-6)
-
-        spoof_bid = added_bid > removed_bid * self.ratio and added_bid > 0
-        spoof_ask = added_ask > removed_ask * self.ratio and added_ask > 0
-        if spoof_bid or spoof_ask:
-            side = "bid" if spoof_bid else "ask"
-            self._emit(sym, side, added_bid, added_ask, removed_bid, removed_ask)
-
-    def _emit(self, symbol: str, side: str, add_b: float, add_a: float, rem_b: float, rem_a: float) -> None:
+        levels = book.levels
+        for tick, size in incoming.items():
+            level = levels.get(tick)
+            if level is None:
+                level = levels[tick] = LevelLife(ts, size, self.history)
+                if size >= self.min_size:
+                    level.large_ts = ts
+            elif size != level.size:
+                self._resize(sym, side, tick, level, size, ts)
+        lo, hi = min(incoming), max(incoming)
+        book.best, book.worst = (hi, lo) if side == "bid" else (lo, hi)
+        if len(levels) == len(incoming):
+            return
+        for tick in [t for t in levels if t not in incoming]:
+            level = levels.pop(tick)
+            # only levels inside the visible range were pulled; the rest scrolled out of depth
+            if lo <= tick <= hi:
+                self._resize(sym, side, tick, level, 0.0, ts)
+
+    def _resize(self, sym: str, side: str, tick: int, level: LevelLife, size: float, ts: float) -> None:
+        prev = level.size
+        level.size = size
+        level.history.append((ts, size))
+        if size > prev:
+            level.peak = max(level.peak, size)
+            if level.large_ts is None and size >= self.min_size:
+                level.large_ts = ts
+            return
+        filled = min(level.traded, prev - size)
+        level.traded -= filled
+        cancelled = prev - size - filled
+        large_ts = level.large_ts
+        if size < self.min_size:
+            level.large_ts = None
+        if cancelled < self.min_size or large_ts is None:
+            return
+        lifetime = ts - large_ts
+        fill_ratio = (level.peak - prev + filled) / level.peak if level.peak else 0.0
+        if lifetime <= self.max_lifetime and fill_ratio <= self.max_fill_ratio:
+            self._emit(sym, side, tick, cancelled, lifetime, level)
+
+    def _emit(self, symbol: str, side: str, tick: int, cancelled: float, lifetime: float, level: LevelLife) -> None:
         evt = MarketEvent(
             event_type="alert_event",
             timestamp=datetime.now(timezone.utc),
@@ -66,10 +156,11 @@ class SpoofingDetector:
             payload={
                 "type": "spoof",
                 "side": side,
-                "added_bid": add_b,
-                "added_ask": add_a,
-                "removed_bid": rem_b,
-                "removed_ask": rem_a,
+                "price": self.ticks.to_price(symbol, tick),
+                "size": cancelled,
+                "peak": level.peak,
+                "lifetime_ms": round(lifetime * 1000.0, 3),
+                "remaining": level.size,
             },
         )
         self.bus.publish(evt)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from core.timer import BusTimer
+from engines.detectors.records import TradeRecord, parse_trade
+from models.market_event import MarketEvent
+
+
+class SweepCluster:
+    """Running aggregate of one candidate sweep; updated in O(1) per print."""
+
+    __slots__ = ("side", "start_ts", "last_ts", "seen", "first_tick", "last_tick", "levels", "size", "notional", "prints")
+
+    def __init__(self, side: str, ts: float, tick: int, price: float, size: float) -> None:
+        self.side = side
+        self.start_ts = self.last_ts = ts
+        self.seen = time.monotonic()
+        self.first_tick = self.last_tick = tick
+        self.levels = 1
+        self.size = size
+        self.notional = price * size
+        self.prints = 1
+
+    def extends(self, side: str, ts: float, tick: int, gap: float, max_step: int) -> bool:
+        if side != self.side or ts - self.last_ts > gap:
+            return False
+        step = tick - self.last_tick if side == "buy" else self.last_tick - tick
+        return 0 <= step <= max_step
+
+    def add(self, ts: float, tick: int, price: float, size: float) -> None:
+        if tick != self.last_tick:
+            self.levels += 1
+            self.last_tick = tick
+        self.last_ts = max(self.last_ts, ts)
+        self.seen = time.monotonic()
+        self.size += size
+        self.notional += price * size
+        self.prints += 1
+
+
+class _SymbolTape:
+    __slots__ = ("cluster", "last_tick", "last_side")
+
+    def __init__(self) -> None:
+        self.cluster: Optional[SweepCluster] = None
+        self.last_tick: Optional[int] = None
+        self.last_side: Optional[str] = None
+
+
+class SweepDetector:
+    """
+    Clusters the raw trade stream into sweeps: prints on the same side, no more than
+    ``gap_ms`` apart, walking contiguous price levels (at most ``max_step_ticks`` per step) in
+    the aggressor's direction. A cluster crossing at least ``min_levels`` levels with
+    ``min_size`` total size emits a single alert_event type='sweep' with levels, size and VWAP.
+
+    Feed semantics:
+    - Binance aggTrade already aggregates one taker's fills per price, so a sweep arrives as
+      several aggTrades sharing the exchange trade time; ``exchange_ts`` (ms) is preferred over
+      receive time when the provider passes it.
+    - IBKR AllLast prints carry no aggressor side; it is inferred with the tick rule
+      (uptick = buy, downtick = sell, unchanged = previous side).
+
+    Clusters close when the next print does not extend them or, with ``flush_ms`` > 0, on a
+    ``sweep_flush`` timer once idle for ``gap_ms`` on the event clock (the newest print time
+    seen on any symbol), like the clustering itself, so replay or a catch-up burst is never
+    cut mid-sweep by wall time. On a quiet feed no print moves that clock, so the timer also
+    closes clusters that have seen no print for ``max_idle_ms`` of wall time.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        gap_ms: float = 50.0,
+        min_levels: int = 3,
+        min_size: float = 0.0,
+        max_step_ticks: int = 1,
+        flush_ms: float = 250.0,
+        max_idle_ms: float = 1000.0,
+        ticks: TickSizeRegistry = TICK_SIZES,
+    ) -> None:
+        self.bus = bus
+        self.gap = gap_ms / 1000.0
+        self.min_levels = min_levels
+        self.min_size = min_size
+        self.max_step_ticks = max_step_ticks
+        self.max_idle = max_idle_ms / 1000.0
+        self.ticks = ticks
+        self.tapes: Dict[str, _SymbolTape] = {}
+        self.clock = float("-inf")  # newest print time seen (exchange time when given)
+        self.bus.subscribe("trade", self.on_trade)
+        self.bus.subscribe("timer", self.on_timer)
+        self._subs = ("trade", "timer")
+        self._timer: Optional[BusTimer] = None
+        if flush_ms > 0:
+            self._timer = BusTimer(bus, "sweep_flush", flush_ms / 1000.0)
+            self._timer.start()
+
+    def stop(self) -> None:
+        if self._timer:
+            self._timer.stop()
+            self._timer = None
+        for et in getattr(self, "_subs", ()):
+            self.bus.unsubscribe(et, self.on_trade if et == "trade" else self.on_timer)
+
+    def on_trade(self, evt: MarketEvent) -> None:
+        rec = parse_trade(evt, self.ticks)
+        if rec is not None:
+            self.on_trade_record(rec)
+
+    def on_trade_record(self, rec: TradeRecord) -> None:
+        price, size, tick = rec.price, rec.size, rec.tick
+        if price <= 0 or size <= 0:
+            return
+        sym = rec.symbol
+        tape = self.tapes.get(sym)
+        if tape is None:
+            tape = self.tapes[sym] = _SymbolTape()
+        side = self._side(tape, tick, rec.side)
+        tape.last_tick = tick
+        tape.last_side = side
+        if side is None:
+            return
+        ts = rec.exchange_ts if rec.exchange_ts is not None else rec.ts
+        if ts > self.clock:
+            self.clock = ts
+        cluster = tape.cluster
+        if cluster is not None and cluster.extends(side, ts, tick, self.gap, self.max_step_ticks):
+            cluster.add(ts, tick, price, size)
+            return
+        if cluster is not None:
+            self._close(sym, cluster)
+        tape.cluster = SweepCluster(side, ts, tick, price, size)
+
+    def on_timer(self, evt: MarketEvent) -> None:
+        if evt.payload.get("name") == "sweep_flush":
+            self.flush(idle=self.gap, wall_idle=self.max_idle)
+
+    def flush(self, idle: float = 0.0, wall_idle: Optional[float] = None) -> List[str]:
+        """
+        Close clusters idle for at least ``idle`` seconds of event time, or ``wall_idle``
+        seconds of wall time when given; returns the symbols flushed.
+        """
+        now = self.clock
+        wall = time.monotonic()
+        flushed = []
+        for sym, tape in self.tapes.items():
+            cluster = tape.cluster
+            if cluster is None:
+                continue
+            if now - cluster.last_ts >= idle or (wall_idle is not None and wall - cluster.seen >= wall_idle):
+                tape.cluster = None
+                self._close(sym, cluster)
+                flushed.append(sym)
+        return flushed
+
+    def _side(self, tape: _SymbolTape, tick: int, side: Optional[str]) -> Optional[str]:
+        if side is not None:
+            return side
+        if tape.last_tick is None:
+            return None
+        if tick > tape.last_tick:
+            return "buy"
+        if tick < tape.last_tick:
+            return "sell"
+        return tape.last_side
+
+    def _close(self, symbol: str, cluster: SweepCluster) -> None:
+        if cluster.levels < self.min_levels or cluster.size < self.min_size:
+            return
+        evt = MarketEvent(
+            event_type="alert_event",
+            timestamp=datetime.now(timezone.utc),
+            source="sweep_detector",
+            symbol=symbol,
+            payload={
+                "type": "sweep",
+                "side": cluster.side,
+                "levels": cluster.levels,
+                "size": cluster.size,
+                "vwap": cluster.notional / cluster.size,
+                "start_price": self.ticks.to_price(symbol, cluster.first_tick),
+                "end_price": self.ticks.to_price(symbol, cluster.last_tick),
+                "prints": cluster.prints,
+                "duration_ms": round((cluster.last_ts - cluster.start_ts) * 1000.0, 3),
+            },
+        )
+        self.bus.publish(evt)
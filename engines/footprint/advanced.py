@@ -1,36 +1,235 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Dict
+from collections import deque
+from decimal import Decimal
+from typing import Deque, Dict, Optional
 
+import numpy as np
+
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
 from models.market_event import MarketEvent
 
+_GROW_ROWS = 32
+
+
+class FootprintBar:
+    """
+    Footprint cells for one time bar, stored as numeric arrays indexed by tick offset.
+
+    Row ``i`` holds the price ``(base_tick + i) * tick_size``. Arrays grow by a fixed
+    padding when a print lands outside the allocated range. POC, diagonal imbalances
+    and the longest stacked-imbalance runs are maintained incrementally per trade.
+    """
+
+    __slots__ = (
+        "index",
+        "tick_size",
+        "base_tick",
+        "buy",
+        "sell",
+        "delta",
+        "buy_imb",
+        "sell_imb",
+        "lo",
+        "hi",
+        "poc_row",
+        "poc_volume",
+        "stacked_buy",
+        "stacked_sell",
+        "_decimals",
+    )
+
+    def __init__(self, index: int, tick: int, tick_size: float) -> None:
+        self.index = index
+        self.tick_size = tick_size
+        self.base_tick = tick - _GROW_ROWS // 2
+        self.buy = np.zeros(_GROW_ROWS, dtype=np.float64)
+        self.sell = np.zeros(_GROW_ROWS, dtype=np.float64)
+        self.delta = np.zeros(_GROW_ROWS, dtype=np.float64)
+        self.buy_imb = np.zeros(_GROW_ROWS, dtype=np.bool_)
+        self.sell_imb = np.zeros(_GROW_ROWS, dtype=np.bool_)
+        self.lo = self.hi = tick - self.base_tick
+        self.poc_row = self.lo
+        self.poc_volume = 0.0
+        self.stacked_buy = 0
+        self.stacked_sell = 0
+        self._decimals = _tick_decimals(tick_size)
+
+    # ------------------------------------------------------------------
+    # accumulation
+    # ------------------------------------------------------------------
+    def add(self, tick: int, buy: float, sell: float, ratio: float) -> None:
+        row = self._row(tick)
+        self.buy[row] += buy
+        self.sell[row] += sell
+        self.delta[row] += buy - sell
+        if row < self.lo:
+            self.lo = row
+        if row > self.hi:
+            self.hi = row
+        vol = self.buy[row] + self.sell[row]
+        if vol > self.poc_volume:
+            self.poc_volume = vol
+            self.poc_row = row
+        # buy[row] feeds buy-imbalance at row and sell-imbalance at row-1;
+        # sell[row] feeds sell-imbalance at row and buy-imbalance at row+1.
+        for r in (row - 1, row, row + 1):
+            if self.lo <= r <= self.hi:
+                self._refresh_imbalance(r, ratio)
+
+    def _row(self, tick: int) -> int:
+        row = tick - self.base_tick
+        size = len(self.buy)
+        if 0 <= row < size:
+            return row
+        if row < 0:
+            shift = -row + _GROW_ROWS
+            self._resize(shift, size + shift)
+            self.base_tick -= shift
+            return row + shift
+        self._resize(0, row + _GROW_ROWS)
+        return row
+
+    def _resize(self, shift: int, new_size: int) -> None:
+        for name in ("buy", "sell", "delta", "buy_imb", "sell_imb"):
+            old = getattr(self, name)
+            grown = np.zeros(new_size, dtype=old.dtype)
+            grown[shift : shift + len(old)] = old
+            setattr(self, name, grown)
+        self.lo += shift
+        self.hi += shift
+        self.poc_row += shift
+
+    def _refresh_imbalance(self, r: int, ratio: float) -> None:
+        below = self.sell[r - 1] if r - 1 >= self.lo else 0.0
+        above = self.buy[r + 1] if r + 1 <= self.hi else 0.0
+        buy_flag = self.buy[r] > 0 and self.buy[r] >= ratio * below
+        sell_flag = self.sell[r] > 0 and self.sell[r] >= ratio * above
+        if buy_flag != self.buy_imb[r]:
+            self.buy_imb[r] = buy_flag
+            self.stacked_buy = self._stacked(self.buy_imb, r, buy_flag, self.stacked_buy)
+        if sell_flag != self.sell_imb[r]:
+            self.sell_imb[r] = sell_flag
+            self.stacked_sell = self._stacked(self.sell_imb, r, sell_flag, self.stacked_sell)
+
+    def _stacked(self, flags: np.ndarray, r: int, became_set: bool, current: int) -> int:
+        if became_set:
+            # only the run through r can have grown; walk its bounds
+            start, end = r, r
+            while start - 1 >= self.lo and flags[start - 1]:
+                start -= 1
+            while end + 1 <= self.hi and flags[end + 1]:
+                end += 1
+            return max(current, end - start + 1)
+        # a run was split; recompute the longest run vectorised over the used rows
+        return _longest_run(flags[self.lo : self.hi + 1])
+
+    # ------------------------------------------------------------------
+    # views (float prices are produced here only, for display)
+    # ------------------------------------------------------------------
+    def price_of(self, row: int) -> float:
+        return round((self.base_tick + row) * self.tick_size, self._decimals)
+
+    @property
+    def poc_price(self) -> Optional[float]:
+        return self.price_of(self.poc_row) if self.poc_volume > 0 else None
+
+    @property
+    def low_price(self) -> float:
+        return self.price_of(self.lo)
+
+    def as_dict(self) -> Dict[float, Dict[str, float]]:
+        out: Dict[float, Dict[str, float]] = {}
+        for row in range(self.lo, self.hi + 1):
+            b = float(self.buy[row])
+            s = float(self.sell[row])
+            if b or s:
+                out[self.price_of(row)] = {"buy": b, "sell": s}
+        return out
+
+
+def _tick_decimals(tick_size: float) -> int:
+    exponent = Decimal(str(tick_size)).normalize().as_tuple().exponent
+    return max(0, -int(exponent))
+
+
+def _longest_run(flags: np.ndarray) -> int:
+    if not flags.any():
+        return 0
+    padded = np.concatenate(([False], flags, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return int((edges[1::2] - edges[::2]).max())
+
 
 class FootprintEngineAdvanced:
     """
-    Maintains per-price footprint (buy/sell volume) and derives imbalances.
+    Maintains time-bucketed footprints (buy/sell volume per tick) and derives imbalances.
+    Only the last ``max_bars`` bars are kept per symbol, so memory is bounded.
     """
 
-    def __init__(self) -> None:
-        self.footprints: Dict[str, Dict[float, Dict[str, float]]] = defaultdict(lambda: defaultdict(lambda: {"buy": 0.0, "sell": 0.0}))
+    def __init__(
+        self,
+        bar_seconds: int = 60,
+        max_bars: int = 30,
+        tick_size: Optional[float] = None,
+        imbalance_ratio: float = 3.0,
+        ticks: TickSizeRegistry = TICK_SIZES,
+    ) -> None:
+        self.bar_seconds = bar_seconds
+        self.max_bars = max_bars
+        # a fixed tick_size overrides the per-instrument registry for every symbol
+        self.ticks = TickSizeRegistry(fixed=tick_size) if tick_size else ticks
+        self.tick_size = tick_size
+        self.imbalance_ratio = imbalance_ratio
+        self.bars: Dict[str, Deque[FootprintBar]] = {}
 
-    def on_trade(self, evt: MarketEvent) -> Dict[float, Dict[str, float]]:
+    def on_trade(self, evt: MarketEvent) -> Optional[FootprintBar]:
         payload = evt.payload or {}
         symbol = evt.symbol
-        price = float(payload.get("price") or payload.get("last") or 0.0)
-        size = float(payload.get("size", payload.get("qty", 0.0)) or 0.0)
+        try:
+            price = float(payload.get("price") or payload.get("last") or 0.0)
+            size = float(payload.get("size", payload.get("qty", 0.0)) or 0.0)
+        except Exception:
+            return self.current(symbol)
+        if price <= 0:
+            return self.current(symbol)
         side = payload.get("side") or payload.get("aggressor")
-        fp = self.footprints[symbol]
         if side == "buy":
-            fp[price]["buy"] += size
+            buy, sell = size, 0.0
         elif side == "sell":
-            fp[price]["sell"] += size
+            buy, sell = 0.0, size
         else:
-            fp[price]["buy"] += size * 0.5
-            fp[price]["sell"] += size * 0.5
-        self.footprints[symbol] = fp
-        return fp
-
-    def imbalance_heatmap(self, symbol: str) -> Dict[float, float]:
-        fp = self.footprints.get(symbol, {})
-        return {p: (v.get("buy", 0.0) - v.get("sell", 0.0)) for p, v in fp.items()}
+            buy = sell = size * 0.5
+        tick = self.ticks.to_tick(symbol, price)
+        bar = self._bar_for(symbol, int(evt.timestamp.timestamp()) // self.bar_seconds, tick)
+        bar.add(tick, buy, sell, self.imbalance_ratio)
+        return bar
+
+    def _bar_for(self, symbol: str, index: int, tick: int) -> FootprintBar:
+        history = self.bars.get(symbol)
+        if history is None:
+            history = self.bars[symbol] = deque(maxlen=self.max_bars)
+        if history and history[-1].index >= index:
+            return history[-1]
+        bar = FootprintBar(index, tick, self.ticks.tick_size(symbol))
+        history.append(bar)
+        return bar
+
+    def current(self, symbol: str) -> Optional[FootprintBar]:
+        history = self.bars.get(symbol)
+        return history[-1] if history else None
+
+    def snapshot(self, symbol: str) -> Dict[float, Dict[str, float]]:
+        """Display-ready cells of the current bar (price -> buy/sell)."""
+        bar = self.current(symbol)
+        return bar.as_dict() if bar else {}
+
+    def imbalance_heatmap(self, symbol: str) -> np.ndarray:
+        """
+        Buy-minus-sell per tick of the current bar, lowest price first.
+        Returns a view into the bar's storage; use ``current(symbol).low_price`` for the first row's price.
+        """
+        bar = self.current(symbol)
+        if bar is None:
+            return np.zeros(0, dtype=np.float64)
+        return bar.delta[bar.lo : bar.hi + 1]
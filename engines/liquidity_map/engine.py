@@ -1,68 +1,116 @@
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Any, Deque
+from typing import Dict, Optional
 
 from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from engines.detectors.records import parse_book
+from engines.liquidity_map.grid import HeatGrid
 from models.market_event import MarketEvent
 
 
-@dataclass
 class LiquidityState:
-    resting: Dict[float, Dict[str, float]] = field(default_factory=dict)
-    history: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=50))
+    __slots__ = ("grid", "last_ts", "bids", "asks")
+
+    def __init__(self, grid: HeatGrid) -> None:
+        self.grid = grid
+        self.last_ts: Optional[float] = None
+        self.bids: Dict[int, float] = {}
+        self.asks: Dict[int, float] = {}
 
 
 class LiquidityMapEngine:
     """
-    Tracks resting liquidity, spoof-like patterns, absorption/exhaustion.
-    Emits liquidity_update events.
+    Accumulates resting liquidity into a price x time heat grid (see HeatGrid).
+
+    Each book update credits the previous book with the time it was resting, split across
+    the ``slice_seconds`` slices it spanned. When a slice closes its column is published as a
+    sparse liquidity_update (rows, bid, ask plus the grid origin); consumers keep a mirror grid
+    and never receive the full book. The row window re-centres on the mid once it drifts within
+    ``margin`` rows of an edge.
     """
 
-    def __init__(self, bus: EventBus) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        rows: int = 200,
+        columns: int = 300,
+        slice_seconds: float = 1.0,
+        margin: int = 20,
+        ticks: TickSizeRegistry = TICK_SIZES,
+    ) -> None:
         self.bus = bus
+        self.rows = rows
+        self.columns = columns
+        self.slice_seconds = slice_seconds
+        self.margin = margin
+        self.ticks = ticks
         self.state: Dict[str, LiquidityState] = {}
         self.bus.subscribe("dom_snapshot", self.on_dom)
-        self.bus.subscribe("trade", self.on_trade)
-        self._subs = ("dom_snapshot", "trade")
+        self._subs = ("dom_snapshot",)
 
     def stop(self) -> None:
         for et in getattr(self, "_subs", ()):
-            self.bus.unsubscribe(et, self.on_dom if et == "dom_snapshot" else self.on_trade)
+            self.bus.unsubscribe(et, self.on_dom)
+
+    def _state(self, symbol: str) -> LiquidityState:
+        st = self.state.get(symbol)
+        if st is None:
+            st = self.state[symbol] = LiquidityState(HeatGrid(self.rows, self.columns, self.slice_seconds))
+        return st
 
     def on_dom(self, evt: MarketEvent) -> None:
-        sym = evt.symbol
-        payload = evt.payload or {}
-        dom = payload.get("dom") or []
-        st = self.state.setdefault(sym, LiquidityState())
-        liq_map: Dict[float, Dict[str, float]] = {}
-        for level in dom:
-            try:
-                price = float(level.get("price"))
-                bid = float(level.get("bid_size", 0.0))
-                ask = float(level.get("ask_size", 0.0))
-            except Exception:
-                continue
-            liq_map[price] = {"bid": bid, "ask": ask}
-        st.resting = liq_map
-        st.history.append({"ts": evt.timestamp, "resting": liq_map})
-        self._emit(sym, st)
+        rec = parse_book(evt, self.ticks)
+        if rec is None:
+            return
+        st = self._state(rec.symbol)
+        grid = st.grid
+        if st.last_ts is not None and rec.ts > st.last_ts:
+            self._accumulate(rec.symbol, st, rec.ts)
+        elif grid.current is None:
+            grid.open_slice(grid.slice_of(rec.ts))
+        st.last_ts = max(rec.ts, st.last_ts or rec.ts)
+        st.bids, st.asks = rec.bid_ticks, rec.ask_ticks
+        # sides are best-first, so the first key is the touch
+        touch = [next(iter(side)) for side in (rec.bid_ticks, rec.ask_ticks) if side]
+        mid = sum(touch) // len(touch)
+        row = grid.row(mid)
+        if row is None or row < self.margin or row >= self.rows - self.margin:
+            grid.center(mid)
+
+    def _accumulate(self, symbol: str, st: LiquidityState, ts: float) -> None:
+        grid = st.grid
+        span = grid.slice_seconds
+        # older than the ring would be overwritten anyway
+        start = max(st.last_ts, ts - span * grid.columns)
+        # walk integer slice ids: float boundaries (k * 0.1 // 0.1 == k - 1) would stall
+        first, last = grid.slice_of(start), grid.slice_of(ts)
+        for slice_id in range(first, last + 1):
+            if slice_id != grid.current:
+                if grid.current is not None:
+                    self._emit(symbol, grid, grid.current)
+                grid.open_slice(slice_id)
+            end = ts if slice_id == last else (slice_id + 1) * span
+            if end > start:
+                col = slice_id % grid.columns
+                grid.add(col, st.bids, end - start, True)
+                grid.add(col, st.asks, end - start, False)
+                start = end
 
-    def on_trade(self, evt: MarketEvent) -> None:
-        sym = evt.symbol
-        st = self.state.setdefault(sym, LiquidityState())
-        # For now, just note trade size to check exhaustion
-        st.history.append({"ts": evt.timestamp, "trade": evt.payload})
-        self._emit(sym, st)
+    def flush(self, symbol: str) -> None:
+        """Publish the open (partial) column of ``symbol``."""
+        st = self.state.get(symbol)
+        if st is not None and st.grid.current is not None:
+            self._emit(symbol, st.grid, st.grid.current)
 
-    def _emit(self, symbol: str, st: LiquidityState) -> None:
-        ts = datetime.now(timezone.utc)
-        payload = {"resting": st.resting, "history_len": len(st.history)}
+    def _emit(self, symbol: str, grid: HeatGrid, slice_id: int) -> None:
+        payload = grid.column(slice_id)
+        payload["slice_seconds"] = grid.slice_seconds
+        payload["tick_size"] = self.ticks.tick_size(symbol)
         evt = MarketEvent(
             event_type="liquidity_update",
-            timestamp=ts,
+            timestamp=datetime.now(timezone.utc),
             source="liquidity_map",
             symbol=symbol,
             payload=payload,
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class HeatGrid:
+    """
+    Price x time ring buffer of time-weighted resting size.
+
+    Rows are consecutive ticks starting at ``origin`` (row 0 = lowest price); columns are
+    ``slice_seconds`` time slices, slice ``n`` living in column ``n % columns``. Cells hold
+    size x seconds, so dividing by ``slice_seconds`` gives the average resting size over the
+    slice. Moving the origin shifts rows in place and clears the ones that scrolled in.
+    """
+
+    def __init__(self, rows: int = 200, columns: int = 300, slice_seconds: float = 1.0) -> None:
+        if rows <= 0 or columns <= 0 or slice_seconds <= 0:
+            raise ValueError("rows, columns and slice_seconds must be positive")
+        self.rows = rows
+        self.columns = columns
+        self.slice_seconds = slice_seconds
+        self.bid = np.zeros((rows, columns), dtype=np.float64)
+        self.ask = np.zeros((rows, columns), dtype=np.float64)
+        self.slices = np.full(columns, -1, dtype=np.int64)
+        self.origin: Optional[int] = None
+        self.current: Optional[int] = None
+
+    def slice_of(self, ts: float) -> int:
+        return int(ts // self.slice_seconds)
+
+    def row(self, tick: int) -> Optional[int]:
+        if self.origin is None:
+            return None
+        row = tick - self.origin
+        return row if 0 <= row < self.rows else None
+
+    def center(self, tick: int) -> None:
+        self.set_origin(tick - self.rows // 2)
+
+    def set_origin(self, origin: int) -> None:
+        if self.origin is None:
+            self.origin = origin
+            return
+        shift = origin - self.origin
+        if shift == 0:
+            return
+        self.origin = origin
+        for grid in (self.bid, self.ask):
+            if abs(shift) >= self.rows:
+                grid[:] = 0.0
+            elif shift > 0:
+                grid[:-shift] = grid[shift:]
+                grid[-shift:] = 0.0
+            else:
+                grid[-shift:] = grid[:shift]
+                grid[:-shift] = 0.0
+
+    def open_slice(self, slice_id: int) -> int:
+        col = slice_id % self.columns
+        if self.slices[col] != slice_id:
+            self.bid[:, col] = 0.0
+            self.ask[:, col] = 0.0
+            self.slices[col] = slice_id
+        self.current = slice_id
+        return col
+
+    def add(self, col: int, levels: Dict[int, float], weight: float, is_bid: bool) -> None:
+        grid = self.bid if is_bid else self.ask
+        origin, rows = self.origin, self.rows
+        for tick, size in levels.items():
+            row = tick - origin
+            if 0 <= row < rows:
+                grid[row, col] += size * weight
+
+    def column(self, slice_id: int) -> Dict[str, object]:
+        """Sparse view of one slice: only rows with resting size on either side."""
+        col = slice_id % self.columns
+        bid, ask = self.bid[:, col], self.ask[:, col]
+        rows = np.flatnonzero((bid > 0) | (ask > 0))
+        return {
+            "slice": slice_id,
+            "origin_tick": self.origin,
+            "rows": rows.tolist(),
+            "bid": bid[rows].tolist(),
+            "ask": ask[rows].tolist(),
+        }
+
+    def apply_column(self, slice_id: int, origin: int, rows: Sequence[int], bid: Sequence[float], ask: Sequence[float]) -> int:
+        """Write a published column into a mirror grid, re-aligning rows to ``origin`` first."""
+        self.set_origin(origin)
+        col = self.open_slice(slice_id)
+        self.bid[:, col] = 0.0
+        self.ask[:, col] = 0.0
+        idx = np.asarray(rows, dtype=np.int64)
+        keep = (idx >= 0) & (idx < self.rows)
+        self.bid[idx[keep], col] = np.asarray(bid, dtype=np.float64)[keep]
+        self.ask[idx[keep], col] = np.asarray(ask, dtype=np.float64)[keep]
+        return col
+
+    def ordered_columns(self) -> List[int]:
+        """Column indices holding data, oldest slice first."""
+        filled = np.flatnonzero(self.slices >= 0)
+        return filled[np.argsort(self.slices[filled])].tolist()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+Level = Tuple[float, float]
+
+
+def _level(raw: Any) -> Tuple[Optional[float], float]:
+    if isinstance(raw, dict):
+        price, size = raw.get("price"), raw.get("size", raw.get("qty"))
+    elif isinstance(raw, (list, tuple)) and len(raw) >= 2:
+        price, size = raw[0], raw[1]
+    else:
+        return None, 0.0
+    try:
+        return float(price), float(size or 0.0)
+    except (TypeError, ValueError):
+        return None, 0.0
+
+
+def book_sides(payload: Dict[str, Any]) -> Tuple[List[Level], List[Level]]:
+    """
+    Split a dom_snapshot payload into (bids, asks) as (price, size) lists, best level first.
+
+    Accepts the shapes providers emit: ``bids``/``asks`` level lists (IBKR, DOMEngine),
+    a ``dom`` list with bid_size/ask_size per price (Binance, OKX, sim), or a ``ladder``
+    dict price -> {"bid", "ask"}. Falls back to top-of-book bid/ask/bid_size/ask_size.
+    """
+    bids: List[Level] = []
+    asks: List[Level] = []
+    if payload.get("bids") or payload.get("asks"):
+        for side, out in (("bids", bids), ("asks", asks)):
+            for raw in payload.get(side) or ():
+                price, size = _level(raw)
+                if price is not None and size > 0:
+                    out.append((price, size))
+    elif payload.get("dom"):
+        for lvl in payload["dom"]:
+            if not isinstance(lvl, dict) or lvl.get("price") is None:
+                continue
+            price = float(lvl["price"])
+            bid_size = float(lvl.get("bid_size", 0.0) or 0.0)
+            ask_size = float(lvl.get("ask_size", 0.0) or 0.0)
+            if bid_size > 0:
+                bids.append((price, bid_size))
+            if ask_size > 0:
+                asks.append((price, ask_size))
+    elif isinstance(payload.get("ladder"), dict):
+        for price, entry in payload["ladder"].items():
+            if not isinstance(entry, dict):
+                continue
+            bid_size = float(entry.get("bid", 0.0) or 0.0)
+            ask_size = float(entry.get("ask", 0.0) or 0.0)
+            if bid_size > 0:
+                bids.append((float(price), bid_size))
+            if ask_size > 0:
+                asks.append((float(price), ask_size))
+    bids.sort(key=lambda lvl: -lvl[0])
+    asks.sort(key=lambda lvl: lvl[0])
+    if not bids and payload.get("bid") is not None:
+        bids.append((float(payload["bid"]), float(payload.get("bid_size", payload.get("bid_qty", 0.0)) or 0.0)))
+    if not asks and payload.get("ask") is not None:
+        asks.append((float(payload["ask"]), float(payload.get("ask_size", payload.get("ask_qty", 0.0)) or 0.0)))
+    return bids, asks
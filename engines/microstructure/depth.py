@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Dict, Optional
 
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
 from models.market_event import MarketEvent
 
 
@@ -14,7 +15,7 @@ class DepthState:
     ask_size: float = 0.0
     imbalance: float = 0.0
     queue_position: float = 0.0
-    liquidity_map: Dict[str, float] = field(default_factory=dict)
+    liquidity_map: Dict[int, float] = field(default_factory=dict)
 
 
 class DepthEngine:
@@ -22,7 +23,8 @@ class DepthEngine:
     Maintains depth ladder state, computes imbalance and queue position estimates.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, ticks: TickSizeRegistry = TICK_SIZES) -> None:
+        self.ticks = ticks
         self.state: Dict[str, DepthState] = {}
 
     def on_dom(self, evt: MarketEvent) -> DepthState:
@@ -35,7 +37,7 @@ class DepthEngine:
         ladder = payload.get("ladder", {})
         dom_list = payload.get("dom")
         if dom_list:
-            ladder = {str(l.get("price")): {"bid": l.get("bid_size", 0.0), "ask": l.get("ask_size", 0.0)} for l in dom_list if l.get("price") is not None}
+            ladder = {l.get("price"): {"bid": l.get("bid_size", 0.0), "ask": l.get("ask_size", 0.0)} for l in dom_list if l.get("price") is not None}
         my_order_qty = float(payload.get("my_order_qty", 0.0) or 0.0)
 
         st = self.state.get(symbol, DepthState())
@@ -45,15 +47,17 @@ class DepthEngine:
         st.ask_size = ask_size
         denom = bid_size + ask_size
         st.imbalance = ((bid_size - ask_size) / denom) if denom else 0.0
-        normalized = {}
+        normalized: Dict[int, float] = {}
+        to_tick = self.ticks.to_tick
         for k, v in ladder.items():
             try:
+                tick = to_tick(symbol, float(k))
                 if isinstance(v, dict):
                     bid_v = float(v.get("bid", 0.0) or 0.0)
                     ask_v = float(v.get("ask", 0.0) or 0.0)
-                    normalized[str(k)] = bid_v + ask_v
+                    normalized[tick] = bid_v + ask_v
                 else:
-                    normalized[str(k)] = float(v)
+                    normalized[tick] = float(v)
             except Exception:
                 continue
         st.liquidity_map = normalized
@@ -1,79 +1,193 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
 
 from core.event_bus import EventBus
+from core.timer import BusTimer
 from engines.microstructure.depth import DepthEngine
 from engines.microstructure.delta import MicroDeltaEngine
-from engines.microstructure.snapshot import MicrostructureSnapshot
-from engines.microstructure.features import MicrostructureFeatureExtractor
+from engines.microstructure.order_flow import OrderFlowEngine
+from engines.microstructure.patterns import PatternEngine
+from engines.microstructure.snapshot import HEAVY_FIELDS, MicrostructureSnapshot
+from engines.microstructure.features import FeatureBatch, MicrostructureFeatureExtractor
 from engines.tape.advanced import AdvancedTapeEngine
 from engines.footprint.advanced import FootprintEngineAdvanced
 from engines.liquidity.engine import LiquidityEngine
 from models.market_event import MarketEvent
 
+# Always present so delta consumers can identify and order updates.
+_KEY_FIELDS = ("symbol", "timestamp") + tuple(HEAVY_FIELDS.values())
+
 
 class MicrostructureEngine:
     """
     Orchestrates advanced microstructure engines and publishes aggregated snapshots.
+
+    Publication is coalesced per symbol: a snapshot goes out once ``every_n`` updates have
+    accumulated and at most once per ``min_interval_ms``; updates held back by either are
+    flushed from a ``timer`` event (every ``min_interval_ms``, else every ``flush_ms``). Heavy fields (footprint, liquidity_map) are only
+    shipped when their version changes: the liquidity map's when a book snapshot changes its
+    resting sizes, the footprint's on every trade (each print changes it, so that saving
+    mostly comes from coalescing). With ``delta_mode`` only fields that changed since
+    the previous publication for the symbol are sent (see ``merge_snapshot``). The full
+    FEATURE_SCHEMA row is attached as ``payload["vector"]``. ``tags`` carries the patterns
+    PatternEngine detects over its rolling window (absorption, spoof, vacuum, divergence).
     """
 
-    def __init__(self, bus: EventBus, symbols: list[str]) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        symbols: list[str],
+        min_interval_ms: float = 0.0,
+        every_n: int = 1,
+        delta_mode: bool = False,
+        pattern_window_seconds: float = 5.0,
+        flush_ms: float = 50.0,
+    ) -> None:
         self.bus = bus
         self.symbols = symbols
         self.depth = DepthEngine()
+        self.order_flow = OrderFlowEngine()
         self.delta = MicroDeltaEngine()
         self.tape = AdvancedTapeEngine()
         self.footprint = FootprintEngineAdvanced()
         self.liquidity = LiquidityEngine()
         self.features = MicrostructureFeatureExtractor()
+        self.patterns = PatternEngine(window_seconds=pattern_window_seconds)
+        self.min_interval = max(0.0, min_interval_ms) / 1000.0
+        self.every_n = max(1, int(every_n))
+        self.delta_mode = delta_mode
+        self.flush_seconds = max(0.0, flush_ms) / 1000.0
+        self.versions: Dict[str, Dict[str, int]] = {}
+        self._pending: Dict[str, int] = {}
+        self._last_publish: Dict[str, float] = {}
+        self._last_sent: Dict[str, Dict[str, Any]] = {}
+        self._tick_mid: Dict[str, float] = {}
+        self._timer: Optional[BusTimer] = None
+        self.published = 0
+        self.coalesced = 0
 
     def start(self) -> None:
         for et in ("dom_snapshot", "dom_delta", "trade", "tick"):
             self.bus.subscribe(et, self.on_event)
         self._subs = ("dom_snapshot", "dom_delta", "trade", "tick")
+        interval = self.min_interval or (self.flush_seconds if self.every_n > 1 else 0.0)
+        if interval:
+            self.bus.subscribe("timer", self.on_timer)
+            self._subs += ("timer",)
+            self._timer = BusTimer(self.bus, "microstructure_flush", interval)
+            self._timer.start()
 
     def stop(self) -> None:
+        if self._timer:
+            self._timer.stop()
+            self._timer = None
         subs = getattr(self, "_subs", ("dom_snapshot", "dom_delta", "trade", "tick"))
         for et in subs:
-            self.bus.unsubscribe(et, self.on_event)
+            self.bus.unsubscribe(et, self.on_timer if et == "timer" else self.on_event)
 
     def on_event(self, evt: MarketEvent) -> None:
+        if self._apply(evt):
+            self._on_update(evt.symbol)
+
+    def _apply(self, evt: MarketEvent) -> bool:
         symbol = evt.symbol
         if evt.event_type == "dom_snapshot":
-            depth_state = self.depth.on_dom(evt)
-            snapshot = self._build_snapshot(symbol, depth_state=depth_state)
-            self._publish_snapshot(snapshot)
+            prev = self.depth.state.get(symbol)
+            prev_map = prev.liquidity_map if prev is not None else None
+            if self.depth.on_dom(evt).liquidity_map != prev_map:
+                self._bump(symbol, "liquidity_map")
+            self.order_flow.on_dom(evt)
+            self.patterns.on_dom(evt)
+            self._tick_mid.pop(symbol, None)
         elif evt.event_type == "dom_delta":
-            liq = self.liquidity.on_dom_delta(evt)
-            snapshot = self._build_snapshot(symbol, liquidity=liq)
-            self._publish_snapshot(snapshot)
+            self.liquidity.on_dom_delta(evt)
+            self.order_flow.on_dom_delta(evt)
         elif evt.event_type == "trade":
-            delta_state = self.delta.on_trade(evt)
-            tape_state = self.tape.on_trade(evt)
-            footprint = self.footprint.on_trade(evt)
-            snapshot = self._build_snapshot(symbol, delta_state=delta_state, tape_state=tape_state, footprint=footprint)
-            self._publish_snapshot(snapshot)
+            self.delta.on_trade(evt)
+            self.tape.on_trade(evt)
+            self.footprint.on_trade(evt)
+            self.patterns.on_trade(evt)
+            self._bump(symbol, "footprint")
         elif evt.event_type == "tick":
             # ticks update mid price only
-            depth_state = self.depth.state.get(symbol)
-            snapshot = self._build_snapshot(symbol, depth_state=depth_state, tick_evt=evt)
-            self._publish_snapshot(snapshot)
-
-    def _build_snapshot(self, symbol: str, depth_state=None, delta_state=None, tape_state=None, footprint=None, liquidity=None, tick_evt=None) -> MicrostructureSnapshot:
-        ts = datetime.now(timezone.utc)
-        depth_state = depth_state or self.depth.state.get(symbol)
-        delta_state = delta_state or self.delta.state.get(symbol)
-        tape_state = tape_state or self.tape.state.get(symbol)
-        footprint = footprint or self.footprint.footprints.get(symbol, {})
-        liquidity_state = liquidity or self.liquidity.state.get(symbol)
+            mid = evt.payload.get("mid") or evt.payload.get("price") or evt.payload.get("last")
+            if mid is not None:
+                try:
+                    self._tick_mid[symbol] = float(mid)
+                except (TypeError, ValueError):
+                    pass
+        else:
+            return False
+        return True
+
+    def replay_features(self, events: Iterable[MarketEvent]) -> FeatureBatch:
+        """
+        Run recorded events through the sub-engines and collect the feature row after each
+        one into a single (events x features) matrix. Nothing is published.
+        """
+        events = list(events)
+        matrix = self.features.schema.new_matrix(len(events))
+        symbols: list[str] = []
+        timestamps: list[datetime] = []
+        for evt in events:
+            if not self._apply(evt):
+                continue
+            snapshot = self._build_snapshot(evt.symbol, evt.timestamp)
+            self.features.write(snapshot, matrix[len(symbols)])
+            symbols.append(evt.symbol)
+            timestamps.append(evt.timestamp)
+        return FeatureBatch(symbols, timestamps, matrix[: len(symbols)])
+
+    def on_timer(self, evt: MarketEvent) -> None:
+        if evt.payload.get("name") == "microstructure_flush":
+            self.flush()
+
+    def flush(self) -> None:
+        """Publish every symbol with updates held back by coalescing."""
+        for symbol, count in list(self._pending.items()):
+            if count:
+                self._publish(symbol)
+
+    def _bump(self, symbol: str, field_name: str) -> None:
+        versions = self.versions.setdefault(symbol, {})
+        versions[field_name] = versions.get(field_name, 0) + 1
+
+    def _on_update(self, symbol: str) -> None:
+        count = self._pending.get(symbol, 0) + 1
+        self._pending[symbol] = count
+        if count < self.every_n:
+            self.coalesced += 1
+            return
+        if self.min_interval and time.monotonic() - self._last_publish.get(symbol, 0.0) < self.min_interval:
+            self.coalesced += 1
+            return
+        self._publish(symbol)
+
+    def _publish(self, symbol: str) -> None:
+        self._pending[symbol] = 0
+        self._last_publish[symbol] = time.monotonic()
+        snapshot = self._build_snapshot(symbol)
+        row = self.features.extract_row(snapshot)
+        snapshot.features = self.features.schema.to_dict(row)
+        self._publish_snapshot(snapshot, self._serialize(snapshot), row.copy())
+
+    def _build_snapshot(self, symbol: str, ts: Optional[datetime] = None) -> MicrostructureSnapshot:
+        ts = ts or datetime.now(timezone.utc)
+        depth_state = self.depth.state.get(symbol)
+        delta_state = self.delta.state.get(symbol)
+        tape_state = self.tape.state.get(symbol)
+        liquidity_state = self.liquidity.state.get(symbol)
+        versions = self.versions.get(symbol, {})
 
         bid = depth_state.bid if depth_state else None
         ask = depth_state.ask if depth_state else None
-        mid = None
-        if tick_evt:
-            mid = tick_evt.payload.get("mid") or tick_evt.payload.get("price") or tick_evt.payload.get("last")
+        imbalance = depth_state.imbalance if depth_state else None
+        mid = self._tick_mid.get(symbol)
         if mid is None and bid and ask:
             mid = (float(bid) + float(ask)) / 2
 
@@ -85,15 +199,13 @@ class MicrostructureEngine:
             ask=float(ask) if ask is not None else None,
             bid_size=depth_state.bid_size if depth_state else None,
             ask_size=depth_state.ask_size if depth_state else None,
-            imbalance=depth_state.imbalance if depth_state else None,
+            imbalance=imbalance,
             queue_position=depth_state.queue_position if depth_state else None,
-            liquidity_map=depth_state.liquidity_map if depth_state else {},
             delta=delta_state.cumulative if delta_state else None,
             cumulative_delta=delta_state.cumulative if delta_state else None,
             zero_prints=delta_state.zero_prints if delta_state else 0,
             aggressor_side=None,
             absorption_score=tape_state.absorption_score if tape_state else 0.0,
-            footprint=footprint,
             liquidity_signals={
                 "iceberg": getattr(liquidity_state, "iceberg", 0.0),
                 "spoof": getattr(liquidity_state, "spoof", 0.0),
@@ -103,17 +215,53 @@ class MicrostructureEngine:
             if liquidity_state
             else {},
             features={},
-            tags=[],
+            tags=self.patterns.tags(symbol, imbalance),
+            footprint_version=versions.get("footprint", 0),
+            liquidity_map_version=versions.get("liquidity_map", 0),
+            **self.order_flow.features(symbol),
         )
-        snapshot.features = self.features.extract(snapshot)
         return snapshot
 
-    def _publish_snapshot(self, snapshot: MicrostructureSnapshot) -> None:
+    def _serialize(self, snapshot: MicrostructureSnapshot) -> Dict[str, Any]:
+        """
+        Build the published dict: heavy fields only when their version moved, and in
+        delta mode only fields that differ from the previous publication.
+        """
+        symbol = snapshot.symbol
+        prev = self._last_sent.get(symbol)
+        data = dict(snapshot.__dict__)
+        for heavy, version_field in HEAVY_FIELDS.items():
+            if prev is not None and prev.get(version_field) == data[version_field]:
+                data.pop(heavy)
+            elif heavy == "footprint":
+                data[heavy] = self.footprint.snapshot(symbol)
+            else:
+                depth_state = self.depth.state.get(symbol)
+                data[heavy] = depth_state.liquidity_map if depth_state else {}
+        light = {k: v for k, v in data.items() if k not in HEAVY_FIELDS}
+        if self.delta_mode and prev is not None:
+            data = {k: v for k, v in data.items() if k in _KEY_FIELDS or k in HEAVY_FIELDS or prev.get(k) != v}
+        self._last_sent[symbol] = light
+        return data
+
+    def _publish_snapshot(
+        self,
+        snapshot: MicrostructureSnapshot,
+        data: Optional[Dict[str, Any]] = None,
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        payload: Dict[str, Any] = {"snapshot": data if data is not None else dict(snapshot.__dict__)}
+        if vector is not None:
+            # full FEATURE_SCHEMA row, always complete even in delta mode
+            payload["vector"] = vector
+        if self.delta_mode:
+            payload["delta"] = True
         evt = MarketEvent(
             event_type="microstructure",
             timestamp=snapshot.timestamp,
             source="microstructure",
             symbol=snapshot.symbol,
-            payload={"snapshot": snapshot.__dict__},
+            payload=payload,
         )
+        self.published += 1
         self.bus.publish(evt)
@@ -1,26 +1,164 @@
 from __future__ import annotations
 
-from typing import Dict
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Sequence
+
+import numpy as np
 
 from engines.microstructure.snapshot import MicrostructureSnapshot
 
+LIQUIDITY_SIGNALS = ("iceberg", "spoof", "replenishment", "shift")
+PATTERN_TAGS = ("absorption", "spoof", "vacuum", "divergence", "iceberg")
+ORDER_FLOW_FEATURES = ("ofi_1", "ofi_5", "ofi_10", "microprice", "weighted_microprice", "bid_slope", "ask_slope")
+
+
+class FeatureSchema:
+    """
+    Registry of feature names with stable column indices.
+
+    Feature vectors are plain float64 rows laid out by this schema, so consumers resolve a
+    name to its column once (``index``) and read rows by position afterwards. Columns must be
+    registered before rows are allocated; registration is append-only.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.names: List[str] = []
+        self._index: Dict[str, int] = {}
+        for name in names:
+            self.register(name)
+
+    def register(self, name: str) -> int:
+        idx = self._index.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self._index[name] = idx
+            self.names.append(name)
+        return idx
+
+    def index(self, name: str) -> int:
+        try:
+            return self._index[name]
+        except KeyError:
+            raise KeyError(f"Unknown feature: {name}") from None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def width(self) -> int:
+        return len(self.names)
+
+    def new_row(self) -> np.ndarray:
+        return np.zeros(self.width, dtype=np.float64)
+
+    def new_matrix(self, rows: int) -> np.ndarray:
+        return np.zeros((rows, self.width), dtype=np.float64)
+
+    def to_dict(self, row: np.ndarray) -> Dict[str, float]:
+        return dict(zip(self.names, row.tolist()))
+
+    def vector(self, features: Mapping[str, float], tags: Sequence[str] = ()) -> np.ndarray:
+        """Lay out a name->value mapping (plus tags) as a row; unknown names are ignored."""
+        row = self.new_row()
+        for name, value in features.items():
+            idx = self._index.get(name)
+            if idx is not None and value is not None:
+                row[idx] = float(value)
+        for tag in tags:
+            idx = self._index.get(f"tag_{tag}")
+            if idx is not None:
+                row[idx] = 1.0
+        return row
+
+
+FEATURE_SCHEMA = FeatureSchema(
+    (
+        "mid",
+        "imbalance",
+        "queue_position",
+        "delta",
+        "cumulative_delta",
+        "absorption_score",
+        "zero_prints",
+        *(f"liq_{k}" for k in LIQUIDITY_SIGNALS),
+        *ORDER_FLOW_FEATURES,
+        # regime inputs; zero until an engine populates them
+        "volatility",
+        "atr",
+        "volume",
+        *(f"tag_{t}" for t in PATTERN_TAGS),
+    )
+)
+
+
+def as_vector(features, tags: Sequence[str] = (), schema: FeatureSchema = FEATURE_SCHEMA) -> np.ndarray:
+    """Return ``features`` as a schema row, converting legacy name->value dicts once."""
+    if isinstance(features, np.ndarray):
+        return features
+    return schema.vector(features or {}, tags)
+
+
+class FeatureBatch(NamedTuple):
+    """Features for a whole replay: one matrix row per processed event."""
+
+    symbols: List[str]
+    timestamps: List[datetime]
+    matrix: np.ndarray
+
 
 class MicrostructureFeatureExtractor:
     """
-    Converts a MicrostructureSnapshot into a flat feature dictionary for strategy/ML use.
+    Writes MicrostructureSnapshot features into a preallocated row per symbol, laid out by
+    ``FEATURE_SCHEMA``. ``extract`` keeps the flat dictionary for payloads and UI consumers.
     """
 
-    def extract(self, snapshot: MicrostructureSnapshot) -> Dict[str, float]:
-        f: Dict[str, float] = {}
-        f["mid"] = snapshot.mid or 0.0
-        f["imbalance"] = snapshot.imbalance or 0.0
-        f["queue_position"] = snapshot.queue_position or 0.0
-        f["delta"] = snapshot.delta or 0.0
-        f["cumulative_delta"] = snapshot.cumulative_delta or 0.0
-        f["absorption_score"] = snapshot.absorption_score
-        f["zero_prints"] = float(snapshot.zero_prints)
-        for k, v in snapshot.liquidity_signals.items():
-            f[f"liq_{k}"] = v
+    def __init__(self, schema: FeatureSchema = FEATURE_SCHEMA) -> None:
+        self.schema = schema
+        self.rows: Dict[str, np.ndarray] = {}
+        self._base = tuple(
+            schema.index(name)
+            for name in ("mid", "imbalance", "queue_position", "delta", "cumulative_delta", "absorption_score", "zero_prints")
+        )
+        self._liq = {k: schema.index(f"liq_{k}") for k in LIQUIDITY_SIGNALS if f"liq_{k}" in schema}
+        self._flow = [(name, schema.index(name)) for name in ORDER_FLOW_FEATURES if name in schema]
+        self._tags = {t: schema.index(f"tag_{t}") for t in PATTERN_TAGS if f"tag_{t}" in schema}
+        self._tag_cols = list(self._tags.values())
+
+    def write(self, snapshot: MicrostructureSnapshot, out: np.ndarray) -> np.ndarray:
+        i_mid, i_imb, i_queue, i_delta, i_cum, i_abs, i_zero = self._base
+        out[i_mid] = snapshot.mid or 0.0
+        out[i_imb] = snapshot.imbalance or 0.0
+        out[i_queue] = snapshot.queue_position or 0.0
+        out[i_delta] = snapshot.delta or 0.0
+        out[i_cum] = snapshot.cumulative_delta or 0.0
+        out[i_abs] = snapshot.absorption_score
+        out[i_zero] = snapshot.zero_prints
+        for k, idx in self._liq.items():
+            out[idx] = snapshot.liquidity_signals.get(k, 0.0)
+        for name, idx in self._flow:
+            out[idx] = getattr(snapshot, name) or 0.0
+        out[self._tag_cols] = 0.0
         for tag in snapshot.tags:
-            f[f"tag_{tag}"] = 1.0
-        return f
+            idx = self._tags.get(tag)
+            if idx is not None:
+                out[idx] = 1.0
+        return out
+
+    def extract_row(self, snapshot: MicrostructureSnapshot) -> np.ndarray:
+        """Fill and return the symbol's reusable row; copy it before handing it off."""
+        row = self.rows.get(snapshot.symbol)
+        if row is None:
+            row = self.rows[snapshot.symbol] = self.schema.new_row()
+        return self.write(snapshot, row)
+
+    def extract(self, snapshot: MicrostructureSnapshot) -> Dict[str, float]:
+        return self.schema.to_dict(self.extract_row(snapshot))
+
+    def extract_batch(self, snapshots: Sequence[MicrostructureSnapshot]) -> np.ndarray:
+        matrix = self.schema.new_matrix(len(snapshots))
+        for i, snapshot in enumerate(snapshots):
+            self.write(snapshot, matrix[i])
+        return matrix
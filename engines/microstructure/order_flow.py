@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from core.rolling import RollingStats
+from engines.microstructure.book import Level, book_sides
+from models.market_event import MarketEvent
+
+ORDER_FLOW_DEPTHS = (1, 5, 10)
+
+
+class OrderFlowState:
+    """
+    Top ``depth`` levels per side plus running per-tier aggregates (size and notional for
+    each depth in ``tiers``). A level change touches only the tiers that include it, so the
+    derived features never rescan the ladder.
+    """
+
+    __slots__ = (
+        "tiers",
+        "depth",
+        "bid_px",
+        "bid_sz",
+        "ask_px",
+        "ask_sz",
+        "bid_qty",
+        "ask_qty",
+        "bid_notional",
+        "ask_notional",
+        "last_ofi",
+        "ofi",
+        "updates",
+    )
+
+    def __init__(self, tiers: Sequence[int], window: int) -> None:
+        self.tiers = tuple(tiers)
+        self.depth = max(self.tiers)
+        self.bid_px: List[Optional[float]] = [None] * self.depth
+        self.bid_sz: List[float] = [0.0] * self.depth
+        self.ask_px: List[Optional[float]] = [None] * self.depth
+        self.ask_sz: List[float] = [0.0] * self.depth
+        n = len(self.tiers)
+        self.bid_qty = [0.0] * n
+        self.ask_qty = [0.0] * n
+        self.bid_notional = [0.0] * n
+        self.ask_notional = [0.0] * n
+        self.last_ofi = [0.0] * n
+        self.ofi = [RollingStats(window) for _ in range(n)]
+        self.updates = 0
+
+    def set_level(self, is_bid: bool, level: int, price: Optional[float], size: float) -> float:
+        """
+        Replace one level and return its order-flow contribution (bid flow positive, ask
+        flow negative), following the multi-level OFI definition of Xu, Varma and Cont.
+        """
+        px, sz = (self.bid_px, self.bid_sz) if is_bid else (self.ask_px, self.ask_sz)
+        old_px, old_sz = px[level], sz[level]
+        if price is None:
+            size = 0.0
+        if old_px == price and old_sz == size:
+            return 0.0
+        if old_px is None:
+            flow = size
+        elif price is None:
+            flow = -old_sz
+        elif price == old_px:
+            flow = size - old_sz
+        elif (price > old_px) == is_bid:
+            flow = size  # level improved
+        else:
+            flow = -old_sz
+        px[level], sz[level] = price, size
+        d_qty = size - old_sz
+        d_notional = (price or 0.0) * size - (old_px or 0.0) * old_sz
+        qty, notional = (self.bid_qty, self.bid_notional) if is_bid else (self.ask_qty, self.ask_notional)
+        for t, tier in enumerate(self.tiers):
+            if level < tier:
+                qty[t] += d_qty
+                notional[t] += d_notional
+        return flow if is_bid else -flow
+
+    def commit(self, flows: Sequence[float]) -> None:
+        """Close one book update: ``flows[t]`` is the summed contribution within tier t."""
+        self.updates += 1
+        for t, flow in enumerate(flows):
+            self.last_ofi[t] = flow
+            self.ofi[t].push(flow)
+
+    def ofi_sum(self, t: int) -> float:
+        return self.ofi[t].total
+
+    def imbalance(self, t: int) -> float:
+        b, a = self.bid_qty[t], self.ask_qty[t]
+        return (b - a) / (b + a) if b + a else 0.0
+
+    @property
+    def microprice(self) -> Optional[float]:
+        bid, ask = self.bid_px[0], self.ask_px[0]
+        if bid is None or ask is None:
+            return None
+        b, a = self.bid_sz[0], self.ask_sz[0]
+        return (bid * a + ask * b) / (a + b) if a + b else (bid + ask) / 2
+
+    def weighted_microprice(self, t: int = -1) -> Optional[float]:
+        """Microprice over the tier: size-weighted side prices crossed by opposite size."""
+        b, a = self.bid_qty[t], self.ask_qty[t]
+        if b <= 0 or a <= 0:
+            return None
+        return (self.bid_notional[t] / b * a + self.ask_notional[t] / a * b) / (a + b)
+
+    def slope(self, is_bid: bool, tick_size: float, t: int = -1) -> float:
+        """Book pressure: resting size added per tick away from the touch within the tier."""
+        px = self.bid_px if is_bid else self.ask_px
+        qty = self.bid_qty if is_bid else self.ask_qty
+        best = px[0]
+        if best is None:
+            return 0.0
+        deepest = None
+        for i in range(self.tiers[t] - 1, 0, -1):
+            if px[i] is not None:
+                deepest = px[i]
+                break
+        if deepest is None:
+            return 0.0
+        ticks = abs(best - deepest) / tick_size
+        return (qty[t] - (self.bid_sz[0] if is_bid else self.ask_sz[0])) / ticks if ticks else 0.0
+
+
+class OrderFlowEngine:
+    """
+    Multi-level order-flow imbalance, microprice and book pressure from book updates.
+
+    ``dom_snapshot`` ladders are diffed level by level against the stored top of book;
+    positional ``dom_delta`` updates (side/level/operation) touch a single level. OFI per
+    tier is summed over the last ``window`` book updates.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[int] = ORDER_FLOW_DEPTHS,
+        window: int = 50,
+        ticks: TickSizeRegistry = TICK_SIZES,
+    ) -> None:
+        self.tiers = tuple(sorted(tiers))
+        self.window = window
+        self.ticks = ticks
+        self.state: Dict[str, OrderFlowState] = {}
+
+    def _state(self, symbol: str) -> OrderFlowState:
+        st = self.state.get(symbol)
+        if st is None:
+            st = self.state[symbol] = OrderFlowState(self.tiers, self.window)
+        return st
+
+    def on_dom(self, evt: MarketEvent) -> Optional[OrderFlowState]:
+        bids, asks = book_sides(evt.payload or {})
+        if not bids and not asks:
+            return None
+        st = self._state(evt.symbol)
+        flows = [0.0] * len(self.tiers)
+        for is_bid, levels in ((True, bids), (False, asks)):
+            self._apply_side(st, is_bid, levels, flows)
+        st.commit(flows)
+        return st
+
+    def on_dom_delta(self, evt: MarketEvent) -> Optional[OrderFlowState]:
+        payload = evt.payload or {}
+        side = payload.get("side")
+        if side not in ("bid", "ask") or payload.get("level") is None:
+            return None
+        st = self._state(evt.symbol)
+        level = int(payload["level"])
+        flows = [0.0] * len(self.tiers)
+        if level < st.depth:
+            if payload.get("operation") == "delete":
+                price, size = None, 0.0
+            else:
+                price, size = float(payload.get("price") or 0.0), float(payload.get("size") or 0.0)
+            flow = st.set_level(side == "bid", level, price, size)
+            self._spread_flow(level, flow, flows)
+        st.commit(flows)
+        return st
+
+    def _apply_side(self, st: OrderFlowState, is_bid: bool, levels: List[Level], flows: List[float]) -> None:
+        px = st.bid_px if is_bid else st.ask_px
+        sz = st.bid_sz if is_bid else st.ask_sz
+        for m in range(st.depth):
+            price, size = levels[m] if m < len(levels) else (None, 0.0)
+            if px[m] == price and sz[m] == size:
+                continue
+            self._spread_flow(m, st.set_level(is_bid, m, price, size), flows)
+
+    def _spread_flow(self, level: int, flow: float, flows: List[float]) -> None:
+        if not flow:
+            return
+        for t, tier in enumerate(self.tiers):
+            if level < tier:
+                flows[t] += flow
+
+    def features(self, symbol: str) -> Dict[str, Optional[float]]:
+        """Named order-flow features for the symbol (see MicrostructureSnapshot fields)."""
+        st = self.state.get(symbol)
+        if st is None:
+            return {}
+        tick = self.ticks.tick_size(symbol)
+        out: Dict[str, Optional[float]] = {f"ofi_{tier}": st.ofi_sum(t) for t, tier in enumerate(self.tiers)}
+        out["microprice"] = st.microprice
+        out["weighted_microprice"] = st.weighted_microprice()
+        out["bid_slope"] = st.slope(True, tick)
+        out["ask_slope"] = st.slope(False, tick)
+        return out
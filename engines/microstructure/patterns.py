@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from core.rolling import TimeWindowSum
+from engines.detectors.records import BookRecord, TradeRecord, parse_book, parse_trade
+from models.market_event import MarketEvent
+from strategy.pattern_detector import detect_patterns
+
+
+class PatternState:
+    """Rolling pattern inputs for one symbol over the last ``window`` seconds."""
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+        self.delta = TimeWindowSum(window)
+        self.prev_volume = TimeWindowSum(window)
+        self.volume = TimeWindowSum(window, spill=self.prev_volume)
+        self.added = TimeWindowSum(window)
+        self.removed = TimeWindowSum(window)
+        self.prices: Deque[Tuple[float, float]] = deque()
+        self.bids: Dict[int, float] = {}
+        self.asks: Dict[int, float] = {}
+        self.last_ts = 0.0
+
+    def expire(self, now: float) -> None:
+        self.last_ts = max(self.last_ts, now)
+        now = self.last_ts
+        for window in (self.delta, self.volume, self.added, self.removed):
+            window.expire(now)
+        cutoff = now - self.window
+        prices = self.prices
+        # keep the newest print even when stale so price_change has a reference
+        while len(prices) > 1 and prices[0][0] <= cutoff:
+            prices.popleft()
+
+
+class PatternEngine:
+    """
+    Maintains the inputs of ``strategy.pattern_detector`` from book and trade updates and
+    tags symbols with the patterns that fire.
+
+    Per symbol, over the last ``window_seconds`` of event time:
+    - ``delta``: signed aggressor volume (prints without a side count as volume only);
+    - ``price_change``: last minus first trade price, ``shift`` the same in ticks;
+    - ``added_liq``/``removed_liq``: size added to / pulled from visible book levels;
+    - ``volume_drop``: traded volume of the previous window minus the current one (>= 0).
+
+    Updates are amortised O(1) apart from the per-level book diff. ``imbalance`` comes from
+    the caller (DepthEngine) when tagging.
+    """
+
+    def __init__(self, window_seconds: float = 5.0, ticks: TickSizeRegistry = TICK_SIZES) -> None:
+        self.window = window_seconds
+        self.ticks = ticks
+        self.state: Dict[str, PatternState] = {}
+
+    def _state(self, symbol: str) -> PatternState:
+        st = self.state.get(symbol)
+        if st is None:
+            st = self.state[symbol] = PatternState(self.window)
+        return st
+
+    def on_trade(self, evt: MarketEvent) -> None:
+        rec = parse_trade(evt, self.ticks)
+        if rec is not None:
+            self.on_trade_record(rec)
+
+    def on_dom(self, evt: MarketEvent) -> None:
+        rec = parse_book(evt, self.ticks)
+        if rec is not None:
+            self.on_book_record(rec)
+
+    def on_trade_record(self, rec: TradeRecord) -> None:
+        st = self._state(rec.symbol)
+        ts = rec.ts
+        if rec.side == "buy":
+            st.delta.push(ts, rec.size)
+        elif rec.side == "sell":
+            st.delta.push(ts, -rec.size)
+        st.volume.push(ts, rec.size)
+        st.prices.append((ts, rec.price))
+        st.expire(ts)
+
+    def on_book_record(self, rec: BookRecord) -> None:
+        st = self._state(rec.symbol)
+        first = not st.bids and not st.asks
+        added = removed = 0.0
+        for prev, book in ((st.bids, rec.bid_ticks), (st.asks, rec.ask_ticks)):
+            if book:
+                lo, hi = min(book), max(book)
+                for tick, size in book.items():
+                    change = size - prev.get(tick, 0.0)
+                    if change > 0:
+                        added += change
+                    else:
+                        removed -= change
+                # levels that scrolled out of view were not pulled
+                removed += sum(size for tick, size in prev.items() if tick not in book and lo <= tick <= hi)
+        st.bids, st.asks = rec.bid_ticks, rec.ask_ticks
+        if first:  # the initial book is a baseline, not liquidity being added
+            added = 0.0
+        if added:
+            st.added.push(rec.ts, added)
+        if removed:
+            st.removed.push(rec.ts, removed)
+        st.expire(rec.ts)
+
+    def features(self, symbol: str, imbalance: Optional[float] = None) -> Dict[str, float]:
+        st = self.state.get(symbol)
+        if st is None:
+            return {}
+        st.expire(st.last_ts)
+        price_change = st.prices[-1][1] - st.prices[0][1] if st.prices else 0.0
+        return {
+            "delta": st.delta.total,
+            "price_change": price_change,
+            "shift": price_change / self.ticks.tick_size(symbol),
+            "added_liq": st.added.total,
+            "removed_liq": st.removed.total,
+            "volume_drop": max(0.0, st.prev_volume.total - st.volume.total),
+            "imbalance": imbalance or 0.0,
+        }
+
+    def tags(self, symbol: str, imbalance: Optional[float] = None) -> List[str]:
+        features = self.features(symbol, imbalance)
+        return detect_patterns(features) if features else []
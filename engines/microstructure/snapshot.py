@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+# Fields too large to copy on every publication; consumers track them by version.
+HEAVY_FIELDS = {"footprint": "footprint_version", "liquidity_map": "liquidity_map_version"}
 
 
 @dataclass(frozen=False)
@@ -21,7 +24,7 @@ class MicrostructureSnapshot:
     ask_size: Optional[float] = None
     imbalance: Optional[float] = None
     queue_position: Optional[float] = None
-    liquidity_map: Dict[str, float] = field(default_factory=dict)
+    liquidity_map: Dict[int, float] = field(default_factory=dict)  # tick index -> resting size
     delta: Optional[float] = None
     cumulative_delta: Optional[float] = None
     zero_prints: int = 0
@@ -31,3 +34,22 @@ class MicrostructureSnapshot:
     liquidity_signals: Dict[str, float] = field(default_factory=dict)
     features: Dict[str, float] = field(default_factory=dict)
     tags: List[str] = field(default_factory=list)
+    footprint_version: int = 0
+    liquidity_map_version: int = 0
+    # order flow (OrderFlowEngine): OFI summed over recent book updates per depth tier
+    ofi_1: float = 0.0
+    ofi_5: float = 0.0
+    ofi_10: float = 0.0
+    microprice: Optional[float] = None
+    weighted_microprice: Optional[float] = None
+    bid_slope: float = 0.0
+    ask_slope: float = 0.0
+
+
+def merge_snapshot(state: Dict[str, Any], snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold a published snapshot (full or delta) into a consumer-side view of the symbol.
+    Heavy fields omitted because their version did not change keep their previous value.
+    """
+    state.update(snapshot)
+    return state
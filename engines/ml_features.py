@@ -1,17 +1,269 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
 
+import numpy as np
 
-def rolling_mean(values: List[float], window: int) -> float:
-    if not values:
-        return 0.0
-    return sum(values[-window:]) / min(len(values), window)
+from core.event_bus import EventBus
+from core.rolling import RollingStats
+from engines.microstructure.delta import MicroDeltaEngine
+from engines.microstructure.features import FeatureSchema
+from engines.microstructure.order_flow import ORDER_FLOW_DEPTHS, OrderFlowEngine
+from models.market_event import MarketEvent
 
+IMBALANCE_DEPTHS = ORDER_FLOW_DEPTHS
 
-def build_feature_vector(ticks: List[float]) -> Dict[str, float]:
-    return {
-        "mean_5": rolling_mean(ticks, 5),
-        "mean_10": rolling_mean(ticks, 10),
-        "last": ticks[-1] if ticks else 0.0,
-    }
+ML_FEATURE_SCHEMA = FeatureSchema(
+    (
+        "mid",
+        "spread",
+        "microprice",
+        *(f"imbalance_{n}" for n in IMBALANCE_DEPTHS),
+        "ofi",
+        "ofi_sum",
+        "trade_delta",
+        "cumulative_delta",
+        "delta_sum",
+        "mid_mean",
+        "return",
+        "volatility",
+        "volatility_long",
+        "regime",  # -1 compression, 0 normal, 1 expansion (short vs long volatility)
+    )
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _SymbolState:
+    __slots__ = ("row", "mid", "delta", "mids", "returns", "returns_long")
+
+    def __init__(self, width: int, window: int, long_window: int) -> None:
+        self.row = np.zeros(width, dtype=np.float64)
+        self.mid: Optional[float] = None
+        self.delta = RollingStats(window)
+        self.mids = RollingStats(window)
+        self.returns = RollingStats(window)
+        self.returns_long = RollingStats(long_window)
+
+
+class MLFeatureBuilder:
+    """
+    Incremental per-symbol ML features laid out by ``ML_FEATURE_SCHEMA``.
+
+    This is the single code path for both live features (``MLFeatureEngine``) and offline
+    datasets (``build_feature_store``), so training and serving see identical values.
+    ``on_event`` returns the symbol's reusable row after each book/trade/tick update.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        long_window: int = 200,
+        expansion_ratio: float = 1.5,
+        schema: FeatureSchema = ML_FEATURE_SCHEMA,
+    ) -> None:
+        self.schema = schema
+        self.window = window
+        self.long_window = long_window
+        self.expansion_ratio = expansion_ratio
+        self.delta_engine = MicroDeltaEngine()
+        self.order_flow = OrderFlowEngine(IMBALANCE_DEPTHS, window=window)
+        self.state: Dict[str, _SymbolState] = {}
+        idx = schema.index
+        self._mid, self._spread, self._micro = idx("mid"), idx("spread"), idx("microprice")
+        self._imb = [idx(f"imbalance_{n}") for n in IMBALANCE_DEPTHS]
+        self._ofi, self._ofi_sum = idx("ofi"), idx("ofi_sum")
+        self._trade_delta, self._cum_delta, self._delta_sum = idx("trade_delta"), idx("cumulative_delta"), idx("delta_sum")
+        self._mid_mean, self._ret = idx("mid_mean"), idx("return")
+        self._vol, self._vol_long, self._regime = idx("volatility"), idx("volatility_long"), idx("regime")
+        # per-event values; zeroed on every update so rows never carry a stale event
+        self._event_cols = [self._ofi, self._trade_delta, self._ret]
+
+    def on_event(self, evt: MarketEvent) -> Optional[np.ndarray]:
+        et = evt.event_type
+        if et not in ("dom_snapshot", "trade", "tick"):
+            return None
+        st = self.state.get(evt.symbol)
+        if st is None:
+            st = self.state[evt.symbol] = _SymbolState(self.schema.width, self.window, self.long_window)
+        payload = evt.payload or {}
+        st.row[self._event_cols] = 0.0
+        if et == "trade":
+            self._on_trade(evt, st)
+        elif et == "dom_snapshot" or (payload.get("bid") is not None and payload.get("ask") is not None):
+            self._on_book(evt, st)
+        else:
+            mid = payload.get("mid") or payload.get("price") or payload.get("last")
+            if mid is not None:
+                self._on_mid(float(mid), st)
+        return st.row
+
+    def _on_book(self, evt: MarketEvent, st: _SymbolState) -> None:
+        flow = self.order_flow.on_dom(evt)
+        if flow is None:
+            return
+        bid, ask = flow.bid_px[0], flow.ask_px[0]
+        if bid is None or ask is None:
+            return
+        row = st.row
+        # level-1 order flow imbalance of this update and its rolling sum
+        row[self._ofi] = flow.last_ofi[0]
+        row[self._ofi_sum] = flow.ofi_sum(0)
+        row[self._spread] = ask - bid
+        row[self._micro] = flow.microprice
+        for t, col in enumerate(self._imb):
+            row[col] = flow.imbalance(t)
+        self._on_mid((bid + ask) / 2, st)
+
+    def _on_mid(self, mid: float, st: _SymbolState) -> None:
+        row = st.row
+        ret = math.log(mid / st.mid) if st.mid and mid > 0 else 0.0
+        st.mid = mid
+        st.mids.push(mid)
+        st.returns.push(ret)
+        st.returns_long.push(ret)
+        short, long = st.returns.std, st.returns_long.std
+        row[self._mid] = mid
+        row[self._mid_mean] = st.mids.mean
+        row[self._ret] = ret
+        row[self._vol] = short
+        row[self._vol_long] = long
+        if not long or st.returns_long.count < self.window:
+            row[self._regime] = 0.0
+        elif short > long * self.expansion_ratio:
+            row[self._regime] = 1.0
+        elif short * self.expansion_ratio < long:
+            row[self._regime] = -1.0
+        else:
+            row[self._regime] = 0.0
+
+    def _on_trade(self, evt: MarketEvent, st: _SymbolState) -> None:
+        prev = self.delta_engine.state.get(evt.symbol)
+        before = prev.cumulative if prev else 0.0
+        cumulative = self.delta_engine.on_trade(evt).cumulative
+        trade_delta = cumulative - before
+        st.delta.push(trade_delta)
+        row = st.row
+        row[self._trade_delta] = trade_delta
+        row[self._cum_delta] = cumulative
+        row[self._delta_sum] = st.delta.total
+
+
+class MLFeatureEngine:
+    """
+    Live wrapper around MLFeatureBuilder. Emits ml_features events with the feature row.
+    """
+
+    def __init__(self, bus: EventBus, builder: Optional[MLFeatureBuilder] = None) -> None:
+        self.bus = bus
+        self.builder = builder or MLFeatureBuilder()
+        self._subs = ("dom_snapshot", "trade", "tick")
+        for et in self._subs:
+            self.bus.subscribe(et, self.on_event)
+
+    def stop(self) -> None:
+        for et in getattr(self, "_subs", ()):
+            self.bus.unsubscribe(et, self.on_event)
+
+    def on_event(self, evt: MarketEvent) -> None:
+        row = self.builder.on_event(evt)
+        if row is None:
+            return
+        self.bus.publish(
+            MarketEvent(
+                event_type="ml_features",
+                timestamp=evt.timestamp,
+                source="ml_features",
+                symbol=evt.symbol,
+                payload={"vector": row.copy()},
+            )
+        )
+
+
+class _Frame:
+    __slots__ = ("timestamps", "values", "size")
+
+    def __init__(self, width: int, capacity: int = 1024) -> None:
+        self.timestamps = np.zeros(capacity, dtype="datetime64[ns]")
+        self.values = np.zeros((capacity, width), dtype=np.float64)
+        self.size = 0
+
+    def append(self, ts: np.datetime64, row: np.ndarray) -> None:
+        if self.size == len(self.timestamps):
+            self.timestamps = np.concatenate([self.timestamps, np.zeros_like(self.timestamps)])
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+        self.timestamps[self.size] = ts
+        self.values[self.size] = row
+        self.size += 1
+
+
+class FeatureStore:
+    """
+    Per-symbol feature matrices with timestamps, persisted as a columnar ``.npz`` file:
+    one array per (symbol, column) plus ``{symbol}::timestamp``.
+    """
+
+    def __init__(self, schema: FeatureSchema = ML_FEATURE_SCHEMA) -> None:
+        self.schema = schema
+        self._frames: Dict[str, _Frame] = {}
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._frames)
+
+    def append(self, symbol: str, ts: datetime, row: np.ndarray) -> None:
+        frame = self._frames.get(symbol)
+        if frame is None:
+            frame = self._frames[symbol] = _Frame(self.schema.width)
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        frame.append(np.datetime64((ts - _EPOCH) // _MICROSECOND, "us"), row)
+
+    def timestamps(self, symbol: str) -> np.ndarray:
+        frame = self._frames[symbol]
+        return frame.timestamps[: frame.size]
+
+    def matrix(self, symbol: str) -> np.ndarray:
+        frame = self._frames[symbol]
+        return frame.values[: frame.size]
+
+    def column(self, symbol: str, name: str) -> np.ndarray:
+        return self.matrix(symbol)[:, self.schema.index(name)]
+
+    def save(self, path: str) -> None:
+        arrays: Dict[str, np.ndarray] = {"__columns__": np.array(self.schema.names)}
+        for symbol in self._frames:
+            arrays[f"{symbol}::timestamp"] = self.timestamps(symbol)
+            matrix = self.matrix(symbol)
+            for i, name in enumerate(self.schema.names):
+                arrays[f"{symbol}::{name}"] = matrix[:, i]
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureStore":
+        with np.load(path) as data:
+            store = cls(FeatureSchema(data["__columns__"].tolist()))
+            symbols = [key[: -len("::timestamp")] for key in data.files if key.endswith("::timestamp")]
+            for symbol in symbols:
+                ts = data[f"{symbol}::timestamp"]
+                frame = store._frames[symbol] = _Frame(store.schema.width, capacity=max(1, len(ts)))
+                frame.timestamps[: len(ts)] = ts
+                for i, name in enumerate(store.schema.names):
+                    frame.values[: len(ts), i] = data[f"{symbol}::{name}"]
+                frame.size = len(ts)
+        return store
+
+
+def build_feature_store(events: Iterable[MarketEvent], builder: Optional[MLFeatureBuilder] = None) -> FeatureStore:
+    """Run recorded events through MLFeatureBuilder and collect one row per update."""
+    builder = builder or MLFeatureBuilder()
+    store = FeatureStore(builder.schema)
+    for evt in events:
+        row = builder.on_event(evt)
+        if row is not None:
+            store.append(evt.symbol, evt.timestamp, row)
+    return store
@@ -1,50 +1,147 @@
 from __future__ import annotations
 
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Deque, Dict, Optional
 
 from core.event_bus import EventBus
+from core.timer import BusTimer
 from models.market_event import MarketEvent
 
 
+class RegimeState:
+    __slots__ = ("regime", "candidate", "streak", "cumulative_delta", "delta_samples", "vol")
+
+    def __init__(self, delta_window: int) -> None:
+        self.regime: Optional[str] = None
+        self.candidate: Optional[str] = None
+        self.streak = 0
+        self.cumulative_delta = 0.0
+        self.delta_samples: Deque[float] = deque(maxlen=delta_window + 1)
+        self.vol: Dict = {}
+
+
 class RegimeEngine:
     """
-    Classifies market into simple regimes based on volatility and delta.
-    Emits regime_update events.
+    Classifies market into trending/ranging/squeezing regimes from rolling volatility,
+    order-flow delta and range.
+
+    Inputs (volatility_update, microstructure) only update per-symbol state; classification
+    runs on a ``regime_eval`` timer every ``interval_ms``. Labels use hysteresis: a regime
+    is entered past its threshold but left only past a looser one (``exit_ratio``), and a
+    new label must win ``confirm`` consecutive evaluations. regime_update events are
+    emitted only on transitions.
     """
 
-    def __init__(self, bus: EventBus) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        interval_ms: float = 250.0,
+        trend_delta: float = 200.0,
+        squeeze_range_ticks: float = 4.0,
+        delta_window: int = 20,
+        exit_ratio: float = 0.6,
+        confirm: int = 2,
+    ) -> None:
         self.bus = bus
+        self.trend_delta = trend_delta
+        self.squeeze_range_ticks = squeeze_range_ticks
+        self.delta_window = delta_window
+        self.exit_ratio = exit_ratio
+        self.confirm = max(1, confirm)
+        self.state: Dict[str, RegimeState] = {}
+        self.evaluations = 0
+        self.published = 0
         self.bus.subscribe("volatility_update", self.on_vol)
         self.bus.subscribe("microstructure", self.on_micro)
-        self.current_vol: Dict[str, float] = {}
-        self._subs = ("volatility_update", "microstructure")
+        self.bus.subscribe("timer", self.on_timer)
+        self._subs = ("volatility_update", "microstructure", "timer")
+        self._timer: Optional[BusTimer] = None
+        if interval_ms > 0:
+            self._timer = BusTimer(bus, "regime_eval", interval_ms / 1000.0)
+            self._timer.start()
 
     def stop(self) -> None:
+        if self._timer:
+            self._timer.stop()
+            self._timer = None
+        handlers = {"volatility_update": self.on_vol, "microstructure": self.on_micro, "timer": self.on_timer}
         for et in getattr(self, "_subs", ()):
-            if et == "volatility_update":
-                self.bus.unsubscribe(et, self.on_vol)
-            else:
-                self.bus.unsubscribe(et, self.on_micro)
+            self.bus.unsubscribe(et, handlers[et])
+
+    def _state(self, symbol: str) -> RegimeState:
+        st = self.state.get(symbol)
+        if st is None:
+            st = self.state[symbol] = RegimeState(self.delta_window)
+        return st
 
     def on_vol(self, evt: MarketEvent) -> None:
-        self.current_vol[evt.symbol] = evt.payload.get("atr", 0.0)
+        st = self._state(evt.symbol)
+        st.vol = evt.payload
 
     def on_micro(self, evt: MarketEvent) -> None:
-        sym = evt.symbol
         snap = evt.payload.get("snapshot", evt.payload)
-        delta = snap.get("cumulative_delta") or snap.get("delta") or 0.0
-        vol = self.current_vol.get(sym, 0.0)
-        regime = "ranging"
-        if vol > 1.0 and abs(delta) > 200:
-            regime = "trending"
-        elif vol < 0.2:
-            regime = "squeezing"
+        # delta-mode snapshots omit unchanged fields; keep the last known value
+        cumulative = snap.get("cumulative_delta")
+        if cumulative is None:
+            return
+        st = self._state(evt.symbol)
+        st.cumulative_delta = float(cumulative)
+
+    def on_timer(self, evt: MarketEvent) -> None:
+        if evt.payload.get("name") == "regime_eval":
+            self.evaluate()
+
+    def evaluate(self) -> None:
+        for symbol, st in self.state.items():
+            st.delta_samples.append(st.cumulative_delta)
+            self.evaluations += 1
+            candidate = self._classify(st)
+            if candidate == st.regime:
+                st.candidate, st.streak = None, 0
+                continue
+            if candidate == st.candidate:
+                st.streak += 1
+            else:
+                st.candidate, st.streak = candidate, 1
+            if st.streak >= self.confirm or st.regime is None:
+                self._transition(symbol, st, candidate)
+
+    def flow(self, symbol: str) -> float:
+        """Delta traded over the last ``delta_window`` evaluations."""
+        samples = self.state[symbol].delta_samples
+        return samples[-1] - samples[0] if samples else 0.0
+
+    def _classify(self, st: RegimeState) -> str:
+        flow = abs(st.delta_samples[-1] - st.delta_samples[0])
+        vol_regime = st.vol.get("regime")
+        range_ticks = st.vol.get("range_ticks")
+        loose = 1.0 / self.exit_ratio
+        trend_cut = self.trend_delta * (self.exit_ratio if st.regime == "trending" else 1.0)
+        squeeze_cut = self.squeeze_range_ticks * (loose if st.regime == "squeezing" else 1.0)
+        if vol_regime != "compression" and flow >= trend_cut:
+            return "trending"
+        if vol_regime == "compression" or (range_ticks is not None and range_ticks <= squeeze_cut):
+            return "squeezing"
+        return "ranging"
+
+    def _transition(self, symbol: str, st: RegimeState, regime: str) -> None:
+        previous = st.regime
+        st.regime, st.candidate, st.streak = regime, None, 0
+        self.published += 1
         evt_out = MarketEvent(
             event_type="regime_update",
             timestamp=datetime.now(timezone.utc),
             source="regime_engine",
-            symbol=sym,
-            payload={"regime": regime, "atr": vol, "delta": delta},
+            symbol=symbol,
+            payload={
+                "regime": regime,
+                "previous": previous,
+                "delta": self.flow(symbol),
+                "atr": st.vol.get("atr", 0.0),
+                "ewma_bps": st.vol.get("ewma_bps"),
+                "range_ticks": st.vol.get("range_ticks"),
+                "vol_regime": st.vol.get("regime"),
+            },
         )
         self.bus.publish(evt_out)
@@ -3,12 +3,13 @@ from __future__ import annotations
 import logging
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional
 
 from core.event_bus import EventBus
 from models.market_event import MarketEvent
 from models.signal import Signal
 from models.state import SymbolState
+from strategy.signal_gate import SignalGate
 
 log = logging.getLogger(__name__)
 
@@ -16,11 +17,13 @@ log = logging.getLogger(__name__)
 class Strategy:
     """
     Base strategy: subscribes to market data events and emits signals.
+    ``emit_signal`` drops signals the ``gate`` suppresses (flat, repeated direction, cooldown).
     """
 
-    def __init__(self, bus: EventBus, symbols: Iterable[str]) -> None:
+    def __init__(self, bus: EventBus, symbols: Iterable[str], gate: Optional[SignalGate] = None) -> None:
         self.bus = bus
         self.symbols = set(symbols)
+        self.gate = gate or SignalGate()
         self.state: Dict[str, SymbolState] = {s: SymbolState() for s in symbols}
 
     def on_start(self) -> None:
@@ -34,6 +37,8 @@ class Strategy:
         raise NotImplementedError
 
     def emit_signal(self, signal: Signal) -> None:
+        if not self.gate.allow(signal.symbol, signal.direction, signal.timestamp):
+            return
         evt = MarketEvent(
             event_type="signal",
             timestamp=signal.timestamp,
@@ -51,8 +56,10 @@ class MicroPriceMomentumStrategy(Strategy):
     - Emits buy signal on upward move, sell on downward move
     """
 
-    def __init__(self, bus: EventBus, symbols: Iterable[str], threshold: float = 0.0) -> None:
-        super().__init__(bus, symbols)
+    def __init__(
+        self, bus: EventBus, symbols: Iterable[str], threshold: float = 0.0, gate: Optional[SignalGate] = None
+    ) -> None:
+        super().__init__(bus, symbols, gate)
         self.threshold = threshold
         self.last_mid: Dict[str, float] = {s: 0.0 for s in symbols}
 
@@ -1,23 +1,144 @@
 from __future__ import annotations
 
-from collections import deque
-from datetime import datetime, timezone
-from typing import Deque, Dict
+import math
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
 
 from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from core.rolling import MonotonicWindow, RollingStats
 from models.market_event import MarketEvent
 
+_BPS = 10_000.0
+_PARKINSON = 1.0 / (4.0 * math.log(2.0))
+_GK_CLOSE = 2.0 * math.log(2.0) - 1.0
+
+
+class PercentileThresholds:
+    """
+    Per-instrument regime cut-offs learned from that instrument's own volatility history.
+
+    Samples go into a ring buffer; the low/high percentiles are refitted every
+    ``refit_every`` samples so classification itself stays O(1).
+    """
+
+    __slots__ = ("low_pct", "high_pct", "min_samples", "refit_every", "_buf", "_size", "_pos", "_since_fit", "low", "high")
+
+    def __init__(
+        self,
+        history: int = 2000,
+        low_pct: float = 20.0,
+        high_pct: float = 80.0,
+        min_samples: int = 30,
+        refit_every: int = 50,
+    ) -> None:
+        self.low_pct = low_pct
+        self.high_pct = high_pct
+        self.min_samples = min_samples
+        self.refit_every = refit_every
+        self._buf = np.zeros(history, dtype=np.float64)
+        self._size = 0
+        self._pos = 0
+        self._since_fit = 0
+        self.low: Optional[float] = None
+        self.high: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self._buf[self._pos] = value
+        self._pos = (self._pos + 1) % len(self._buf)
+        self._size = min(self._size + 1, len(self._buf))
+        self._since_fit += 1
+        if self._since_fit >= self.refit_every or self.low is None:
+            self.refit()
+
+    def learn(self, values: Iterable[float]) -> None:
+        for value in values:
+            self._buf[self._pos] = value
+            self._pos = (self._pos + 1) % len(self._buf)
+            self._size = min(self._size + 1, len(self._buf))
+        self.refit()
+
+    def refit(self) -> None:
+        self._since_fit = 0
+        if self._size < self.min_samples:
+            return
+        low, high = np.percentile(self._buf[: self._size], (self.low_pct, self.high_pct))
+        self.low, self.high = float(low), float(high)
+
+    def classify(self, value: float) -> str:
+        if self.low is None or self.high is None:
+            return "normal"
+        if value < self.low:
+            return "compression"
+        if value > self.high:
+            return "expansion"
+        return "normal"
+
+
+class VolatilityState:
+    __slots__ = (
+        "last_price",
+        "returns_sq",
+        "ewma_var",
+        "prices",
+        "bar_index",
+        "bar_open",
+        "bar_high",
+        "bar_low",
+        "bar_close",
+        "parkinson",
+        "garman_klass",
+        "thresholds",
+    )
+
+    def __init__(self, window: int, bar_window: int, thresholds: PercentileThresholds) -> None:
+        self.last_price: Optional[float] = None
+        self.returns_sq = RollingStats(window)
+        self.ewma_var = 0.0
+        self.prices = MonotonicWindow(window)
+        self.bar_index: Optional[int] = None
+        self.bar_open = self.bar_high = self.bar_low = self.bar_close = 0.0
+        self.parkinson = RollingStats(bar_window)
+        self.garman_klass = RollingStats(bar_window)
+        self.thresholds = thresholds
+
 
 class VolatilityEngine:
     """
-    Real-time ATR-like measurement and expansion/compression detection.
+    Streaming volatility per symbol, all O(1) per trade:
+    - realized volatility from trade-to-trade log returns over the last ``window`` trades
+    - EWMA volatility (RiskMetrics style, decay ``ewma_lambda``)
+    - Parkinson and Garman-Klass estimators on ``bar_seconds`` bars, averaged over ``bar_window`` bars
+    - price range over the last ``window`` trades (monotonic deques), in ticks
+    Volatilities are reported in bps. The regime compares EWMA vol against percentiles of the
+    instrument's own EWMA history sampled at each bar close (``learn`` seeds it).
     Emits volatility_update events.
     """
 
-    def __init__(self, bus: EventBus, window: int = 50) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        window: int = 50,
+        ewma_lambda: float = 0.94,
+        bar_seconds: int = 60,
+        bar_window: int = 20,
+        history: int = 2000,
+        low_pct: float = 20.0,
+        high_pct: float = 80.0,
+        ticks: TickSizeRegistry = TICK_SIZES,
+    ) -> None:
         self.bus = bus
         self.window = window
-        self.prices: Dict[str, Deque[float]] = {}
+        self.ewma_lambda = ewma_lambda
+        self.bar_seconds = bar_seconds
+        self.bar_window = bar_window
+        self.history = history
+        self.low_pct = low_pct
+        self.high_pct = high_pct
+        self.ticks = ticks
+        self.state: Dict[str, VolatilityState] = {}
         self.bus.subscribe("trade", self.on_trade)
         self._subs = ("trade",)
 
@@ -25,6 +146,19 @@ class VolatilityEngine:
         for et in getattr(self, "_subs", ()):
             self.bus.unsubscribe(et, self.on_trade)
 
+    def _state(self, symbol: str) -> VolatilityState:
+        st = self.state.get(symbol)
+        if st is None:
+            thresholds = PercentileThresholds(self.history, self.low_pct, self.high_pct)
+            st = self.state[symbol] = VolatilityState(self.window, self.bar_window, thresholds)
+        return st
+
+    def learn(self, symbol: str, history_bps: Iterable[float]) -> Tuple[Optional[float], Optional[float]]:
+        """Seed the symbol's regime percentiles from historical EWMA vol (bps)."""
+        thresholds = self._state(symbol).thresholds
+        thresholds.learn(history_bps)
+        return thresholds.low, thresholds.high
+
     def on_trade(self, evt: MarketEvent) -> None:
         sym = evt.symbol
         payload = evt.payload or {}
@@ -32,17 +166,58 @@ class VolatilityEngine:
             price = float(payload.get("price", 0.0))
         except Exception:
             return
-        dq = self.prices.setdefault(sym, deque(maxlen=self.window))
-        dq.append(price)
-        if len(dq) < 2:
+        if price <= 0:
+            return
+        st = self._state(sym)
+        self._update_bar(st, evt.timestamp, price)
+        st.prices.push(price)
+        prev = st.last_price
+        st.last_price = price
+        if prev is None:
             return
-        atr = max(dq) - min(dq)
-        regime = "compression" if atr < 0.2 else "expansion" if atr > 1.0 else "normal"
+        ret = math.log(price / prev)
+        st.returns_sq.push(ret * ret)
+        st.ewma_var = self.ewma_lambda * st.ewma_var + (1.0 - self.ewma_lambda) * ret * ret
         evt_out = MarketEvent(
             event_type="volatility_update",
-            timestamp=datetime.now(timezone.utc),
+            timestamp=evt.timestamp,
             source="volatility",
             symbol=sym,
-            payload={"atr": atr, "regime": regime},
+            payload=self.snapshot(sym),
         )
         self.bus.publish(evt_out)
+
+    def snapshot(self, symbol: str) -> Dict[str, float | str]:
+        st = self.state[symbol]
+        ewma_bps = math.sqrt(st.ewma_var) * _BPS
+        price_range = st.prices.range
+        return {
+            "rv_bps": math.sqrt(max(0.0, st.returns_sq.total)) * _BPS,
+            "ewma_bps": ewma_bps,
+            "parkinson_bps": math.sqrt(max(0.0, st.parkinson.mean)) * _BPS,
+            "garman_klass_bps": math.sqrt(max(0.0, st.garman_klass.mean)) * _BPS,
+            "range_ticks": price_range / self.ticks.tick_size(symbol),
+            "atr": price_range,
+            "regime": st.thresholds.classify(ewma_bps),
+            "regime_low_bps": st.thresholds.low,
+            "regime_high_bps": st.thresholds.high,
+        }
+
+    def _update_bar(self, st: VolatilityState, ts: datetime, price: float) -> None:
+        index = int(ts.timestamp() // self.bar_seconds)
+        if st.bar_index == index:
+            st.bar_high = max(st.bar_high, price)
+            st.bar_low = min(st.bar_low, price)
+            st.bar_close = price
+            return
+        if st.bar_index is not None:
+            self._close_bar(st)
+        st.bar_index = index
+        st.bar_open = st.bar_high = st.bar_low = st.bar_close = price
+
+    def _close_bar(self, st: VolatilityState) -> None:
+        hl = math.log(st.bar_high / st.bar_low)
+        co = math.log(st.bar_close / st.bar_open)
+        st.parkinson.push(_PARKINSON * hl * hl)
+        st.garman_klass.push(0.5 * hl * hl - _GK_CLOSE * co * co)
+        st.thresholds.add(math.sqrt(st.ewma_var) * _BPS)
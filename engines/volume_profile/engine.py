@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from typing import Dict, Any
 
 from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
 from models.market_event import MarketEvent
 
 
@@ -14,9 +15,11 @@ class VolumeProfileEngine:
     Emits volume_profile_update events.
     """
 
-    def __init__(self, bus: EventBus) -> None:
+    def __init__(self, bus: EventBus, ticks: TickSizeRegistry = TICK_SIZES) -> None:
         self.bus = bus
-        self.hist: Dict[str, Dict[float, float]] = defaultdict(dict)
+        self.ticks = ticks
+        # symbol -> tick index -> traded volume
+        self.hist: Dict[str, Dict[int, float]] = defaultdict(dict)
         self.bus.subscribe("trade", self.on_trade)
         self._subs = ("trade",)
 
@@ -32,27 +35,28 @@ class VolumeProfileEngine:
             size = float(payload.get("size", 0.0))
         except Exception:
             return
+        tick = self.ticks.to_tick(sym, price)
         book = self.hist.setdefault(sym, {})
-        book[price] = book.get(price, 0.0) + size
+        book[tick] = book.get(tick, 0.0) + size
         self._emit(sym)
 
     def _emit(self, sym: str) -> None:
         book = self.hist.get(sym, {})
         if not book:
             return
-        poc_price = max(book, key=lambda p: book[p])
+        poc_tick = max(book, key=lambda t: book[t])
         total = sum(book.values())
-        sorted_prices = sorted(book.keys())
+        to_price = self.ticks.to_price
         cum = 0.0
         value_area = []
-        for p in sorted_prices:
-            cum += book[p]
-            value_area.append(p)
+        for t in sorted(book.keys()):
+            cum += book[t]
+            value_area.append(to_price(sym, t))
             if cum >= 0.7 * total:
                 break
         payload: Dict[str, Any] = {
-            "histogram": book,
-            "poc": poc_price,
+            "histogram": {to_price(sym, t): v for t, v in book.items()},
+            "poc": to_price(sym, poc_tick),
             "value_area": value_area,
             "total_volume": total,
         }
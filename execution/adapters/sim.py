@@ -3,9 +3,13 @@ from __future__ import annotations
 import logging
 import random
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Iterable, Mapping, Optional, Union
 
 from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from engines.detectors.records import parse_book, parse_trade
+from execution.adapters.sim_matching import MatchingEngine
+from execution.latency import LatencyProfile
 from models.market_event import MarketEvent
 from models.order import OrderEvent, OrderRequest, OrderStatus
 
@@ -15,15 +19,53 @@ log = logging.getLogger(__name__)
 class SimAdapter:
     """
     Simulated execution adapter for tests and replay.
+
+    By default every order is acknowledged and filled at once (with ``fill_probability``).
+    With ``matching=True`` orders go through a MatchingEngine fed by the bus ``trade`` and
+    ``dom_snapshot`` events instead: price-time queues, partial fills and latency, all on
+    market event time. ``latency`` is a LatencyProfile or a venue -> LatencyProfile map (see
+    ``execution.latency.build_profiles``); ``latency_ms`` alone is a fixed send delay.
     """
 
-    def __init__(self, bus: EventBus, fill_probability: float = 1.0) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        fill_probability: float = 1.0,
+        matching: bool = False,
+        latency_ms: float = 0.0,
+        ticks: TickSizeRegistry = TICK_SIZES,
+        latency: Union[LatencyProfile, Mapping[str, LatencyProfile], None] = None,
+    ) -> None:
         self.bus = bus
         self.fill_probability = fill_probability
         self.orders: Dict[str, OrderRequest] = {}
+        self.ticks = ticks
+        self.matcher: Optional[MatchingEngine] = None
+        if matching:
+            self.matcher = MatchingEngine(latency_ms=latency_ms, ticks=ticks, latency=latency)
+            self.bus.subscribe("trade", self.on_trade)
+            self.bus.subscribe("dom_snapshot", self.on_dom)
+            self._subs = ("trade", "dom_snapshot")
+
+    def stop(self) -> None:
+        for et in getattr(self, "_subs", ()):
+            self.bus.unsubscribe(et, self.on_trade if et == "trade" else self.on_dom)
+
+    def on_trade(self, evt: MarketEvent) -> None:
+        rec = parse_trade(evt, self.ticks)
+        if rec is not None:
+            self._publish_all(self.matcher.on_trade(rec))
+
+    def on_dom(self, evt: MarketEvent) -> None:
+        rec = parse_book(evt, self.ticks)
+        if rec is not None:
+            self._publish_all(self.matcher.on_book(rec))
 
     def send(self, order: OrderRequest) -> None:
         self.orders[order.order_id] = order
+        if self.matcher is not None:
+            self._publish_all(self.matcher.submit(order))
+            return
         ack = OrderEvent(
             order_id=order.order_id,
             symbol=order.symbol,
@@ -44,6 +86,9 @@ class SimAdapter:
             self._publish(fill)
 
     def cancel(self, order_id: str) -> None:
+        if self.matcher is not None:
+            self._publish_all(self.matcher.cancel(order_id))
+            return
         evt = OrderEvent(
             order_id=order_id,
             symbol=self.orders.get(order_id).symbol if order_id in self.orders else "",
@@ -53,9 +98,15 @@ class SimAdapter:
         self._publish(evt)
 
     def replace(self, order_id: str, new_order: OrderRequest) -> None:
+        if self.matcher is not None:
+            self.cancel(order_id)  # lands before the new order: same latency, FIFO
         self.orders[order_id] = new_order
         self.send(new_order)
 
+    def _publish_all(self, events: Iterable[OrderEvent]) -> None:
+        for evt in events:
+            self._publish(evt)
+
     def _publish(self, evt: OrderEvent) -> None:
         market_evt = MarketEvent(
             event_type="order_event",
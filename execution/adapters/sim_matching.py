@@ -0,0 +1,469 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Mapping, Optional, Tuple, Union
+
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry
+from engines.detectors.records import BookRecord, TradeRecord
+from execution.latency import LatencyProfile
+from models.order import OrderEvent, OrderRequest, OrderSide, OrderStatus, OrderType
+
+
+class SimOrder:
+    """A simulated order: remaining quantity plus its place in the level queue."""
+
+    __slots__ = (
+        "request", "order_id", "symbol", "buy", "tick", "price", "remaining", "filled", "mark", "live", "stop_tick",
+        "armed", "profile", "sent_at", "arrived_at",
+    )
+
+    def __init__(
+        self,
+        request: OrderRequest,
+        tick: Optional[int],
+        stop_tick: Optional[int],
+        profile: LatencyProfile,
+        sent_at: Optional[datetime],
+        arrived_at: datetime,
+    ) -> None:
+        self.request = request
+        self.order_id = request.order_id
+        self.symbol = request.symbol
+        self.buy = request.side == OrderSide.BUY
+        self.tick = tick
+        self.price = request.limit_price
+        self.remaining = float(request.quantity)
+        self.filled = 0.0
+        self.mark = 0.0  # market volume that must trade at the level before us (see _Level)
+        self.live = True
+        self.stop_tick = stop_tick
+        self.armed = False  # waiting for a print at stop_tick
+        self.profile = profile
+        # send / exchange time of the last request for this order (the order itself, then a cancel)
+        self.sent_at = sent_at
+        self.arrived_at = arrived_at
+
+
+class _Level:
+    """
+    Our resting orders at one price, FIFO.
+
+    ``drained`` is the market volume traded at this level since it was created; an order's
+    ``mark`` is ``drained`` plus the visible size ahead of it when it joined, so its queue
+    position is ``mark - drained`` and a print only touches the orders it actually reaches.
+    """
+
+    __slots__ = ("orders", "drained", "live")
+
+    def __init__(self) -> None:
+        self.orders: Deque[SimOrder] = deque()
+        self.drained = 0.0
+        self.live = 0
+
+
+class _Side:
+    """Resting orders of one side, indexed by tick with a sorted tick list for range scans."""
+
+    __slots__ = ("levels", "ticks")
+
+    def __init__(self) -> None:
+        self.levels: Dict[int, _Level] = {}
+        self.ticks: List[int] = []
+
+    def level(self, tick: int) -> _Level:
+        lvl = self.levels.get(tick)
+        if lvl is None:
+            lvl = self.levels[tick] = _Level()
+            insort(self.ticks, tick)
+        return lvl
+
+    def drop(self, tick: int) -> None:
+        del self.levels[tick]
+        del self.ticks[bisect_left(self.ticks, tick)]
+
+
+# (arrival at the exchange, "new" | "cancel", request | order_id, profile, sent at)
+_Pending = Tuple[Optional[datetime], str, object, LatencyProfile, Optional[datetime]]
+# reports stamped with exchange time, before the way back to us
+_Reports = List[Tuple[SimOrder, OrderEvent]]
+
+
+class _SymbolBook:
+    def __init__(self) -> None:
+        self.bids = _Side()
+        self.asks = _Side()
+        self.market_bids: Dict[int, float] = {}
+        self.market_asks: Dict[int, float] = {}
+        self.ask_levels: List[Tuple[int, float, float]] = []  # (tick, price, size) best first
+        self.bid_levels: List[Tuple[int, float, float]] = []
+        self.consumed: Dict[int, float] = {}  # our aggressive fills since the last book
+        self.last_price: Optional[float] = None
+        self.now: Optional[datetime] = None
+        self.pending: Deque[_Pending] = deque()
+        self.outbox: Deque[Tuple[datetime, float, OrderEvent]] = deque()  # (due, latency_ms, report)
+        # untriggered stops by trigger tick: buys fire on prints at or above, sells at or below
+        self.buy_stops = _Side()
+        self.sell_stops = _Side()
+
+
+class MatchingEngine:
+    """
+    Price-time matching of simulated orders against the reconstructed market.
+
+    Latency runs on the replay clock, per venue (``routing_hints["venue"]``, else ``DEFAULT``):
+    orders and cancels reach the simulated exchange a ``send`` sample after the last market
+    event seen for the symbol, so fills can still arrive before a cancel lands, and every
+    report comes back an ``ack``/``fill`` sample after it happened at the exchange. Both ways
+    stay FIFO per symbol, as on a single session. ``latency_ms`` alone means a fixed send delay
+    and instant reports. On arrival a
+    marketable order walks the visible opposite book (partial fills level by level; market
+    orders cancel whatever finds no liquidity) and a limit remainder joins the back of its
+    level behind the visible size.
+
+    Resting orders then advance on prints at their price (volume ahead trades first) and fill
+    outright when the market trades through them; when the opposite quote moves onto them they
+    take the liquidity shown there. Snapshots never reflect our virtual fills, so liquidity we
+    took at a level counts as gone for as long as the level is displayed. Cancels ahead of us are inferred
+    from the book: the queue ahead can never be longer than the visible size at the level.
+
+    Resting orders live in per-tick FIFO levels with a sorted tick index, so a print costs
+    O(levels traded through + orders filled) regardless of how many orders rest elsewhere;
+    untriggered stops are indexed the same way by trigger tick, so a print only pops the
+    stops it crosses.
+    Methods return the OrderEvents that reached us by the market time of the call, stamped
+    with that delivery time; ``filled_qty`` is the size of that fill and ``raw`` carries
+    ``cum_qty``/``leaves_qty``, ``exchange_ts`` and ``latency_ms`` (from sending the request to
+    its report, or from the exchange event for later fills).
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        ticks: TickSizeRegistry = TICK_SIZES,
+        latency: Union[LatencyProfile, Mapping[str, LatencyProfile], None] = None,
+    ) -> None:
+        if latency is None:
+            latency = LatencyProfile.fixed(latency_ms)
+        if isinstance(latency, LatencyProfile):
+            latency = {"DEFAULT": latency}
+        self.profiles: Dict[str, LatencyProfile] = {str(k).upper(): v for k, v in latency.items()}
+        self.profiles.setdefault("DEFAULT", LatencyProfile())
+        self.ticks = ticks
+        self.books: Dict[str, _SymbolBook] = {}
+        self.orders: Dict[str, SimOrder] = {}
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = _SymbolBook()
+        return book
+
+    # ------------------------------------------------------------------ requests
+    def submit(self, request: OrderRequest) -> List[OrderEvent]:
+        self._send(self._book(request.symbol), "new", request, request)
+        return []
+
+    def cancel(self, order_id: str) -> List[OrderEvent]:
+        order = self.orders.get(order_id)
+        request = order.request if order else self._pending_request(order_id)
+        if request is None:
+            return []
+        self._send(self._book(request.symbol), "cancel", order_id, request)
+        return []
+
+    def _pending_request(self, order_id: str) -> Optional[OrderRequest]:
+        for book in self.books.values():
+            for _, kind, item, _, _ in book.pending:
+                if kind == "new" and item.order_id == order_id:
+                    return item
+        return None
+
+    def profile(self, request: OrderRequest) -> LatencyProfile:
+        venue = request.routing_hints.get("venue")
+        return self.profiles.get(venue.upper(), self.profiles["DEFAULT"]) if venue else self.profiles["DEFAULT"]
+
+    def _send(self, book: _SymbolBook, kind: str, item: object, request: OrderRequest) -> None:
+        profile = self.profile(request)
+        arrival = None
+        if book.now is not None:
+            arrival = book.now + timedelta(milliseconds=profile.send.sample())
+            if book.pending and book.pending[-1][0] is not None and arrival < book.pending[-1][0]:
+                arrival = book.pending[-1][0]  # no overtaking on the way in
+        book.pending.append((arrival, kind, item, profile, book.now))
+
+    # ------------------------------------------------------------------ market data
+    def on_trade(self, rec: TradeRecord) -> List[OrderEvent]:
+        book = self._book(rec.symbol)
+        out = self._advance(book, rec.timestamp)
+        book.last_price = rec.price
+        tick, size, ts = rec.tick, rec.size, rec.timestamp
+        if rec.side != "buy":  # a sell print (or unknown side) hits resting buys
+            self._on_print(book.bids, tick, size, ts, out, buy=True)
+        if rec.side != "sell":
+            self._on_print(book.asks, tick, size, ts, out, buy=False)
+        if book.buy_stops.ticks or book.sell_stops.ticks:
+            self._trigger_stops(book, rec, out)
+        return self._deliver(book, out)
+
+    def on_book(self, rec: BookRecord) -> List[OrderEvent]:
+        book = self._book(rec.symbol)
+        out = self._advance(book, rec.timestamp)
+        to_tick, sym = self.ticks.to_tick, rec.symbol
+        book.market_bids, book.market_asks = rec.bid_ticks, rec.ask_ticks
+        book.bid_levels = [(to_tick(sym, p), p, s) for p, s in rec.bids]
+        book.ask_levels = [(to_tick(sym, p), p, s) for p, s in rec.asks]
+        # snapshots do not reflect our virtual fills: what we took stays taken while the level lasts
+        sizes = {**rec.bid_ticks, **rec.ask_ticks}
+        book.consumed = {t: min(q, sizes[t]) for t, q in book.consumed.items() if t in sizes}
+        self._clamp(book.bids, rec.bid_ticks)
+        self._clamp(book.asks, rec.ask_ticks)
+        # the opposite quote moved onto resting orders: they take what is left there
+        if book.ask_levels and book.bids.ticks:
+            crossed = book.bids.ticks[bisect_left(book.bids.ticks, book.ask_levels[0][0]) :]
+            for tick in reversed(crossed):
+                self._take_level(book, book.bids, tick, rec.timestamp, out)
+        if book.bid_levels and book.asks.ticks:
+            for tick in book.asks.ticks[: bisect_right(book.asks.ticks, book.bid_levels[0][0])]:
+                self._take_level(book, book.asks, tick, rec.timestamp, out)
+        return self._deliver(book, out)
+
+    def _advance(self, book: _SymbolBook, now: datetime) -> _Reports:
+        """Deliver requests whose latency has elapsed, then move the symbol clock to ``now``."""
+        out: _Reports = []
+        book.now = now if book.now is None or now > book.now else book.now
+        pending = book.pending
+        while pending and (pending[0][0] is None or pending[0][0] <= book.now):
+            at, kind, item, profile, sent = pending.popleft()
+            ts = at or book.now
+            if kind == "new":
+                self._arrive(book, item, ts, out, profile, sent)
+            else:
+                self._cancel_now(book, item, ts, out, sent)
+        return out
+
+    def _deliver(self, book: _SymbolBook, out: _Reports) -> List[OrderEvent]:
+        """Put new reports on the way back, then hand over those due by the symbol clock."""
+        outbox = book.outbox
+        for order, evt in out:
+            leg = order.profile.fill if evt.status in (OrderStatus.PARTIAL, OrderStatus.FILL) else order.profile.ack
+            due = evt.timestamp + timedelta(milliseconds=leg.sample())
+            if outbox and due < outbox[-1][0]:
+                due = outbox[-1][0]  # no overtaking on the way back
+            start = order.sent_at if order.sent_at is not None and evt.timestamp == order.arrived_at else evt.timestamp
+            outbox.append((due, (due - start).total_seconds() * 1000.0, evt))
+        delivered: List[OrderEvent] = []
+        while outbox and outbox[0][0] <= book.now:
+            due, latency_ms, evt = outbox.popleft()
+            raw = {**evt.raw, "exchange_ts": evt.timestamp.isoformat(), "latency_ms": f"{latency_ms:.3f}"}
+            delivered.append(evt.model_copy(update={"timestamp": due, "raw": raw}))
+        return delivered
+
+    # ------------------------------------------------------------------ order lifecycle
+    def _arrive(
+        self,
+        book: _SymbolBook,
+        request: OrderRequest,
+        ts: datetime,
+        out: _Reports,
+        profile: LatencyProfile,
+        sent: Optional[datetime],
+    ) -> None:
+        sym = request.symbol
+        tick = self.ticks.to_tick(sym, request.limit_price) if request.limit_price is not None else None
+        stop_tick = self.ticks.to_tick(sym, request.stop_price) if request.stop_price is not None else None
+        order = SimOrder(request, tick, stop_tick, profile, sent, ts)
+        if request.order_type in (OrderType.LIMIT, OrderType.STOP_LIMIT) and tick is None:
+            out.append((order, self._event(order, OrderStatus.REJECT, ts, reason="limit_price required")))
+            return
+        self.orders[order.order_id] = order
+        out.append((order, self._event(order, OrderStatus.ACK, ts)))
+        if request.order_type in (OrderType.STOP, OrderType.STOP_LIMIT) and stop_tick is not None:
+            level = (book.buy_stops if order.buy else book.sell_stops).level(stop_tick)
+            level.orders.append(order)
+            level.live += 1
+            order.armed = True
+            return
+        self._execute(book, order, ts, out)
+
+    def _execute(self, book: _SymbolBook, order: SimOrder, ts: datetime, out: _Reports) -> None:
+        market = order.request.order_type in (OrderType.MARKET, OrderType.STOP)
+        levels = book.ask_levels if order.buy else book.bid_levels
+        crosses = market or bool(levels and (levels[0][0] <= order.tick if order.buy else levels[0][0] >= order.tick))
+        if crosses and order.request.post_only and not market:
+            self._finish(order, OrderStatus.REJECT, ts, out, reason="post_only would cross")
+            return
+        if crosses:
+            if not levels and market and book.last_price is not None:
+                self._fill(order, order.remaining, book.last_price, ts, out)
+            self._take(book, order, market, ts, out)
+        if order.remaining <= 0:
+            return
+        if market:
+            self._finish(order, OrderStatus.CANCEL, ts, out, reason="no liquidity")
+            return
+        side = book.bids if order.buy else book.asks
+        visible = (book.market_bids if order.buy else book.market_asks).get(order.tick, 0.0)
+        level = side.level(order.tick)
+        last = level.orders[-1].mark if level.orders else 0.0
+        order.mark = max(level.drained + visible, last)
+        level.orders.append(order)
+        level.live += 1
+
+    def _take(self, book: _SymbolBook, order: SimOrder, market: bool, ts: datetime, out: _Reports) -> None:
+        """Fill ``order`` against visible opposite levels up to its limit, level prices."""
+        for tick, price, size in book.ask_levels if order.buy else book.bid_levels:
+            if order.remaining <= 0 or (not market and (tick > order.tick if order.buy else tick < order.tick)):
+                break
+            available = size - book.consumed.get(tick, 0.0)
+            if available <= 0:
+                continue
+            qty = min(available, order.remaining)
+            book.consumed[tick] = book.consumed.get(tick, 0.0) + qty
+            self._fill(order, qty, price, ts, out)
+
+    def _take_level(self, book: _SymbolBook, side: _Side, tick: int, ts: datetime, out: _Reports) -> None:
+        level = side.levels[tick]
+        for order in level.orders:
+            if order.live:
+                self._take(book, order, False, ts, out)
+                if not order.live:
+                    level.live -= 1
+        if level.live == 0:
+            side.drop(tick)
+
+    def _cancel_now(self, book: _SymbolBook, order_id: str, ts: datetime, out: _Reports, sent: Optional[datetime]) -> None:
+        order = self.orders.get(order_id)
+        if order is None:
+            return  # already filled, cancelled or rejected
+        order.sent_at, order.arrived_at = sent, ts
+        if order.armed:
+            side, tick = (book.buy_stops if order.buy else book.sell_stops), order.stop_tick
+            order.armed = False
+        else:
+            side, tick = (book.bids if order.buy else book.asks), order.tick
+        if tick is not None:
+            level = side.levels.get(tick)
+            if level is not None:
+                level.live -= 1
+                if level.live == 0:
+                    side.drop(tick)
+        self._finish(order, OrderStatus.CANCEL, ts, out, reason="cancelled")
+
+    def _trigger_stops(self, book: _SymbolBook, rec: TradeRecord, out: _Reports) -> None:
+        buys, sells = book.buy_stops, book.sell_stops
+        # copies of the crossed tick ranges: _fire drops each level as it goes
+        self._fire(book, buys, buys.ticks[: bisect_right(buys.ticks, rec.tick)], rec.timestamp, out)
+        self._fire(book, sells, sells.ticks[bisect_left(sells.ticks, rec.tick) :], rec.timestamp, out)
+
+    def _fire(self, book: _SymbolBook, stops: _Side, ticks: List[int], ts: datetime, out: _Reports) -> None:
+        for tick in ticks:
+            level = stops.levels[tick]
+            stops.drop(tick)
+            for order in level.orders:
+                if order.live:  # cancelled stops are left in place and skipped here
+                    order.armed = False
+                    self._execute(book, order, ts, out)
+
+    # ------------------------------------------------------------------ queue mechanics
+    def _on_print(self, side: _Side, tick: int, size: float, ts: datetime, out: _Reports, buy: bool) -> None:
+        if not side.ticks:
+            return
+        # levels the print traded through fill outright
+        through = side.ticks[bisect_right(side.ticks, tick):] if buy else side.ticks[: bisect_left(side.ticks, tick)]
+        for t in through:
+            self._fill_level(side, t, ts, out)
+        level = side.levels.get(tick)
+        if level is None:
+            return
+        remaining = size
+        orders = level.orders
+        while remaining > 0 and orders:
+            order = orders[0]
+            if not order.live:
+                orders.popleft()
+                continue
+            ahead = order.mark - level.drained
+            if ahead > 0:
+                used = min(ahead, remaining)
+                level.drained += used
+                remaining -= used
+                if remaining <= 0:
+                    break
+            qty = min(order.remaining, remaining)
+            remaining -= qty
+            self._fill(order, qty, order.price, ts, out)
+            if order.remaining <= 0:
+                orders.popleft()
+                level.live -= 1
+        if level.live == 0:
+            side.drop(tick)
+
+    def _fill_level(self, side: _Side, tick: int, ts: datetime, out: _Reports) -> None:
+        level = side.levels.get(tick)
+        if level is None:
+            return
+        for order in level.orders:
+            if order.live:
+                self._fill(order, order.remaining, order.price, ts, out)
+        side.drop(tick)
+
+    @staticmethod
+    def _clamp(side: _Side, visible: Dict[int, float]) -> None:
+        """Cancels ahead of us: the queue ahead cannot exceed what the book still shows."""
+        if not side.ticks or not visible:
+            return
+        ticks = side.ticks
+        # levels outside the visible depth are left alone: nothing to infer there
+        for tick in ticks[bisect_left(ticks, min(visible)) : bisect_right(ticks, max(visible))]:
+            level = side.levels[tick]
+            cap = level.drained + visible.get(tick, 0.0)
+            for order in reversed(level.orders):
+                if order.mark <= cap:
+                    break
+                order.mark = cap
+
+    # ------------------------------------------------------------------ reports
+    def _fill(self, order: SimOrder, qty: float, price: float, ts: datetime, out: _Reports) -> None:
+        if qty <= 0:
+            return
+        order.remaining -= qty
+        order.filled += qty
+        done = order.remaining <= 1e-12
+        if done:
+            order.remaining = 0.0
+            order.live = False
+            self.orders.pop(order.order_id, None)
+        out.append((order, self._event(order, OrderStatus.FILL if done else OrderStatus.PARTIAL, ts, qty=qty, price=price)))
+
+    def _finish(self, order: SimOrder, status: OrderStatus, ts: datetime, out: _Reports, reason: str) -> None:
+        order.live = False
+        self.orders.pop(order.order_id, None)
+        out.append((order, self._event(order, status, ts, reason=reason)))
+
+    @staticmethod
+    def _event(
+        order: SimOrder,
+        status: OrderStatus,
+        ts: datetime,
+        qty: float = 0.0,
+        price: Optional[float] = None,
+        reason: Optional[str] = None,
+    ) -> OrderEvent:
+        return OrderEvent(
+            order_id=order.order_id,
+            symbol=order.symbol,
+            status=status,
+            timestamp=ts,
+            filled_qty=qty,
+            avg_price=price,
+            reason=reason,
+            raw={"cum_qty": str(order.filled), "leaves_qty": str(order.remaining if order.live else 0.0)},
+        )
+
+    def resting(self, symbol: str) -> int:
+        book = self.books.get(symbol)
+        if book is None:
+            return 0
+        return sum(level.live for side in (book.bids, book.asks) for level in side.levels.values())
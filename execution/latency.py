@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import csv
+import json
+import math
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+class LatencyModel(ABC):
+    """One-way delay in milliseconds; ``sample`` draws the next value."""
+
+    @abstractmethod
+    def sample(self) -> float:
+        ...
+
+
+class FixedLatency(LatencyModel):
+    def __init__(self, ms: float = 0.0) -> None:
+        if ms < 0:
+            raise ValueError("latency must be >= 0")
+        self.ms = float(ms)
+
+    def sample(self) -> float:
+        return self.ms
+
+
+class LognormalLatency(LatencyModel):
+    """
+    Right-skewed delay: ``median_ms * exp(sigma * N(0, 1))``, optionally capped, plus a floor.
+    """
+
+    def __init__(
+        self,
+        median_ms: float,
+        sigma: float = 0.5,
+        floor_ms: float = 0.0,
+        cap_ms: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if median_ms <= 0 or sigma < 0:
+            raise ValueError("median_ms must be > 0 and sigma >= 0")
+        self.mu = math.log(median_ms)
+        self.sigma = sigma
+        self.floor_ms = floor_ms
+        self.cap_ms = cap_ms
+        self._rng = np.random.default_rng(seed)
+
+    def sample(self) -> float:
+        value = self.floor_ms + float(self._rng.lognormal(self.mu, self.sigma))
+        return min(value, self.cap_ms) if self.cap_ms is not None else value
+
+
+class EmpiricalLatency(LatencyModel):
+    """
+    Draws from recorded delays: raw samples, or a histogram (bin edges + counts) sampled by bin
+    weight and uniformly within the bin.
+    """
+
+    def __init__(
+        self,
+        samples: Optional[Sequence[float]] = None,
+        edges: Optional[Sequence[float]] = None,
+        counts: Optional[Sequence[float]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._rng = np.random.default_rng(seed)
+        if samples is not None:
+            self.samples = np.asarray([s for s in samples if s >= 0], dtype=np.float64)
+            if not len(self.samples):
+                raise ValueError("no non-negative latency samples")
+            self.edges = self.weights = None
+        else:
+            if edges is None or counts is None or len(edges) != len(counts) + 1:
+                raise ValueError("histogram needs len(edges) == len(counts) + 1")
+            weights = np.asarray(counts, dtype=np.float64)
+            if weights.sum() <= 0:
+                raise ValueError("histogram is empty")
+            self.samples = None
+            self.edges = np.asarray(edges, dtype=np.float64)
+            self.weights = weights / weights.sum()
+
+    def sample(self) -> float:
+        if self.samples is not None:
+            return float(self.samples[self._rng.integers(len(self.samples))])
+        i = self._rng.choice(len(self.weights), p=self.weights)
+        return float(self._rng.uniform(self.edges[i], self.edges[i + 1]))
+
+    @classmethod
+    def from_file(cls, path: str, seed: Optional[int] = None) -> "EmpiricalLatency":
+        """
+        Load recorded round trips from CSV, JSON (list) or JSONL. Each row holds either
+        ``latency_ms`` or a ``sent_ts``/``ack_ts`` pair (epoch seconds or ISO-8601), e.g. an
+        order_event audit of IBKR/MT5 acks joined with the send time.
+        """
+        return cls(samples=[_row_latency(row) for row in _read_rows(path)], seed=seed)
+
+
+def _read_rows(path: str) -> Iterable[Mapping[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            return list(csv.DictReader(f))
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _epoch(value: Any) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(str(value)).timestamp()
+
+
+def _row_latency(row: Mapping[str, Any]) -> float:
+    if row.get("latency_ms") not in (None, ""):
+        return float(row["latency_ms"])
+    return (_epoch(row["ack_ts"]) - _epoch(row["sent_ts"])) * 1000.0
+
+
+class LatencyProfile:
+    """
+    Delays for one venue: ``send`` (our request reaching the venue, also used for cancels),
+    ``ack`` (acknowledgement back to us) and ``fill`` (execution reports back to us).
+    """
+
+    def __init__(
+        self,
+        send: Optional[LatencyModel] = None,
+        ack: Optional[LatencyModel] = None,
+        fill: Optional[LatencyModel] = None,
+    ) -> None:
+        self.send = send or FixedLatency()
+        self.ack = ack or FixedLatency()
+        self.fill = fill or self.ack
+
+    @classmethod
+    def fixed(cls, ms: float) -> "LatencyProfile":
+        """``ms`` on the way in, nothing on the way back (the old single-number setting)."""
+        return cls(send=FixedLatency(ms))
+
+
+def build_model(cfg: Any, seed: Optional[int] = None) -> LatencyModel:
+    """
+    ``5`` or ``{"type": "fixed", "ms": 5}``; ``{"type": "lognormal", "median_ms", "sigma",
+    "floor_ms", "cap_ms"}``; ``{"type": "empirical", "path"}`` or ``{"type": "empirical",
+    "samples": [...]}`` or ``{"type": "empirical", "edges": [...], "counts": [...]}``.
+    """
+    if isinstance(cfg, (int, float)):
+        return FixedLatency(cfg)
+    kind = str(cfg.get("type", "fixed")).lower()
+    seed = cfg.get("seed", seed)
+    if kind == "fixed":
+        return FixedLatency(cfg.get("ms", 0.0))
+    if kind == "lognormal":
+        return LognormalLatency(
+            float(cfg["median_ms"]),
+            float(cfg.get("sigma", 0.5)),
+            float(cfg.get("floor_ms", 0.0)),
+            cfg.get("cap_ms"),
+            seed,
+        )
+    if kind == "empirical":
+        if cfg.get("path"):
+            return EmpiricalLatency.from_file(cfg["path"], seed=seed)
+        return EmpiricalLatency(cfg.get("samples"), cfg.get("edges"), cfg.get("counts"), seed=seed)
+    raise ValueError(f"Unknown latency model: {kind}")
+
+
+def build_profiles(cfg: Optional[Mapping[str, Any]], seed: Optional[int] = None) -> Dict[str, LatencyProfile]:
+    """
+    Venue name -> LatencyProfile from ``{venue: {"send": ..., "ack": ..., "fill": ...}}``;
+    ``default`` applies to orders without a known venue.
+    """
+    profiles: Dict[str, LatencyProfile] = {}
+    for venue, stages in (cfg or {}).items():
+        stages = stages or {}
+        profiles[str(venue).upper()] = LatencyProfile(
+            *(build_model(stages[stage], seed) if stage in stages else None for stage in ("send", "ack", "fill"))
+        )
+    profiles.setdefault("DEFAULT", LatencyProfile())
+    return profiles
+
+
+def summarize(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    """count / mean / p50 / p90 / p99 / max of a latency sample."""
+    if not len(latencies_ms):
+        return {"count": 0}
+    arr = np.asarray(latencies_ms, dtype=np.float64)
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    return {"count": int(len(arr)), "mean": float(arr.mean()), "p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(arr.max())}
+
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
 
 from core.event_bus import EventBus
 from models.market_event import MarketEvent
-from models.order import OrderEvent, OrderRequest
+from models.order import OrderEvent, OrderRequest, OrderStatus
 
 log = logging.getLogger(__name__)
 
+_TERMINAL = (OrderStatus.FILL.value, OrderStatus.CANCEL.value, OrderStatus.REJECT.value, OrderStatus.ERROR.value)
+
 
 class ExecutionRouter:
     """
     Routes orders to a concrete adapter and publishes order events to the EventBus.
+
+    ``working`` holds the orders not yet filled, cancelled or rejected according to
+    ``order_event``; ``on_finished`` callbacks get each order id as it leaves. While
+    ``blocked`` (kill switch) submissions are rejected locally. ``submit`` runs on the caller's
+    thread and order events on the bus thread, so ``working`` and ``blocked`` change under a
+    lock; read ``working`` through ``working_ids``.
     """
 
     def __init__(self, bus: EventBus, adapter, mode: str = "SIM") -> None:
@@ -20,9 +30,43 @@ class ExecutionRouter:
         self.adapter = adapter
         self.mode = mode.upper()
         self.orders: Dict[str, OrderRequest] = {}
+        self.working: Dict[str, OrderRequest] = {}
+        self.blocked = False
+        self.on_finished: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+        self.bus.subscribe("order_event", self.on_order_event)
+
+    def stop(self) -> None:
+        self.bus.unsubscribe("order_event", self.on_order_event)
+
+    def working_ids(self) -> List[str]:
+        with self._lock:
+            return list(self.working)
+
+    def block(self) -> List[str]:
+        """Block new submissions and return the orders working at that instant."""
+        with self._lock:
+            self.blocked = True
+            return list(self.working)
 
     def submit(self, order: OrderRequest) -> None:
-        self.orders[order.order_id] = order
+        with self._lock:
+            blocked = self.blocked
+            if not blocked:
+                self.orders[order.order_id] = order
+                self.working[order.order_id] = order
+        if blocked:
+            log.warning("Order %s rejected: execution blocked", order.order_id)
+            self.publish_order_event(
+                OrderEvent(
+                    order_id=order.order_id,
+                    symbol=order.symbol,
+                    status=OrderStatus.REJECT,
+                    timestamp=datetime.now(timezone.utc),
+                    reason="kill_switch",
+                )
+            )
+            return
         log.info(
             "Routing order %s via %s",
             order.order_id,
@@ -34,6 +78,31 @@ class ExecutionRouter:
     def cancel(self, order_id: str) -> None:
         self.adapter.cancel(order_id)
 
+    def cancel_all(self) -> List[str]:
+        """Cancel every working order in one pass (adapter ``cancel_many`` when it has one)."""
+        order_ids = self.working_ids()
+        if not order_ids:
+            return order_ids
+        cancel_many = getattr(self.adapter, "cancel_many", None)
+        if cancel_many is not None:
+            cancel_many(order_ids)
+        else:
+            for order_id in order_ids:
+                self.adapter.cancel(order_id)
+        return order_ids
+
+    def on_order_event(self, evt: MarketEvent) -> None:
+        payload = evt.payload or {}
+        status = payload.get("status")
+        order_id = payload.get("order_id")
+        if getattr(status, "value", status) not in _TERMINAL:
+            return
+        with self._lock:
+            finished = self.working.pop(order_id, None) is not None
+        if finished:
+            for fn in self.on_finished:
+                fn(order_id)
+
     def replace(self, order_id: str, new_order: OrderRequest) -> None:
         self.orders[order_id] = new_order
         self.adapter.replace(order_id, new_order)
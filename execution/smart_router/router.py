@@ -43,7 +43,8 @@ class SmartOrderRouter:
         if status not in (OrderStatus.FILL, OrderStatus.PARTIAL.value, "fill", "partial_fill"):
             return
         slippage_bps = float(payload.get("slippage_bps", 0.0))
-        latency_ms = float(payload.get("latency_ms", 0.0))
+        # simulated reports carry their modelled round trip in raw
+        latency_ms = float(payload.get("latency_ms") or (payload.get("raw") or {}).get("latency_ms") or 0.0)
         self.metrics.record_fill(evt.symbol, slippage_bps, latency_ms)
 
     def cancel_replace(self, order_id: str, new_price: Optional[float] = None) -> None:
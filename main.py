@@ -24,6 +24,9 @@ from models.market_event import MarketEvent
 from models.order import OrderRequest, OrderSide, OrderType
 from models.risk import RiskDecision
 from risk.engine import RiskEngine
+from risk.kill_switch import KillSwitch
+from risk.positions import PositionManager
+from risk.profile import RiskProfile
 
 
 def build_order_from_signal(signal_evt: MarketEvent, default_qty: float = 1.0) -> OrderRequest:
@@ -68,24 +71,29 @@ def main(argv: List[str]) -> int:
     strategy.on_start()
 
     # Risk and execution
-    risk_engine = RiskEngine(settings.risk_limits)
+    positions = PositionManager(bus, mark_seconds=float(settings.risk_limits.get("mark_seconds", 1.0)))
+    positions.start()
+    kill_switch = KillSwitch(bus)
+    kill_switch.start()
+    risk_engine = RiskEngine(RiskProfile.load(settings.risk_limits), positions=positions, kill_switch=kill_switch)
     adapter = SimAdapter(bus) if mode == "sim" else IBKRAdapter(bus, settings.ibkr_host, settings.ibkr_port, settings.ibkr_client_id)
     router = ExecutionRouter(bus, adapter)
+    kill_switch.attach(router)
 
     # Signal -> order pipeline
     def on_signal(evt: MarketEvent) -> None:
         order = build_order_from_signal(evt, default_qty=settings.execution.get("default_qty", 1.0))
-        decision = risk_engine.evaluate(order, account_ctx={})
+        verdict = risk_engine.evaluate(order, account_ctx={})
         bus.publish(
             MarketEvent(
                 event_type="risk_decision",
-                timestamp=decision.timestamp,
+                timestamp=verdict.timestamp,
                 source="risk",
                 symbol=order.symbol,
-                payload=decision.model_dump(),
+                payload=verdict.as_dict(),  # plain fields: no RiskDecision built per signal
             )
         )
-        if decision.approved:
+        if verdict.approved:
             router.submit(order)
 
     bus.subscribe("signal", on_signal)
@@ -115,6 +123,8 @@ def main(argv: List[str]) -> int:
 
     if connector:
         connector.stop()
+    kill_switch.stop()
+    positions.stop()
     bus.stop()
     return 0
 
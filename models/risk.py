@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Dict, List
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -16,3 +17,65 @@ class RiskDecision(BaseModel):
     approved: bool
     reasons: List[str] = Field(default_factory=list)
     limits: Dict[str, float] = Field(default_factory=dict)
+
+
+class RiskVerdict:
+    """
+    What RiskEngine.evaluate returns: ``approved``, ``reasons``, ``timestamp`` and the plain
+    ``as_dict`` payload straight away, the full RiskDecision (id, validated model) only when
+    first asked for. Attributes not defined here (``decision_id``, ``model_dump`` ...) are
+    read from that decision.
+    """
+
+    __slots__ = ("order_id", "symbol", "approved", "reasons", "limits", "at", "_decision")
+
+    def __init__(
+        self,
+        order_id: str,
+        symbol: str,
+        approved: bool,
+        reasons: Sequence[str],
+        limits: Dict[str, float],
+        at: float,
+    ) -> None:
+        self.order_id = order_id
+        self.symbol = symbol
+        self.approved = approved
+        self.reasons = reasons
+        self.limits = limits
+        self.at = at  # epoch seconds
+        self._decision: Optional[RiskDecision] = None
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.at, timezone.utc)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain fields for the ``risk_decision`` event, without building the RiskDecision."""
+        return {
+            "order_id": self.order_id,
+            "symbol": self.symbol,
+            "approved": self.approved,
+            "reasons": list(self.reasons),
+            "limits": self.limits,
+            "at": self.at,
+        }
+
+    @property
+    def decision(self) -> RiskDecision:
+        if self._decision is None:
+            self._decision = RiskDecision(
+                decision_id=uuid.uuid4().hex,
+                timestamp=self.timestamp,
+                order_id=self.order_id,
+                symbol=self.symbol,
+                approved=self.approved,
+                reasons=list(self.reasons),
+                limits=self.limits,
+            )
+        return self._decision
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.decision, name)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from core.event_bus import EventBus
+from core.timer import BusTimer
+from models.market_event import MarketEvent
+
+log = logging.getLogger(__name__)
+
+
+def _flatten(prefix: str, value: Any, out: Dict[str, Any]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}", item, out)
+    else:
+        out[prefix] = value
+
+
+class MetricsPublisher:
+    """
+    Publishes the ``metrics`` event the UI metrics panel shows, on the ``metrics_publish``
+    timer. Each source registered with ``add`` is a callable returning a (possibly nested)
+    dict, read on the bus thread and flattened to dotted keys under the source's name
+    (``strategy_host.strategist[ES].gate.passed``).
+    """
+
+    def __init__(self, bus: EventBus, interval_seconds: float = 1.0) -> None:
+        self.bus = bus
+        self.interval_seconds = interval_seconds
+        self.sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._timer: Optional[BusTimer] = None
+
+    def add(self, name: str, source: Callable[[], Dict[str, Any]]) -> None:
+        self.sources[name] = source
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0:
+            return
+        self.bus.subscribe("timer", self.on_timer)
+        self._timer = BusTimer(self.bus, "metrics_publish", self.interval_seconds)
+        self._timer.start()
+
+    def stop(self) -> None:
+        if self._timer:
+            self._timer.stop()
+            self._timer = None
+            self.bus.unsubscribe("timer", self.on_timer)
+
+    def on_timer(self, evt: MarketEvent) -> None:
+        if evt.payload.get("name") == "metrics_publish":
+            self.publish()
+
+    def publish(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {}
+        for name, source in self.sources.items():
+            try:
+                _flatten(name, source(), payload)
+            except Exception:
+                log.exception("[Metrics] source %s failed", name)
+        self.bus.publish(
+            MarketEvent(event_type="metrics", timestamp=datetime.now(timezone.utc), source="metrics", symbol="", payload=payload)
+        )
+        return payload
@@ -134,7 +134,7 @@ class BinanceProvider(ProviderBase):
         price = float(data.get("p", data.get("price", 0)))
         size = float(data.get("q", data.get("size", 0)))
         side = "sell" if data.get("m", True) else "buy"  # aggTrade: m true means buyer is maker
-        evt = self.normalize_trade({"price": price, "size": size, "side": side})
+        evt = self.normalize_trade({"price": price, "size": size, "side": side, "exchange_ts": data.get("T")})
         self.bus.publish(evt)
 
     def _handle_book(self, data: dict) -> None:
@@ -222,6 +222,7 @@ class BinanceProvider(ProviderBase):
                 "price": raw.get("price"),
                 "size": raw.get("size"),
                 "side": self._side_from_book(raw),
+                "exchange_ts": raw.get("exchange_ts"),
             },
         )
         if self.debug:
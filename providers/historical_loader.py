@@ -30,7 +30,7 @@ class HistoricalLoader:
     - JSON list of serialized MarketEvent-like dicts
     """
 
-    def __init__(self, event_bus: EventBus, source: str = "replay") -> None:
+    def __init__(self, event_bus: Optional[EventBus] = None, source: str = "replay") -> None:
         self.bus = event_bus
         self.source = source
         self.loaded_events: List[MarketEvent] = []
@@ -110,6 +110,8 @@ class HistoricalLoader:
         if not self.loaded_events:
             print("[HistoricalLoader] No events loaded.")
             return
+        if self.bus is None:
+            raise RuntimeError("HistoricalLoader.replay requires an EventBus")
 
         print(f"[HistoricalLoader] Starting replay: {len(self.loaded_events)} events...")
 
@@ -1,89 +1,143 @@
 from __future__ import annotations
 
 import time
-import uuid
-from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, List, Mapping, Optional, Sequence, Union
 
-from models.order import OrderRequest
-from models.risk import RiskDecision
+from models.order import OrderRequest, OrderSide
+from models.risk import RiskVerdict
+from risk.kill_switch import KillSwitch
+from risk.positions import PositionManager
+from risk.profile import RiskProfile, SymbolLimits
+from risk.rules import RateWindow, RiskRule, default_rules
+from telemetry.metrics import LatencyHistogram
+
+
+class _SymbolRisk:
+    """Per-symbol limits plus the throttle window (``throttle_max`` orders per ``throttle_window``)."""
+
+    __slots__ = ("limits", "throttle")
+
+    def __init__(self, limits: SymbolLimits, window: float) -> None:
+        self.limits = limits
+        self.throttle = RateWindow(limits.throttle_max, window)
 
 
 class RiskEngine:
     """
     Simple risk engine with whitelist, size, exposure, throttle, kill-switch.
+
+    ``limits`` is compiled once into a RiskProfile (or pass one, e.g. ``RiskProfile.load``
+    for limits.yaml plus settings.risk). Approvals take a single pass over the checks and
+    return a RiskVerdict whose RiskDecision is only built if someone reads it; a rejection
+    re-runs every check to report all reasons.
+
+    Orders that pass those limits go through ``rules``, an ordered chain (by default the
+    profile's price collar, daily max loss and message rate, see ``default_rules``) that
+    stops at the first hard reject. Every link, the built-in limits included (as
+    ``limits``), records its own latency histogram; see ``latency_stats`` (published by the
+    app in its ``metrics`` event).
+
+    The kill switch is a KillSwitch (a standalone one unless shared with the app's, which
+    also gates the bus and cancels working orders); rules that trip it engage it on reject.
+
+    With a PositionManager, exposure is its net position plus working orders: approvals are
+    reserved there and reconciled by fills, cancels and rejects. Without one, ``exposure``
+    just accumulates approvals.
     """
 
-    def __init__(self, limits: Dict[str, object]) -> None:
-        self.limits = limits
-        self.kill_switch_engaged = False
+    def __init__(
+        self,
+        limits: Union[Mapping[str, object], RiskProfile],
+        positions: Optional[PositionManager] = None,
+        rules: Optional[Sequence[RiskRule]] = None,
+        kill_switch: Optional[KillSwitch] = None,
+    ) -> None:
+        self.profile = limits if isinstance(limits, RiskProfile) else RiskProfile(limits)
+        self.limits = self.profile.raw
+        self.kill_switch = kill_switch if kill_switch is not None else KillSwitch()
         self.exposure: Dict[str, float] = {}
-        self.throttle_window = 60.0
-        self.throttle_max = int(limits.get("throttle_max", 30))
-        self._history: Dict[str, list[float]] = {}
+        self.positions = positions
+        self.throttle_window = self.profile.throttle_window
+        self.throttle_max = self.profile.default.throttle_max
+        self.rules: List[RiskRule] = list(rules) if rules is not None else default_rules(self.profile, positions)
+        self.limits_latency = LatencyHistogram()
+        self._state: Dict[str, _SymbolRisk] = {}
 
-    def engage_kill_switch(self) -> None:
-        self.kill_switch_engaged = True
+    @property
+    def kill_switch_engaged(self) -> bool:
+        return self.kill_switch.engaged
 
-    def reset_kill_switch(self) -> None:
-        self.kill_switch_engaged = False
+    def engage_kill_switch(self, reason: str = "risk") -> None:
+        self.kill_switch.engage(reason)
 
-    def _check_throttle(self, symbol: str) -> bool:
+    def reset_kill_switch(self) -> None:
+        self.kill_switch.reset()
+
+    def _symbol_state(self, symbol: str) -> _SymbolRisk:
+        state = self._state.get(symbol)
+        if state is None:
+            state = self._state[symbol] = _SymbolRisk(self.profile.limits_for(symbol), self.throttle_window)
+        return state
+
+    def evaluate(self, order: OrderRequest, account_ctx: Dict[str, float] | None = None) -> RiskVerdict:
+        symbol = order.symbol
+        state = self._state.get(symbol) or self._symbol_state(symbol)
+        limits = state.limits
+        qty = order.quantity
+        positions = self.positions
+        current = positions.exposure(symbol) if positions is not None else self.exposure.get(symbol, 0.0)
+        after = current + qty if order.side is OrderSide.BUY else current - qty
         now = time.time()
-        hist = self._history.setdefault(symbol, [])
-        hist[:] = [t for t in hist if now - t <= self.throttle_window]
-        allowed = len(hist) < self.throttle_max
-        if allowed:
-            hist.append(now)
-        return allowed
-
-    def evaluate(self, order: OrderRequest, account_ctx: Dict[str, float] | None = None) -> RiskDecision:
-        reasons: list[str] = []
-        approved = True
-
-        # kill switch
-        if self.kill_switch_engaged:
-            approved = False
+        t0 = time.perf_counter_ns()
+        passed = (
+            not self.kill_switch.engaged
+            and self.profile.allowed(symbol)
+            and qty <= limits.max_size
+            and abs(after) <= limits.max_exposure
+            and state.throttle.take(now)
+        )
+        t1 = time.perf_counter_ns()
+        self.limits_latency.record(t1 - t0)
+        if not passed:
+            return RiskVerdict(order.order_id, symbol, False, self._reasons(order, state, after, now), limits.table, now)
+        reasons: Optional[List[str]] = None
+        for rule in self.rules:
+            reason = rule.check(order, now)
+            t2 = time.perf_counter_ns()
+            rule.latency.record(t2 - t1)
+            t1 = t2
+            if reason is not None:
+                rule.rejected += 1
+                if rule.trips_kill_switch:
+                    self.kill_switch.engage(rule.name)
+                reasons = [reason] if reasons is None else reasons + [reason]
+                if rule.hard:
+                    break
+        if reasons:
+            return RiskVerdict(order.order_id, symbol, False, reasons, limits.table, now)
+        if positions is not None:
+            positions.reserve(order)
+        else:
+            self.exposure[symbol] = after
+        return RiskVerdict(order.order_id, symbol, True, (), limits.table, now)
+
+    def _reasons(self, order: OrderRequest, state: _SymbolRisk, after: float, now: float) -> List[str]:
+        reasons: List[str] = []
+        if self.kill_switch.engaged:
             reasons.append("kill_switch")
-
-        # symbol whitelist
-        symbols = self.limits.get("symbols", [])
-        if symbols and order.symbol not in symbols:
-            approved = False
+        if not self.profile.allowed(order.symbol):
             reasons.append("symbol_not_allowed")
-
-        # size limit
-        max_size = float(self.limits.get("max_size", float("inf")))
-        if order.quantity > max_size:
-            approved = False
+        if order.quantity > state.limits.max_size:
             reasons.append("size_limit")
-
-        # exposure
-        max_exposure = float(self.limits.get("max_exposure", float("inf")))
-        current = self.exposure.get(order.symbol, 0.0)
-        if abs(current + order.quantity) > max_exposure:
-            approved = False
+        if abs(after) > state.limits.max_exposure:
             reasons.append("exposure_limit")
-
-        # throttle
-        if not self._check_throttle(order.symbol):
-            approved = False
+        if not state.throttle.take(now):
             reasons.append("throttle_exceeded")
-
-        decision = RiskDecision(
-            decision_id=uuid.uuid4().hex,
-            timestamp=datetime.now(timezone.utc),
-            order_id=order.order_id,
-            symbol=order.symbol,
-            approved=approved,
-            reasons=reasons,
-            limits={
-                "max_size": max_size,
-                "max_exposure": max_exposure,
-                "throttle_max": self.throttle_max,
-            },
-        )
-
-        if approved:
-            self.exposure[order.symbol] = current + order.quantity * (1 if order.side.value == "buy" else -1)
-        return decision
+        return reasons
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-link latency (count, mean/p50/p99/max in microseconds), in chain order."""
+        stats = {"limits": self.limits_latency.snapshot()}
+        for rule in self.rules:
+            stats[rule.name] = {**rule.latency.snapshot(), "rejected": rule.rejected}
+        return stats
@@ -1,28 +1,142 @@
 from __future__ import annotations
 
 import logging
-from typing import Callable
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from core.event_bus import EventBus
+from core.timer import BusTimer
+from models.market_event import MarketEvent
+from telemetry.metrics import LatencyHistogram
 
 log = logging.getLogger(__name__)
 
+BLOCKED_TYPES = ("signal", "strategy_signal")
+
 
 class KillSwitch:
     """
     Simple kill switch that notifies listeners when engaged.
+
+    With a bus it also blocks ``signal``/``strategy_signal`` traffic there (orders never travel
+    on the bus), and with an ExecutionRouter it blocks new submissions and cancels every
+    working order in one batch, then times engage -> last working order done (``flatten_latency``, ``last_flatten_ms``)
+    as the router sees them finish. Triggers (``watch``, ``watch_health``, ``add_trigger``) are polled on
+    the ``kill_switch_check`` timer; RiskEngine engages it on rules that trip it. State
+    changes are published as ``kill_switch`` events.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        bus: Optional[EventBus] = None,
+        router=None,
+        check_seconds: float = 1.0,
+        blocked_types: Iterable[str] = BLOCKED_TYPES,
+    ) -> None:
         self.engaged = False
+        self.reason: Optional[str] = None
+        self.bus = bus
+        self.router = None
+        self.check_seconds = check_seconds
+        self.blocked_types = tuple(blocked_types)
+        self.flatten_latency = LatencyHistogram()
+        self.last_flatten_ms: Optional[float] = None
         self._listeners: list[Callable[[], None]] = []
+        self._triggers: Dict[str, Callable[[], bool]] = {}
+        self._pending: Set[str] = set()
+        self._awaiting = False
+        self._engaged_at = 0
+        self._lock = threading.Lock()
+        self._timer: Optional[BusTimer] = None
+        if router is not None:
+            self.attach(router)
+
+    def start(self) -> None:
+        if self.bus is None:
+            return
+        self.bus.subscribe("timer", self.on_timer)
+        if self._triggers and self.check_seconds > 0:
+            self._timer = BusTimer(self.bus, "kill_switch_check", self.check_seconds)
+            self._timer.start()
+
+    def stop(self) -> None:
+        if self._timer:
+            self._timer.stop()
+            self._timer = None
+        if self.bus is not None:
+            self.bus.unsubscribe("timer", self.on_timer)
+
+    def attach(self, router) -> None:
+        """Bind the ExecutionRouter to flatten (e.g. after engines are rebuilt); keeps it blocked if engaged."""
+        self.router = router
+        router.blocked = self.engaged
+        router.on_finished.append(self._finished)
 
     def register(self, fn: Callable[[], None]) -> None:
         self._listeners.append(fn)
 
-    def engage(self) -> None:
+    # ------------------------------------------------------------------ triggers
+    def add_trigger(self, name: str, fired: Callable[[], bool]) -> None:
+        self._triggers[name] = fired
+
+    def watch(self, watchdogs, names: Iterable[str], armed: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Engage when a Watchdogs heartbeat goes stale (only once it has been seen at all, and
+        only while ``armed()`` if given, e.g. while orders are working).
+        """
+        for name in names:
+            self.add_trigger(
+                f"stale:{name}",
+                lambda name=name: (armed is None or armed()) and name in watchdogs.last_seen and watchdogs.is_stale(name),
+            )
+
+    def working(self) -> bool:
+        """True while the attached router has working orders (an ``armed`` condition for ``watch``)."""
+        return self.router is not None and bool(self.router.working_ids())
+
+    def watch_health(self, health, max_age: float = 5.0, name: str = "ibkr") -> None:
+        """Engage when IBKRHealth ``is_stale`` after ticks or depth have started flowing."""
+        self.add_trigger(
+            f"stale:{name}", lambda: (health.last_tick_ts > 0 or health.last_dom_ts > 0) and health.is_stale(max_age)
+        )
+
+    def check(self) -> Optional[str]:
+        """Poll the triggers; engage on the first that fires and return its name."""
+        if self.engaged:
+            return None
+        for name, fired in self._triggers.items():
+            try:
+                if fired():
+                    self.engage(name)
+                    return name
+            except Exception:  # pragma: no cover - defensive
+                log.exception("Kill-switch trigger %s failed", name)
+        return None
+
+    def on_timer(self, evt: MarketEvent) -> None:
+        if evt.payload.get("name") == "kill_switch_check":
+            self.check()
+
+    # ------------------------------------------------------------------ state
+    def engage(self, reason: str = "manual") -> None:
         if self.engaged:
             return
         self.engaged = True
-        log.error("[RISK] Kill-switch engaged, notifying listeners.")
+        self.reason = reason
+        self._engaged_at = time.perf_counter_ns()
+        log.error("[RISK] Kill-switch engaged (%s), notifying listeners.", reason)
+        if self.bus is not None:
+            self.bus.block(self.blocked_types)
+        if self.router is not None:
+            with self._lock:
+                self._pending = set(self.router.block())
+                self._awaiting = True
+        self._publish({"state": "engaged", "reason": reason, "working": len(self._pending)})
+        if self.router is not None:
+            self.router.cancel_all()
+            self._finished(None)  # flat already if nothing was working or it all finished meanwhile
         for fn in self._listeners:
             try:
                 fn()
@@ -31,3 +145,42 @@ class KillSwitch:
 
     def reset(self) -> None:
         self.engaged = False
+        self.reason = None
+        with self._lock:
+            self._pending.clear()
+            self._awaiting = False
+        if self.bus is not None:
+            self.bus.unblock(self.blocked_types)
+        if self.router is not None:
+            self.router.blocked = False
+        self._publish({"state": "reset"})
+
+    def _finished(self, order_id: Optional[str]) -> None:
+        with self._lock:
+            if not self._awaiting:
+                return
+            self._pending.discard(order_id)
+            if self._pending:
+                return
+            self._awaiting = False
+        self._flat()
+
+    def _flat(self) -> None:
+        elapsed = time.perf_counter_ns() - self._engaged_at
+        self.flatten_latency.record(elapsed)
+        self.last_flatten_ms = elapsed / 1e6
+        log.error("[RISK] Kill-switch: all working orders done in %.3f ms", self.last_flatten_ms)
+        self._publish({"state": "flat", "latency_ms": self.last_flatten_ms})
+
+    def _publish(self, payload: Dict[str, object]) -> None:
+        if self.bus is None:
+            return
+        self.bus.publish(
+            MarketEvent(
+                event_type="kill_switch",
+                timestamp=datetime.now(timezone.utc),
+                source="risk",
+                symbol="",
+                payload=payload,
+            )
+        )
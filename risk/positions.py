@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from core.event_bus import EventBus
+from core.timer import BusTimer
+from models.market_event import MarketEvent
+from models.order import OrderRequest, OrderSide, OrderStatus
+
+log = logging.getLogger(__name__)
+
+_FILLS = (OrderStatus.PARTIAL.value, OrderStatus.FILL.value)
+_DONE = (OrderStatus.FILL.value, OrderStatus.CANCEL.value, OrderStatus.REJECT.value, OrderStatus.ERROR.value)
+
+
+class Position:
+    """Net position of one symbol; ``working`` is the signed quantity approved but not yet filled."""
+
+    __slots__ = ("symbol", "qty", "avg_price", "realized", "unrealized", "working", "mark")
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self.qty = 0.0
+        self.avg_price = 0.0
+        self.realized = 0.0
+        self.unrealized = 0.0
+        self.working = 0.0
+        self.mark: Optional[float] = None
+
+    def apply_fill(self, qty: float, price: float) -> None:
+        """``qty`` signed (buy > 0). Closing quantity realizes against the average price."""
+        held = self.qty
+        if held == 0 or (held > 0) == (qty > 0):
+            total = abs(held) + abs(qty)
+            self.avg_price = (self.avg_price * abs(held) + price * abs(qty)) / total
+            self.qty = held + qty
+            return
+        closed = min(abs(qty), abs(held))
+        self.realized += closed * (price - self.avg_price) * (1 if held > 0 else -1)
+        self.qty = held + qty
+        if self.qty == 0:
+            self.avg_price = 0.0
+        elif (self.qty > 0) != (held > 0):
+            self.avg_price = price  # flipped: the rest opens at the fill price
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "qty": self.qty,
+            "avg_price": self.avg_price,
+            "realized": self.realized,
+            "unrealized": self.unrealized,
+            "working": self.working,
+            "mark": self.mark,
+        }
+
+
+class PositionManager:
+    """
+    Per-symbol positions and PnL from ``order_event`` fills.
+
+    RiskEngine reserves approved orders (``reserve``) so exposure counts them as working;
+    fills move that quantity into the position (O(1) per fill) and cancels, rejects or the
+    final fill release what is left. Fills are reconciled against the cumulative filled
+    quantity per order (``raw["cum_qty"]`` when the adapter reports per-fill sizes, otherwise
+    ``filled_qty`` as IBKR reports it), so repeated statuses apply nothing twice; fills without
+    a positive price (plain SIM market orders) are booked at the symbol's latest mid.
+
+    Quotes only record the latest mid per symbol (also the price collar's reference);
+    unrealized PnL is marked for all symbols on the ``positions_mark`` timer, which also
+    publishes a ``position_update`` event and rolls the daily baseline at UTC midnight
+    (``pnl_today``). PnL is in price units times quantity (no contract multiplier).
+    """
+
+    def __init__(self, bus: EventBus, mark_seconds: float = 1.0) -> None:
+        self.bus = bus
+        self.mark_seconds = mark_seconds
+        self.positions: Dict[str, Position] = {}
+        self.mids: Dict[str, float] = {}  # latest mid per symbol, any symbol
+        self._day = int(time.time() // 86400)
+        self._day_start = 0.0  # PnL at the last UTC midnight (or session start)
+        self._orders: Dict[str, list] = {}  # order_id -> [symbol, sign, working qty, filled qty, filled notional]
+        self._timer: Optional[BusTimer] = None
+
+    def start(self) -> None:
+        self.bus.subscribe("order_event", self.on_order_event)
+        self.bus.subscribe("tick", self.on_tick)
+        self.bus.subscribe("microstructure", self.on_microstructure)
+        self._subs = {"order_event": self.on_order_event, "tick": self.on_tick, "microstructure": self.on_microstructure}
+        if self.mark_seconds > 0:
+            self.bus.subscribe("timer", self.on_timer)
+            self._subs["timer"] = self.on_timer
+            self._timer = BusTimer(self.bus, "positions_mark", self.mark_seconds)
+            self._timer.start()
+
+    def stop(self) -> None:
+        if self._timer:
+            self._timer.stop()
+            self._timer = None
+        for et, handler in getattr(self, "_subs", {}).items():
+            self.bus.unsubscribe(et, handler)
+
+    def position(self, symbol: str) -> Position:
+        pos = self.positions.get(symbol)
+        if pos is None:
+            pos = self.positions[symbol] = Position(symbol)
+        return pos
+
+    def exposure(self, symbol: str) -> float:
+        pos = self.positions.get(symbol)
+        return pos.qty + pos.working if pos is not None else 0.0
+
+    def reserve(self, order: OrderRequest) -> None:
+        sign = 1.0 if order.side is OrderSide.BUY else -1.0
+        self._orders[order.order_id] = [order.symbol, sign, order.quantity, 0.0, 0.0]
+        self.position(order.symbol).working += sign * order.quantity
+
+    # ------------------------------------------------------------------ events
+    def on_order_event(self, evt: MarketEvent) -> None:
+        payload = evt.payload or {}
+        status = payload.get("status")
+        status = getattr(status, "value", status)
+        order_id = payload.get("order_id")
+        entry = self._orders.get(order_id)
+        if entry is None:
+            if status in _FILLS:
+                log.warning("[Positions] fill for unknown order %s ignored", order_id)
+            return
+        symbol, sign, working, filled, notional = entry
+        pos = self.position(symbol)
+        if status in _FILLS:
+            raw = payload.get("raw") or {}
+            per_fill = "cum_qty" in raw  # SIM matching: per-fill size and price, cumulative in raw
+            # IBKR and the plain adapters: cumulative size at the cumulative average
+            cum = float(raw["cum_qty"]) if per_fill else float(payload.get("filled_qty") or 0.0)
+            new = cum - filled
+            qty = min(new, working)
+            if qty > 0:
+                price = float(payload.get("avg_price") or 0.0)
+                if price <= 0:  # plain SIM market orders report no price: book at the reference
+                    fill_notional = self._reference(symbol, pos) * new
+                elif per_fill:
+                    fill_notional = price * new
+                else:
+                    fill_notional = price * cum - notional
+                pos.apply_fill(sign * qty, fill_notional / new)
+                pos.working -= sign * qty
+                entry[2] = working = working - qty
+                entry[3] = cum
+                entry[4] = notional + fill_notional
+        if status in _DONE:
+            pos.working -= sign * working
+            del self._orders[order_id]
+
+    def _reference(self, symbol: str, pos: Position) -> float:
+        """Price for a fill reported without one: latest mid, else last mark, else the average."""
+        price = self.mids.get(symbol, pos.mark)
+        if price is None:
+            log.warning("[Positions] unpriced fill on %s with no reference; booked at the average price", symbol)
+            return pos.avg_price
+        return price
+
+    def on_tick(self, evt: MarketEvent) -> None:
+        mid = evt.payload.get("mid") or evt.payload.get("price") or evt.payload.get("last")
+        if mid is not None:
+            self.mids[evt.symbol] = float(mid)
+
+    def on_microstructure(self, evt: MarketEvent) -> None:
+        mid = (evt.payload.get("snapshot") or {}).get("mid")
+        if mid is not None:
+            self.mids[evt.symbol] = float(mid)
+
+    def on_timer(self, evt: MarketEvent) -> None:
+        if evt.payload.get("name") == "positions_mark":
+            self.mark_to_market()
+
+    def roll_day(self, now: Optional[float] = None) -> None:
+        """Snapshot the PnL baseline when the UTC day changes (checked on every mark)."""
+        day = int((time.time() if now is None else now) // 86400)
+        if day != self._day:
+            self._day, self._day_start = day, self.pnl()
+
+    def pnl_today(self) -> float:
+        """PnL since the last UTC midnight, or since the session started if later."""
+        self.roll_day()
+        return self.pnl() - self._day_start
+
+    def mark_to_market(self) -> Dict[str, Dict[str, float]]:
+        self.roll_day()  # before marking: the baseline is the PnL at the last mark before midnight
+        for symbol, pos in self.positions.items():
+            pos.mark = self.mids.get(symbol, pos.mark)
+            if pos.mark is not None:
+                pos.unrealized = (pos.mark - pos.avg_price) * pos.qty if pos.qty else 0.0
+        snapshot = self.snapshot()
+        self.bus.publish(
+            MarketEvent(
+                event_type="position_update",
+                timestamp=datetime.now(timezone.utc),
+                source="risk",
+                symbol="",
+                payload={"positions": snapshot, "realized": self.realized(), "unrealized": self.unrealized()},
+            )
+        )
+        return snapshot
+
+    def mid(self, symbol: str) -> Optional[float]:
+        return self.mids.get(symbol)
+
+    def pnl(self) -> float:
+        """Realized plus unrealized as of the last mark."""
+        return self.realized() + self.unrealized()
+
+    def realized(self) -> float:
+        return sum(pos.realized for pos in self.positions.values())
+
+    def unrealized(self) -> float:
+        return sum(pos.unrealized for pos in self.positions.values())
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {symbol: pos.as_dict() for symbol, pos in self.positions.items()}
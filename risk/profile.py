@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, FrozenSet, Mapping, Optional
+
+import yaml
+
+DEFAULT_LIMITS_PATH = os.path.join(os.path.dirname(__file__), "limits.yaml")
+
+_INF = float("inf")
+
+
+def _optional(cfg: Mapping[str, Any], key: str) -> Optional[float]:
+    return float(cfg[key]) if cfg.get(key) is not None else None
+
+
+class SymbolLimits:
+    """Limits for one symbol, already converted to numbers."""
+
+    __slots__ = ("max_size", "max_exposure", "throttle_max", "table")
+
+    def __init__(self, max_size: float, max_exposure: float, throttle_max: int) -> None:
+        self.max_size = max_size
+        self.max_exposure = max_exposure
+        self.throttle_max = throttle_max
+        # what RiskDecision.limits reports, built once
+        self.table: Dict[str, float] = {"max_size": max_size, "max_exposure": max_exposure, "throttle_max": throttle_max}
+
+
+class RiskProfile:
+    """
+    Risk limits parsed once: the whitelist as a frozenset, numeric defaults and a per-symbol
+    table (``per_symbol: {ES: {max_size: ..}}`` overrides the defaults for that symbol), so
+    RiskEngine does no parsing or dict walking per order.
+    """
+
+    def __init__(self, limits: Mapping[str, Any]) -> None:
+        self.raw: Dict[str, Any] = dict(limits)
+        self.symbols: FrozenSet[str] = frozenset(limits.get("symbols") or ())
+        self.throttle_window = float(limits.get("throttle_window", 60.0))
+        self.collar_bps = _optional(limits, "collar_bps")
+        self.daily_max_loss = _optional(limits, "daily_max_loss")
+        max_msgs = _optional(limits, "max_msgs_per_sec")
+        self.max_msgs_per_sec: Optional[int] = int(max_msgs) if max_msgs is not None else None
+        self.msg_rate_kill_switch = bool(limits.get("msg_rate_kill_switch", False))
+        self.default = self._limits(limits)
+        self.per_symbol: Dict[str, SymbolLimits] = {
+            symbol: self._limits({**limits, **(overrides or {})}) for symbol, overrides in (limits.get("per_symbol") or {}).items()
+        }
+
+    @staticmethod
+    def _limits(cfg: Mapping[str, Any]) -> SymbolLimits:
+        return SymbolLimits(
+            float(cfg.get("max_size", _INF)),
+            float(cfg.get("max_exposure", _INF)),
+            int(cfg.get("throttle_max", 30)),
+        )
+
+    @classmethod
+    def load(cls, overrides: Optional[Mapping[str, Any]] = None, path: str = DEFAULT_LIMITS_PATH) -> "RiskProfile":
+        """``limits.yaml`` with ``settings.risk`` on top."""
+        base: Dict[str, Any] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                base = yaml.safe_load(f) or {}
+        return cls({**base, **(overrides or {})})
+
+    def allowed(self, symbol: str) -> bool:
+        return not self.symbols or symbol in self.symbols
+
+    def limits_for(self, symbol: str) -> SymbolLimits:
+        return self.per_symbol.get(symbol, self.default)
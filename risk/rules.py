@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
 from models.order import OrderRequest
+from risk.profile import RiskProfile
+from telemetry.metrics import LatencyHistogram
 
 
 def within_price_collar(order: OrderRequest, reference_price: float, collar_bps: float) -> bool:
@@ -8,3 +13,112 @@ def within_price_collar(order: OrderRequest, reference_price: float, collar_bps:
         return True
     diff_bps = abs(order.limit_price - reference_price) / max(reference_price, 1e-9) * 10000
     return diff_bps <= collar_bps
+
+
+class RateWindow:
+    """
+    At most ``max_events`` per ``window`` seconds: a ring with the times of the last
+    ``max_events`` accepted events, so the slot about to be overwritten is the oldest one and a
+    single comparison decides.
+    """
+
+    __slots__ = ("ring", "head", "window")
+
+    def __init__(self, max_events: int, window: float) -> None:
+        self.ring: List[float] = [float("-inf")] * max(0, int(max_events))
+        self.head = 0
+        self.window = window
+
+    def take(self, now: float) -> bool:
+        ring = self.ring
+        if not ring or now - ring[self.head] <= self.window:
+            return False
+        ring[self.head] = now
+        self.head = (self.head + 1) % len(ring)
+        return True
+
+
+class RiskRule(ABC):
+    """
+    One link of RiskEngine's rule chain. ``check`` returns a reject reason or None; a ``hard``
+    reject stops the chain, a soft one is reported but later rules still run. A reject from a
+    rule with ``trips_kill_switch`` also engages the engine's KillSwitch.
+    """
+
+    name = "rule"
+    hard = True
+    trips_kill_switch = False
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.rejected = 0
+
+    @abstractmethod
+    def check(self, order: OrderRequest, now: float) -> Optional[str]:
+        ...
+
+
+class PriceCollarRule(RiskRule):
+    """Limit price within ``collar_bps`` of the live reference (no reference yet: pass)."""
+
+    name = "price_collar"
+
+    def __init__(self, collar_bps: float, reference: Callable[[str], Optional[float]]) -> None:
+        super().__init__()
+        self.collar_bps = collar_bps
+        self.reference = reference
+
+    def check(self, order: OrderRequest, now: float) -> Optional[str]:
+        if order.limit_price is None:
+            return None
+        ref = self.reference(order.symbol)
+        if ref is None or within_price_collar(order, ref, self.collar_bps):
+            return None
+        return "price_collar"
+
+
+class DailyLossRule(RiskRule):
+    """
+    Blocks new orders once ``pnl_today`` (PositionManager: PnL since the UTC midnight
+    baseline, snapshotted on its mark timer, not by order flow) is down ``max_loss``.
+    """
+
+    name = "daily_max_loss"
+    trips_kill_switch = True
+
+    def __init__(self, max_loss: float, pnl_today: Callable[[], float]) -> None:
+        super().__init__()
+        self.max_loss = abs(max_loss)
+        self.pnl_today = pnl_today
+
+    def check(self, order: OrderRequest, now: float) -> Optional[str]:
+        return "daily_max_loss" if self.pnl_today() <= -self.max_loss else None
+
+
+class MessageRateRule(RiskRule):
+    """
+    At most ``max_per_second`` orders per second across all symbols. A burst is only rejected
+    unless ``trips_kill_switch`` (a runaway strategy then halts the session until reset).
+    """
+
+    name = "message_rate"
+
+    def __init__(self, max_per_second: int, trips_kill_switch: bool = False) -> None:
+        super().__init__()
+        self.window = RateWindow(max_per_second, 1.0)
+        self.trips_kill_switch = trips_kill_switch
+
+    def check(self, order: OrderRequest, now: float) -> Optional[str]:
+        return None if self.window.take(now) else "message_rate"
+
+
+def default_rules(profile: RiskProfile, positions=None) -> List[RiskRule]:
+    """Rules enabled by the profile: collar and daily loss need a PositionManager for prices/PnL."""
+    rules: List[RiskRule] = []
+    if profile.collar_bps is not None and positions is not None:
+        rules.append(PriceCollarRule(profile.collar_bps, positions.mid))
+    if profile.daily_max_loss is not None and positions is not None:
+        rules.append(DailyLossRule(profile.daily_max_loss, positions.pnl_today))
+    if profile.max_msgs_per_sec is not None:
+        rules.append(MessageRateRule(profile.max_msgs_per_sec, profile.msg_rate_kill_switch))
+    return rules
@@ -12,11 +12,15 @@ from engines.footprint import FootprintEngine
 from engines.strategy import MicroPriceMomentumStrategy
 from engines.tape import TapeEngine
 from execution.adapters.sim import SimAdapter
+from execution.latency import build_profiles
 from execution.router import ExecutionRouter
 from models.market_event import MarketEvent
 from models.order import OrderRequest, OrderSide, OrderType
 from providers.historical_loader import HistoricalLoader
 from risk.engine import RiskEngine
+from risk.kill_switch import KillSwitch
+from risk.positions import PositionManager
+from risk.profile import RiskProfile
 
 
 def build_order_from_signal(signal_evt: MarketEvent, default_qty: float = 1.0) -> OrderRequest:
@@ -52,23 +56,33 @@ def main(argv):
     strategy = MicroPriceMomentumStrategy(bus, settings.symbols, threshold=0.0)
     strategy.on_start()
 
-    risk_engine = RiskEngine(settings.risk_limits)
-    adapter = SimAdapter(bus)
+    positions = PositionManager(bus, mark_seconds=float(settings.risk_limits.get("mark_seconds", 1.0)))
+    positions.start()
+    kill_switch = KillSwitch(bus)
+    kill_switch.start()
+    risk_engine = RiskEngine(RiskProfile.load(settings.risk_limits), positions=positions, kill_switch=kill_switch)
+    adapter = SimAdapter(
+        bus,
+        matching=bool(settings.execution.get("sim_matching", False)),
+        latency_ms=float(settings.execution.get("sim_latency_ms", 0.0)),
+        latency=build_profiles(settings.execution["sim_latency"]) if settings.execution.get("sim_latency") else None,
+    )
     router = ExecutionRouter(bus, adapter)
+    kill_switch.attach(router)
 
     def on_signal(evt: MarketEvent) -> None:
         order = build_order_from_signal(evt, default_qty=settings.execution.get("default_qty", 1.0))
-        decision = risk_engine.evaluate(order, account_ctx={})
+        verdict = risk_engine.evaluate(order, account_ctx={})
         bus.publish(
             MarketEvent(
                 event_type="risk_decision",
-                timestamp=decision.timestamp,
+                timestamp=verdict.timestamp,
                 source="risk",
                 symbol=order.symbol,
-                payload=decision.model_dump(),
+                payload=verdict.as_dict(),  # plain fields: no RiskDecision built per signal
             )
         )
-        if decision.approved:
+        if verdict.approved:
             router.submit(order)
 
     bus.subscribe("signal", on_signal)
@@ -79,6 +93,8 @@ def main(argv):
     else:
         loader.load_csv(args.file)
     loader.replay(speed=args.speed or settings.replay.get("speed", 1.0))
+    kill_switch.stop()
+    positions.stop()
     bus.stop()
     return 0
 
@@ -2,16 +2,29 @@ from __future__ import annotations
 
 from typing import Dict, List
 
+import numpy as np
+
+from engines.microstructure.features import FEATURE_SCHEMA, FeatureSchema, as_vector
+
 
 class ConfluenceFramework:
     """
     Applies additional filters (volatility regime, liquidity signals, tags).
     """
 
-    def validate(self, snapshot: Dict, features: Dict[str, float], tags: List[str]) -> bool:
-        vol = features.get("volatility", 0.0)
-        if vol and vol > 5.0:
+    def __init__(self, schema: FeatureSchema = FEATURE_SCHEMA, max_volatility: float = 5.0) -> None:
+        self.schema = schema
+        self.max_volatility = max_volatility
+        self._volatility = schema.index("volatility")
+        self._spoof = schema.index("liq_spoof")
+
+    def validate(self, snapshot: Dict, features, tags: List[str]) -> bool:
+        vec = as_vector(features, tags, self.schema)
+        if vec[self._volatility] > self.max_volatility:
             return False
-        if features.get("liq_spoof", 0.0) > 0:
+        if vec[self._spoof] > 0:
             return False
         return True
+
+    def validate_batch(self, matrix: np.ndarray) -> np.ndarray:
+        return (matrix[:, self._volatility] <= self.max_volatility) & (matrix[:, self._spoof] <= 0)
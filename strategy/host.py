@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import functools
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, DefaultDict, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.event_bus import EventBus
+from models.market_event import MarketEvent
+
+log = logging.getLogger(__name__)
+
+Callback = Callable[[MarketEvent], None]
+
+_STOP = None
+_STATS_EVERY_S = 0.25  # idle interval after which a process worker reports stats
+
+
+class WorkerStats:
+    """Per-worker counters: events handled, dropped on a full queue, wait and handler time."""
+
+    __slots__ = ("processed", "dropped", "errors", "wait_ns", "max_wait_ns", "busy_ns", "max_busy_ns")
+
+    def __init__(self) -> None:
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.wait_ns = 0
+        self.max_wait_ns = 0
+        self.busy_ns = 0
+        self.max_busy_ns = 0
+
+    def record(self, wait_ns: int, busy_ns: int) -> None:
+        self.processed += 1
+        self.wait_ns += wait_ns
+        self.busy_ns += busy_ns
+        if wait_ns > self.max_wait_ns:
+            self.max_wait_ns = wait_ns
+        if busy_ns > self.max_busy_ns:
+            self.max_busy_ns = busy_ns
+
+    def update(self, values: Dict[str, int]) -> None:
+        for key in ("processed", "errors", "wait_ns", "max_wait_ns", "busy_ns", "max_busy_ns"):
+            setattr(self, key, values[key])
+
+    def state(self) -> Dict[str, int]:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def as_dict(self) -> Dict[str, float]:
+        n = self.processed or 1
+        return {
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "mean_wait_us": self.wait_ns / n / 1000.0 if self.processed else 0.0,
+            "max_wait_us": self.max_wait_ns / 1000.0,
+            "mean_us": self.busy_ns / n / 1000.0 if self.processed else 0.0,
+            "max_us": self.max_busy_ns / 1000.0,
+        }
+
+
+class WorkerBus:
+    """
+    Bus stand-in handed to a hosted strategy: records its subscriptions and forwards whatever
+    it publishes, so existing strategies run unchanged inside a worker. ``timer`` events the
+    strategy publishes itself (its BusTimers) go to ``loopback`` instead, i.e. back into its
+    own worker queue, so they are handled on the worker thread and never reach the real bus.
+    """
+
+    def __init__(self, emit: Callback, loopback: Optional[Callback] = None) -> None:
+        self._emit = emit
+        self._loopback = loopback
+        self._subscribers: DefaultDict[str, List[Callback]] = defaultdict(list)
+        self.errors = 0
+
+    def subscribe(self, event_type: str | Iterable[str], callback: Callback) -> None:
+        for et in [event_type] if isinstance(event_type, str) else event_type:
+            self._subscribers[et].append(callback)
+
+    def unsubscribe(self, event_type: str | Iterable[str], callback: Callback) -> None:
+        for et in [event_type] if isinstance(event_type, str) else event_type:
+            if callback in self._subscribers.get(et, ()):
+                self._subscribers[et].remove(callback)
+
+    def publish(self, event: MarketEvent) -> None:
+        if self._loopback is not None and event.event_type == "timer":
+            self._loopback(event)
+        else:
+            self._emit(event)
+
+    def dispatch(self, event: MarketEvent) -> None:
+        for callback in self._subscribers.get(event.event_type, []) + self._subscribers.get("*", []):
+            try:
+                callback(event)
+            except Exception:
+                self.errors += 1
+                log.exception("[StrategyHost] callback failed event_type=%s", event.event_type)
+
+
+def _build_per_worker(cls: Callable, factories: Dict[str, Callable[[], Any]], bus, *args):
+    return cls(bus, *args, **{key: make() for key, make in factories.items()})
+
+
+def per_worker(cls: Callable, **factories: Callable[[], Any]) -> Callable:
+    """
+    Strategy factory for ``StrategyHost.add`` that calls each of ``factories`` inside every
+    worker, so each partition gets its own ``gate=``, ``playbook=`` ... instead of one instance
+    shared across threads. Picklable (process mode) when ``cls`` and the factories are.
+    """
+    return functools.partial(_build_per_worker, cls, factories)
+
+
+def _serve(factory: Callable, args: Tuple, inbox, emit: Callback, stats: WorkerStats, report: Optional[Callable] = None) -> None:
+    """
+    Worker loop shared by thread and process workers: build, start, drain ``inbox``, stop.
+    ``report(state, gate)`` gets the counters and the strategy's SignalGate stats (if any)
+    after every idle spell or 256 events, from the worker itself.
+    """
+
+    def loopback(event: MarketEvent) -> None:
+        try:
+            inbox.put_nowait((time.monotonic_ns(), event))
+        except queue.Full:
+            stats.dropped += 1
+
+    bus = WorkerBus(emit, loopback)
+    strategy = factory(bus, *args)
+    gate = getattr(strategy, "gate", None)
+    gate_stats = gate.stats if hasattr(gate, "stats") else lambda: None
+    start = getattr(strategy, "start", None) or getattr(strategy, "on_start", None)
+    if start:
+        start()
+    reported = 0
+    try:
+        while True:
+            try:
+                item = inbox.get(timeout=_STATS_EVERY_S)
+            except queue.Empty:
+                item = ()
+            if item is _STOP:
+                break
+            if item:
+                enqueued_ns, event = item
+                # monotonic_ns is CLOCK_MONOTONIC on Linux, comparable across processes
+                begin = time.monotonic_ns()
+                bus.dispatch(event)
+                end = time.monotonic_ns()
+                stats.record(begin - enqueued_ns, end - begin)
+                stats.errors = bus.errors
+            if report and stats.processed != reported and (not item or stats.processed % 256 == 0):
+                reported = stats.processed
+                report(stats.state(), gate_stats())
+    finally:
+        stop = getattr(strategy, "stop", None) or getattr(strategy, "on_stop", None)
+        if stop:
+            stop()
+        if report:
+            report(stats.state(), gate_stats())
+
+
+def _process_main(factory: Callable, args: Tuple, inbox, outbox) -> None:
+    _serve(
+        factory,
+        args,
+        inbox,
+        lambda evt: outbox.put(("event", evt)),
+        WorkerStats(),
+        lambda state, gate: outbox.put(("stats", (state, gate))),
+    )
+    outbox.put(("done", None))
+
+
+class _Worker:
+    def __init__(self, name: str, queue_size: int) -> None:
+        self.name = name
+        self.queue_size = queue_size
+        self.stats = WorkerStats()
+        self.gate: Optional[Dict[str, Any]] = None  # last SignalGate stats reported by the worker
+        self.inbox = None
+
+    def submit(self, event: MarketEvent) -> None:
+        try:
+            self.inbox.put_nowait((time.monotonic_ns(), event))
+        except queue.Full:
+            self.stats.dropped += 1
+
+    def depth(self) -> int:
+        try:
+            return self.inbox.qsize()
+        except NotImplementedError:  # pragma: no cover - macOS multiprocessing queues
+            return -1
+
+
+class _ThreadWorker(_Worker):
+    def __init__(self, name: str, factory: Callable, args: Tuple, bus: EventBus, queue_size: int) -> None:
+        super().__init__(name, queue_size)
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=_serve,
+            args=(factory, args, self.inbox, bus.publish, self.stats, self._report),
+            name=f"strategy-{name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _report(self, state: Dict[str, int], gate: Optional[Dict[str, Any]]) -> None:
+        self.gate = gate  # ``stats`` is shared with the worker thread already
+
+    def stop(self, timeout: float) -> None:
+        try:
+            self.inbox.put(_STOP, timeout=timeout)
+        except queue.Full:
+            log.warning("[StrategyHost] %s queue full on stop; abandoning worker", self.name)
+        self._thread.join(timeout=timeout)
+
+
+class _ProcessWorker(_Worker):
+    def __init__(self, name: str, factory: Callable, args: Tuple, bus: EventBus, queue_size: int) -> None:
+        super().__init__(name, queue_size)
+        ctx = mp.get_context("spawn")  # the parent runs threads; never fork it
+        self.inbox = ctx.Queue(maxsize=queue_size)
+        self._outbox = ctx.Queue()
+        self._bus = bus
+        self._process = ctx.Process(
+            target=_process_main, args=(factory, args, self.inbox, self._outbox), name=f"strategy-{name}", daemon=True
+        )
+        self._process.start()
+        self._done = threading.Event()
+        self._reader = threading.Thread(target=self._read, name=f"strategy-{name}-reader", daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        while not self._done.is_set():
+            try:
+                kind, item = self._outbox.get(timeout=0.1)
+            except queue.Empty:
+                if not self._process.is_alive():
+                    break
+                continue
+            if kind == "event":
+                self._bus.publish(item)
+            elif kind == "stats":
+                state, self.gate = item
+                self.stats.update(state)
+            else:
+                break
+
+    def stop(self, timeout: float) -> None:
+        try:
+            self.inbox.put(_STOP, timeout=timeout)
+        except queue.Full:
+            log.warning("[StrategyHost] %s queue full on stop; terminating", self.name)
+        self._process.join(timeout=timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=timeout)
+        self._reader.join(timeout=timeout)
+        self._done.set()
+
+
+class StrategyHost:
+    """
+    Runs strategies off the bus dispatch thread.
+
+    ``add`` registers a strategy factory with the event types it consumes. The factory is
+    called as ``factory(bus)`` (or ``factory(bus, symbols)`` per partition) inside its worker,
+    with a WorkerBus standing in for the real one; whatever the strategy publishes is
+    republished on the real bus. ``mode="thread"`` suits I/O-light strategies, ``"process"``
+    sidesteps the GIL for CPU-heavy ones (factory and events must then be picklable).
+
+    The host's own bus callback only routes: events are copied into each worker's bounded
+    queue without blocking, and a full queue drops the event and counts it. With
+    ``partitions`` each symbol group gets its own worker; symbol-less events go to every
+    partition. Timers a hosted strategy starts stay inside its worker (see WorkerBus), so
+    there is no need to route ``timer`` to it, which would hand every partition every other
+    partition's timers and the bus-wide flush ticks as well. ``metrics()`` reports per-worker queue depth, drops, queue wait
+    and handler time, plus the ``gate`` stats each worker last reported for its strategy's
+    SignalGate (use ``per_worker`` so partitions do not share one gate).
+    """
+
+    MODES = ("thread", "process")
+
+    def __init__(self, bus: EventBus, queue_size: int = 1000) -> None:
+        self.bus = bus
+        self.queue_size = queue_size
+        self.workers: Dict[str, _Worker] = {}
+        self._routes: DefaultDict[str, List[Tuple[Optional[Dict[str, _Worker]], List[_Worker]]]] = defaultdict(list)
+        self._subs: Tuple[str, ...] = ()
+
+    def add(
+        self,
+        name: str,
+        factory: Callable,
+        event_types: Sequence[str],
+        mode: str = "thread",
+        partitions: Optional[Sequence[Sequence[str]]] = None,
+        queue_size: Optional[int] = None,
+    ) -> List[str]:
+        """Start the worker(s) for one strategy; returns the worker names."""
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}")
+        if any(key == name or key.startswith(f"{name}[") for key in self.workers):
+            raise ValueError(f"Strategy already hosted: {name}")
+        worker_cls = _ThreadWorker if mode == "thread" else _ProcessWorker
+        size = queue_size or self.queue_size
+        if partitions is None:
+            workers = [worker_cls(name, factory, (), self.bus, size)]
+            by_symbol = None
+        else:
+            workers, by_symbol = [], {}
+            for part in partitions:
+                symbols = list(part)
+                worker = worker_cls(f"{name}[{','.join(symbols)}]", factory, (symbols,), self.bus, size)
+                workers.append(worker)
+                by_symbol.update({s: worker for s in symbols})
+        for worker in workers:
+            self.workers[worker.name] = worker
+        for et in event_types:
+            if et not in self._routes:
+                self.bus.subscribe(et, self.on_event)
+                self._subs += (et,)
+            self._routes[et].append((by_symbol, workers))
+        return [w.name for w in workers]
+
+    def on_event(self, evt: MarketEvent) -> None:
+        for by_symbol, workers in self._routes.get(evt.event_type, ()):
+            if by_symbol is None or not evt.symbol:
+                for worker in workers:
+                    worker.submit(evt)
+            else:
+                worker = by_symbol.get(evt.symbol)
+                if worker is not None:
+                    worker.submit(evt)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        out = {}
+        for name, worker in self.workers.items():
+            stats: Dict[str, Any] = worker.stats.as_dict()
+            stats["queue_depth"] = worker.depth()
+            stats["queue_size"] = worker.queue_size
+            if worker.gate is not None:
+                stats["gate"] = worker.gate
+            out[name] = stats
+        return out
+
+    def stop(self, timeout: float = 2.0) -> None:
+        for et in self._subs:
+            self.bus.unsubscribe(et, self.on_event)
+        self._subs = ()
+        self._routes.clear()
+        for worker in self.workers.values():
+            worker.stop(timeout)
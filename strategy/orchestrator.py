@@ -2,59 +2,96 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timezone
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
 
 from core.event_bus import EventBus
+from core.timer import BusTimer
+from engines.microstructure.features import as_vector
+from engines.microstructure.snapshot import merge_snapshot
 from models.market_event import MarketEvent
 from models.signal import Signal
 from strategy.playbook import PlaybookEngine
 from strategy.confluence import ConfluenceFramework
 from strategy.regime import RegimeEngine
 from strategy.scoring import SignalScorer
+from strategy.signal_gate import SignalGate
 
 
 class StrategyOrchestrator:
     """
     Consumes microstructure snapshots, applies playbook+confluence+regime filters and emits signals.
+    A playbook loaded from YAML is checked for changes every ``reload_seconds`` (on the bus
+    thread, so rules are never swapped mid-evaluation). Accepted decisions pass ``gate``
+    (per-symbol cooldown, repeated direction suppressed) before a signal is published.
     """
 
-    def __init__(self, bus: EventBus, symbols: Iterable[str]) -> None:
+    def __init__(
+        self,
+        bus: EventBus,
+        symbols: Iterable[str],
+        playbook: Optional[PlaybookEngine] = None,
+        reload_seconds: float = 1.0,
+        gate: Optional[SignalGate] = None,
+    ) -> None:
         self.bus = bus
         self.symbols = set(symbols)
-        self.playbook = PlaybookEngine()
+        self.playbook = playbook or PlaybookEngine()
+        self.reload_seconds = reload_seconds
+        self._timer: Optional[BusTimer] = None
         self.confluence = ConfluenceFramework()
         self.regime = RegimeEngine()
         self.scorer = SignalScorer()
-        self.cooldowns: Dict[str, datetime] = {}
-        self.cooldown_seconds = 1.0
+        self.gate = gate or SignalGate(cooldown_seconds=1.0)
+        self._views: Dict[str, Dict] = {}
 
     def start(self) -> None:
         self.bus.subscribe("microstructure", self.on_microstructure)
         self._subs = ("microstructure",)
+        if self.playbook.path and self.reload_seconds > 0:
+            self.bus.subscribe("timer", self.on_timer)
+            self._subs = ("microstructure", "timer")
+            self._timer = BusTimer(self.bus, "playbook_reload", self.reload_seconds)
+            self._timer.start()
 
     def stop(self) -> None:
+        if self._timer:
+            self._timer.stop()
+            self._timer = None
         for et in getattr(self, "_subs", ()):
-            self.bus.unsubscribe(et, self.on_microstructure)
+            self.bus.unsubscribe(et, self.on_microstructure if et == "microstructure" else self.on_timer)
+
+    def on_timer(self, evt: MarketEvent) -> None:
+        if evt.payload.get("name") == "playbook_reload":
+            self.playbook.maybe_reload()
 
     def on_microstructure(self, evt: MarketEvent) -> None:
         symbol = evt.symbol
         if symbol not in self.symbols:
             return
         snapshot = evt.payload.get("snapshot", {})
+        if evt.payload.get("delta"):
+            snapshot = merge_snapshot(self._views.setdefault(symbol, {}), snapshot)
         features = snapshot.get("features", {})
         tags = snapshot.get("tags", [])
-        if not self.regime.is_allowed(snapshot):
+        vector = evt.payload.get("vector")
+        if vector is None:
+            vector = as_vector(features, tags)
+        if not self.regime.is_allowed(snapshot, vector):
             return
-        decision = self.playbook.evaluate(snapshot, features, tags)
+        decision = self.playbook.evaluate(snapshot, vector, tags)
         if not decision.get("action"):
             return
         if decision.get("action") == "skip":
             return
-        if not self.confluence.validate(snapshot, features, tags):
+        if not self.confluence.validate(snapshot, vector, tags):
             return
-        score = self.scorer.score(features, tags)
+        score = self.scorer.score(vector, tags)
         if score <= 0:
             return
+        if not self.gate.allow(symbol, decision.get("direction"), evt.timestamp):
+            return
         ts = datetime.now(timezone.utc)
         signal = Signal(
             signal_id=uuid.uuid4().hex,
@@ -74,3 +111,15 @@ class StrategyOrchestrator:
             payload=signal.model_dump(),
         )
         self.bus.publish(out_evt)
+
+    def evaluate_batch(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply regime, playbook, confluence and scoring to a (rows x features) matrix, e.g.
+        ``MicrostructureEngine.replay_features(...).matrix``. Returns per-row direction
+        (+1 buy, -1 sell, 0 none) and score; rows filtered out get direction 0.
+        """
+        directions = self.playbook.evaluate_batch(matrix)
+        scores = self.scorer.score_batch(matrix)
+        keep = self.regime.allowed_batch(matrix) & self.confluence.validate_batch(matrix) & (scores > 0)
+        directions[~keep] = 0
+        return directions, scores
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List
 
 
 def detect_absorption(delta: float, liquidity_shift: float) -> bool:
@@ -31,13 +31,22 @@ def detect_divergence(delta: float, price_change: float) -> bool:
     return abs(delta) > 300 and abs(price_change) < 0.25
 
 
-def classify_pattern(features: Dict[str, float]) -> str:
+def detect_patterns(features: Dict[str, float]) -> List[str]:
+    """
+    Every pattern whose heuristic fires, in priority order (absorption, spoof, vacuum, divergence).
+    """
+    found = []
     if detect_absorption(features.get("delta", 0.0), features.get("shift", 0.0)):
-        return "absorption"
+        found.append("absorption")
     if detect_spoof(features.get("added_liq", 0.0), features.get("removed_liq", 0.0)):
-        return "spoof"
+        found.append("spoof")
     if detect_vacuum(features.get("imbalance", 0.0), features.get("volume_drop", 0.0)):
-        return "vacuum"
+        found.append("vacuum")
     if detect_divergence(features.get("delta", 0.0), features.get("price_change", 0.0)):
-        return "divergence"
-    return "none"
+        found.append("divergence")
+    return found
+
+
+def classify_pattern(features: Dict[str, float]) -> str:
+    found = detect_patterns(features)
+    return found[0] if found else "none"
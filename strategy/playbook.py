@@ -1,24 +1,176 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import logging
+import os
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from engines.microstructure.features import FEATURE_SCHEMA, FeatureSchema, as_vector
+
+_DIRECTIONS = {"buy": 1, "sell": -1}
+_OPS = {
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    ">": np.greater,
+    "<": np.less,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+_CONDITION = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(>=|<=|==|!=|>|<)\s*(\S+)\s*$")
+_NO_ACTION: Dict[str, Optional[str]] = {"action": None}
+_ACTIONS = ("enter", "skip")
+
+DEFAULT_RULES: List[Dict] = [
+    {"min_score": 0.2, "direction": "buy", "feature": "imbalance", "threshold": 0.1},
+    {"min_score": 0.2, "direction": "sell", "feature": "imbalance", "threshold": -0.1},
+]
+
+Condition = Tuple[int, str, float]
 
 
 class PlaybookEngine:
     """
     Encapsulates confluence rules: event -> validation -> action.
+
+    Rules are checked in order and the first whose conditions all hold decides. A rule is
+    ``{"name", "direction", "action" (enter, the default, or skip), "when": ["imbalance >= 0.1", ...]}``;
+    the legacy ``{"direction", "feature", "threshold"}`` form means ``feature >= threshold``
+    for buys and ``<=`` for sells. ``compile`` validates names against the schema and generates
+    one straight-line function over the feature vector, so evaluation does no dict lookups.
+
+    With ``path`` the rules come from YAML (``rules:`` list) and ``maybe_reload`` swaps in the
+    new set when the file changes; a file that fails to load or compile keeps the old rules.
     """
 
-    def __init__(self) -> None:
-        self.rules: List[Dict[str, float]] = [
-            {"min_score": 0.2, "direction": "buy", "feature": "imbalance", "threshold": 0.1},
-            {"min_score": 0.2, "direction": "sell", "feature": "imbalance", "threshold": -0.1},
-        ]
-
-    def evaluate(self, snapshot: Dict, features: Dict[str, float], tags: List[str]) -> Dict[str, str]:
-        for rule in self.rules:
-            fval = features.get(rule["feature"], 0.0)
-            if rule["direction"] == "buy" and fval >= rule["threshold"]:
-                return {"action": "enter", "direction": "buy"}
-            if rule["direction"] == "sell" and fval <= rule["threshold"]:
-                return {"action": "enter", "direction": "sell"}
-        return {"action": None}
+    def __init__(self, schema: FeatureSchema = FEATURE_SCHEMA, path: Optional[str] = None) -> None:
+        self.schema = schema
+        self.path = path
+        self.rules: List[Dict] = [dict(rule) for rule in DEFAULT_RULES]
+        self._mtime: Optional[float] = None
+        self._compiled: List[Tuple[List[Condition], int]] = []
+        self._decisions: List[Dict[str, Optional[str]]] = []
+        self._match: Callable[[np.ndarray], int] = lambda v: -1
+        if path:
+            self.load(path)
+        else:
+            self.compile()
+
+    def load(self, path: str) -> None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        rules = data.get("rules") if isinstance(data, dict) else data
+        if not isinstance(rules, list):
+            raise ValueError(f"{path}: expected a 'rules' list")
+        mtime = os.path.getmtime(path)
+        previous = self.rules
+        self.rules = rules
+        try:
+            self.compile()
+        except Exception:
+            self.rules = previous
+            raise
+        self.path, self._mtime = path, mtime
+
+    def __getstate__(self) -> Dict:
+        # the generated matcher cannot be pickled; rebuild it on the other side
+        state = self.__dict__.copy()
+        del state["_match"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._match = self._generate(self._compiled)
+
+    def maybe_reload(self) -> bool:
+        """Reload ``path`` if it changed on disk; returns True when new rules are active."""
+        if not self.path:
+            return False
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        try:
+            self.load(self.path)
+        except Exception:
+            self._mtime = mtime  # do not retry the same broken file on every check
+            logging.getLogger(__name__).exception("[Playbook] reload failed path=%s; keeping previous rules", self.path)
+            return False
+        logging.getLogger(__name__).info("[Playbook] reloaded %d rules from %s", len(self.rules), self.path)
+        return True
+
+    def compile(self) -> None:
+        """Validate ``rules`` and build the evaluator; call after editing ``rules``."""
+        compiled: List[Tuple[List[Condition], int]] = []
+        decisions: List[Dict[str, Optional[str]]] = []
+        for i, rule in enumerate(self.rules):
+            direction = rule.get("direction")
+            if direction not in _DIRECTIONS:
+                raise ValueError(f"rule {rule.get('name', i)}: direction must be buy or sell")
+            action = rule.get("action", "enter")
+            if action not in _ACTIONS:
+                raise ValueError(f"rule {rule.get('name', i)}: action must be enter or skip, got {action!r}")
+            conditions = [self._condition(c) for c in self._conditions(rule)]
+            if not conditions:
+                raise ValueError(f"rule {rule.get('name', i)}: no conditions")
+            compiled.append((conditions, _DIRECTIONS[direction]))
+            decisions.append({"action": action, "direction": direction})
+        match = self._generate(compiled)
+        # swap together so a concurrent evaluate never sees a half-built rule set
+        self._compiled, self._decisions, self._match = compiled, decisions, match
+
+    @staticmethod
+    def _conditions(rule: Dict) -> Sequence:
+        if "when" in rule:
+            when = rule["when"]
+            return [when] if isinstance(when, (str, dict)) else list(when)
+        if "feature" in rule:
+            op = ">=" if rule.get("direction") == "buy" else "<="
+            return [{"feature": rule["feature"], "op": op, "value": rule["threshold"]}]
+        return []
+
+    def _condition(self, cond) -> Condition:
+        if isinstance(cond, str):
+            m = _CONDITION.match(cond)
+            if not m:
+                raise ValueError(f"cannot parse condition: {cond!r}")
+            name, op, value = m.groups()
+        else:
+            name, op, value = cond["feature"], cond.get("op", ">="), cond["value"]
+        if op not in _OPS:
+            raise ValueError(f"unknown operator {op!r} in {cond!r}")
+        return self.schema.index(name), op, float(value)
+
+    @staticmethod
+    def _generate(compiled: List[Tuple[List[Condition], int]]) -> Callable[[np.ndarray], int]:
+        # every token is a schema index, a whitelisted operator or a float repr
+        lines = ["def _match(v):"]
+        for i, (conditions, _) in enumerate(compiled):
+            test = " and ".join(f"v[{idx}] {op} {value!r}" for idx, op, value in conditions)
+            lines.append(f"    if {test}: return {i}")
+        lines.append("    return -1")
+        namespace: Dict[str, Callable] = {"inf": float("inf"), "nan": float("nan")}
+        exec(compile("\n".join(lines), "<playbook>", "exec"), namespace)
+        return namespace["_match"]
+
+    def evaluate(self, snapshot: Dict, features, tags: List[str]) -> Dict[str, Optional[str]]:
+        """Decision of the first matching rule; the returned dict is shared, do not mutate it."""
+        i = self._match(as_vector(features, tags, self.schema))
+        return self._decisions[i] if i >= 0 else _NO_ACTION
+
+    def evaluate_batch(self, matrix: np.ndarray) -> np.ndarray:
+        """First matching rule per row: +1 buy, -1 sell, 0 no action (or a skip rule)."""
+        out = np.zeros(len(matrix), dtype=np.int8)
+        open_rows = np.ones(len(matrix), dtype=bool)
+        for (conditions, direction), decision in zip(self._compiled, self._decisions):
+            hit = open_rows.copy()
+            for idx, op, value in conditions:
+                hit &= _OPS[op](matrix[:, idx], value)
+            if decision["action"] == "enter":
+                out[hit] = direction
+            open_rows &= ~hit
+        return out
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
+
+from engines.microstructure.features import FEATURE_SCHEMA, FeatureSchema, as_vector
 
 
 class RegimeEngine:
@@ -8,16 +12,29 @@ class RegimeEngine:
     Simple regime filters using ATR/volume/session placeholders.
     """
 
-    def __init__(self, atr_threshold: float = 3.0, volume_threshold: float = 0.0) -> None:
+    def __init__(
+        self,
+        atr_threshold: float = 3.0,
+        volume_threshold: float = 0.0,
+        schema: FeatureSchema = FEATURE_SCHEMA,
+    ) -> None:
         self.atr_threshold = atr_threshold
         self.volume_threshold = volume_threshold
+        self.schema = schema
+        self._atr = schema.index("atr")
+        self._volume = schema.index("volume")
 
-    def is_allowed(self, snapshot: Dict) -> bool:
-        features = snapshot.get("features", {})
-        atr = features.get("atr", 0.0)
-        vol = features.get("volume", 0.0)
+    def is_allowed(self, snapshot: Dict, features: Optional[np.ndarray] = None) -> bool:
+        vec = features if features is not None else as_vector(snapshot.get("features", {}), (), self.schema)
+        atr = vec[self._atr]
+        vol = vec[self._volume]
         if atr and atr > self.atr_threshold:
             return False
         if vol and vol < self.volume_threshold:
             return False
         return True
+
+    def allowed_batch(self, matrix: np.ndarray) -> np.ndarray:
+        atr = matrix[:, self._atr]
+        vol = matrix[:, self._volume]
+        return ~((atr > self.atr_threshold) | ((vol != 0) & (vol < self.volume_threshold)))
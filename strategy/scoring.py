@@ -1,16 +1,34 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import List
+
+import numpy as np
+
+from engines.microstructure.features import FEATURE_SCHEMA, FeatureSchema, as_vector
 
 
 class SignalScorer:
     """
-    Scores signals using features and tags.
+    Scores signals using the feature vector (tags are ``tag_*`` columns).
     """
 
-    def score(self, features: Dict[str, float], tags: List[str]) -> float:
-        base = abs(features.get("imbalance", 0.0))
-        base += abs(features.get("delta", 0.0)) * 0.001
-        if "absorption" in tags:
+    def __init__(self, schema: FeatureSchema = FEATURE_SCHEMA) -> None:
+        self.schema = schema
+        self._imbalance = schema.index("imbalance")
+        self._delta = schema.index("delta")
+        self._absorption = schema.index("tag_absorption")
+
+    def score(self, features, tags: List[str]) -> float:
+        vec = as_vector(features, tags, self.schema)
+        base = abs(vec[self._imbalance])
+        base += abs(vec[self._delta]) * 0.001
+        if vec[self._absorption] > 0:
             base += 0.1
-        return base
+        return float(base)
+
+    def score_batch(self, matrix: np.ndarray) -> np.ndarray:
+        return (
+            np.abs(matrix[:, self._imbalance])
+            + np.abs(matrix[:, self._delta]) * 0.001
+            + np.where(matrix[:, self._absorption] > 0, 0.1, 0.0)
+        )
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+REASONS = ("flat", "duplicate", "cooldown")
+
+
+class SignalGate:
+    """
+    Last filter before a strategy publishes a signal.
+
+    Per symbol, in this order:
+    - ``flat`` (or empty) directions never pass;
+    - ``duplicate``: the same direction as the last signal that passed is held back until the
+      direction flips, or until ``dedup_seconds`` have gone by when that is set;
+    - ``cooldown``: nothing passes within ``cooldown_seconds`` of the last passed signal,
+      reversals included.
+
+    Times are the event timestamps, so replays gate exactly like live. ``counts`` tallies
+    ``passed`` and each suppression reason overall, ``by_symbol`` the same per symbol.
+    """
+
+    def __init__(self, cooldown_seconds: float = 0.0, dedup_seconds: Optional[float] = None) -> None:
+        self.cooldown_seconds = cooldown_seconds
+        self.dedup_seconds = dedup_seconds
+        self._last: Dict[str, Tuple[str, float]] = {}
+        self.counts: Dict[str, int] = dict.fromkeys(("passed",) + REASONS, 0)
+        self.by_symbol: Dict[str, Dict[str, int]] = {}
+
+    def allow(self, symbol: str, direction: Optional[str], when: datetime | float) -> bool:
+        """True if the signal may be published; records it as the symbol's last signal."""
+        now = when.timestamp() if isinstance(when, datetime) else float(when)
+        reason = self._reason(symbol, direction, now)
+        key = reason or "passed"
+        self.counts[key] += 1
+        per_symbol = self.by_symbol.get(symbol)
+        if per_symbol is None:
+            per_symbol = self.by_symbol[symbol] = dict.fromkeys(("passed",) + REASONS, 0)
+        per_symbol[key] += 1
+        if reason:
+            return False
+        self._last[symbol] = (direction, now)
+        return True
+
+    def _reason(self, symbol: str, direction: Optional[str], now: float) -> Optional[str]:
+        if not direction or direction == "flat":
+            return "flat"
+        last = self._last.get(symbol)
+        if last is None:
+            return None
+        last_direction, last_ts = last
+        elapsed = now - last_ts
+        if direction == last_direction and (self.dedup_seconds is None or elapsed < self.dedup_seconds):
+            return "duplicate"
+        if elapsed < self.cooldown_seconds:
+            return "cooldown"
+        return None
+
+    @property
+    def suppressed(self) -> int:
+        return sum(self.counts[r] for r in REASONS)
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Forget the last signal (all symbols, or one), e.g. after a position is closed."""
+        if symbol is None:
+            self._last.clear()
+        else:
+            self._last.pop(symbol, None)
+
+    def stats(self) -> Dict[str, object]:
+        return {**self.counts, "suppressed": self.suppressed, "by_symbol": {s: dict(c) for s, c in self.by_symbol.items()}}
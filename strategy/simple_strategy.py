@@ -2,19 +2,23 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
+from typing import Optional
 
 from core.event_bus import EventBus
 from models.market_event import MarketEvent
+from strategy.signal_gate import SignalGate
 
 
 class SimpleStrategyEngine:
     """
     Minimal strategy: reacts to delta updates and emits strategy_signal.
+    Flat and repeated-direction signals are held back by ``gate``.
     """
 
-    def __init__(self, bus: EventBus, delta_threshold: float = 50.0) -> None:
+    def __init__(self, bus: EventBus, delta_threshold: float = 50.0, gate: Optional[SignalGate] = None) -> None:
         self.bus = bus
         self.delta_threshold = delta_threshold
+        self.gate = gate or SignalGate()
         self.bus.subscribe("delta_update", self.on_delta)
         self.log = logging.getLogger(__name__)
         self._subs = ("delta_update",)
@@ -41,6 +45,8 @@ class SimpleStrategyEngine:
             direction = "sell"
             score = delta_f / self.delta_threshold
             reason = "delta_breakdown"
+        if not self.gate.allow(evt.symbol, direction, evt.timestamp):
+            return
         sig = MarketEvent(
             event_type="strategy_signal",
             timestamp=datetime.now(timezone.utc),
@@ -21,3 +21,47 @@ class MetricsSink:
 
     def snapshot(self) -> dict:
         return {"counters": dict(self.counters), "gauges": dict(self.gauges)}
+
+
+class LatencyHistogram:
+    """
+    Nanosecond latencies in power-of-two buckets: O(1) ``record`` with no allocation,
+    percentiles approximate to the bucket's upper bound.
+    """
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * 65
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        self.buckets[ns.bit_length()] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        target = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return min((1 << i) - 1, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count / 1000.0,
+            "p50_us": self.percentile(50) / 1000.0,
+            "p99_us": self.percentile(99) / 1000.0,
+            "max_us": self.max / 1000.0,
+        }
@@ -0,0 +1,81 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from core.event_bus import EventBus
+from engines.bars.engine import BarEngine, build_bar_builder
+from models.market_event import MarketEvent
+
+
+def test_tick_bars_close_every_n_trades():
+    builder = build_bar_builder("tick", 3)
+    closed = []
+    for i, px in enumerate([100.0, 101.0, 99.0, 100.5, 100.0, 102.0, 103.0]):
+        closed.extend(builder.update("ES", float(i), px, 1.0, "buy"))
+    assert len(closed) == 2
+    first = closed[0]
+    assert (first["open"], first["high"], first["low"], first["close"]) == (100.0, 101.0, 99.0, 99.0)
+    assert first["time"] == 0.0 and first["trades"] == 3 and first["bar_type"] == "tick"
+    assert closed[1]["open"] == 100.5 and closed[1]["time"] == 3.0
+    assert builder.current("ES")["close"] == 103.0
+
+
+def test_volume_and_delta_bars():
+    vol = build_bar_builder("volume", 10)
+    assert not vol.update("ES", 0.0, 100.0, 6.0, "buy")
+    bar = vol.update("ES", 1.0, 100.25, 4.0, "sell")[0]
+    assert bar["volume"] == 10.0 and bar["delta"] == 2.0
+
+    delta = build_bar_builder("delta", 5)
+    assert not delta.update("ES", 0.0, 100.0, 4.0, "buy")
+    assert not delta.update("ES", 1.0, 100.0, 4.0, "sell")
+    bar = delta.update("ES", 2.0, 100.0, 5.0, "B")[0]
+    assert bar["delta"] == 5.0 and bar["volume"] == 13.0
+
+
+def test_range_bars_are_per_symbol():
+    builder = build_bar_builder("range", 1.0)
+    assert not builder.update("ES", 0.0, 100.0, 1.0)
+    assert not builder.update("NQ", 0.0, 200.0, 1.0)
+    bar = builder.update("ES", 1.0, 101.0, 1.0)[0]
+    assert bar["high"] - bar["low"] == 1.0
+    assert builder.current("NQ")["open"] == 200.0
+
+
+def test_renko_emits_multiple_bricks_on_gap():
+    builder = build_bar_builder("renko", 1.0)
+    assert not builder.update("ES", 0.0, 100.0, 1.0)
+    bricks = builder.update("ES", 1.0, 102.5, 2.0, "buy")
+    assert [(b["open"], b["close"]) for b in bricks] == [(100.0, 101.0), (101.0, 102.0)]
+    assert bricks[0]["volume"] == 3.0 and bricks[1]["volume"] == 0.0
+    down = builder.update("ES", 2.0, 101.0, 1.0, "sell")
+    assert [(b["open"], b["close"]) for b in down] == [(102.0, 101.0)]
+
+
+def test_unknown_bar_type_rejected():
+    with pytest.raises(ValueError):
+        build_bar_builder("kagi", 1.0)
+    with pytest.raises(ValueError):
+        build_bar_builder("tick", 0)
+
+
+def test_bar_engine_emits_chart_ohlc_shape():
+    bus = EventBus()
+    engine = BarEngine(bus, bar_type="tick", threshold=2)
+    bars = []
+    bus.subscribe("chart_ohlc", lambda evt: bars.append(evt.payload))
+    for px in (100.0, 100.5):
+        bus.publish(
+            MarketEvent(
+                event_type="trade",
+                timestamp=datetime.now(timezone.utc),
+                source="sim",
+                symbol="BTCUSDT",
+                payload={"price": px, "size": 1.0, "side": "buy"},
+            )
+        )
+    time.sleep(0.2)
+    engine.stop()
+    bus.stop()
+    assert bars and {"time", "open", "high", "low", "close", "volume"} <= set(bars[0])
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from engines.detectors import DetectorPipeline, IcebergDetector, LargeTradeDetector, SpoofingDetector
+from engines.detectors.records import parse_book, parse_trade
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry({"ES": 0.25})
+
+
+def _evt(event_type, payload):
+    return MarketEvent(event_type=event_type, timestamp=T0, source="test", symbol="ES", payload=payload)
+
+
+def test_records_parse_once_with_ticks_and_side():
+    trade = parse_trade(_evt("trade", {"price": "100.25", "size": 3, "side": "B", "exchange_ts": 1_700_000_000_000}), TICKS)
+    assert (trade.price, trade.size, trade.tick, trade.side) == (100.25, 3.0, 401, "buy")
+    assert trade.exchange_ts == 1_700_000_000.0
+    assert parse_trade(_evt("trade", {"size": 1}), TICKS) is None
+
+    book = parse_book(_evt("dom_snapshot", {"bids": [[100.0, 5]], "asks": [[100.25, 7]]}), TICKS)
+    assert book.bid_ticks == {400: 5.0} and book.ask_ticks == {401: 7.0}
+    assert parse_book(_evt("dom_snapshot", {}), TICKS) is None
+
+
+def test_pipeline_fans_out_and_takes_over_subscriptions():
+    bus = EventBus()
+    pipeline = DetectorPipeline(bus, ticks=TICKS)
+    large = pipeline.register(LargeTradeDetector(bus, threshold=5, ticks=TICKS), "large_trade")
+    pipeline.register(IcebergDetector(bus, ticks=TICKS), "iceberg")
+    pipeline.register(SpoofingDetector(bus, ticks=TICKS), "spoof")
+    with pytest.raises(ValueError):
+        pipeline.register(large, "large_trade")
+    assert large.on_trade not in bus._subscribers["trade"]
+    assert bus._subscribers["trade"] == [pipeline.on_trade]
+
+    alerts = []
+    bus.publish = lambda evt: alerts.append(evt.payload)
+    pipeline.on_dom(_evt("dom_snapshot", {"bids": [[100.0, 5]], "asks": [[100.25, 7]]}))
+    pipeline.on_trade(_evt("trade", {"price": 100.25, "size": 10, "side": "buy"}))
+    pipeline.on_trade(_evt("trade", {"price": "bad"}))
+
+    assert [a["type"] for a in alerts] == ["large_trade"]
+    stats = pipeline.timings()
+    assert stats["parse"]["calls"] == 3
+    assert stats["large_trade"]["calls"] == 1 and stats["iceberg"]["calls"] == 2 and stats["spoof"]["calls"] == 2
+    assert stats["iceberg"]["errors"] == 0
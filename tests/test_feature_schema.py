@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from core.event_bus import EventBus
+from engines.microstructure.engine import MicrostructureEngine
+from engines.microstructure.features import FEATURE_SCHEMA, FeatureSchema, MicrostructureFeatureExtractor
+from engines.microstructure.snapshot import MicrostructureSnapshot
+from models.market_event import MarketEvent
+from strategy.orchestrator import StrategyOrchestrator
+from strategy.playbook import PlaybookEngine
+from strategy.scoring import SignalScorer
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _snap(symbol="ES", **kw):
+    return MicrostructureSnapshot(symbol=symbol, timestamp=T0, **kw)
+
+
+def test_schema_indices_are_stable():
+    schema = FeatureSchema(["a", "b"])
+    assert schema.register("a") == 0 and schema.register("c") == 2
+    assert schema.index("b") == 1 and len(schema) == 3
+    assert schema.vector({"c": 2.0, "unknown": 9.0}).tolist() == [0.0, 0.0, 2.0]
+
+
+def test_extractor_reuses_row_per_symbol():
+    ex = MicrostructureFeatureExtractor()
+    row = ex.extract_row(_snap(imbalance=0.4, tags=["absorption"], liquidity_signals={"spoof": 1.0}))
+    assert row[FEATURE_SCHEMA.index("imbalance")] == 0.4
+    assert row[FEATURE_SCHEMA.index("tag_absorption")] == 1.0
+    assert row[FEATURE_SCHEMA.index("liq_spoof")] == 1.0
+    again = ex.extract_row(_snap(imbalance=-0.2))
+    assert again is row
+    assert row[FEATURE_SCHEMA.index("tag_absorption")] == 0.0
+    assert ex.extract(_snap(mid=10.0))["mid"] == 10.0
+
+
+def test_rules_evaluate_vector_and_dict_alike():
+    playbook, scorer = PlaybookEngine(), SignalScorer()
+    vec = FEATURE_SCHEMA.vector({"imbalance": 0.3, "delta": 100.0}, ["absorption"])
+    assert playbook.evaluate({}, vec, []) == {"action": "enter", "direction": "buy"}
+    assert playbook.evaluate({}, {"imbalance": -0.3}, []) == {"action": "enter", "direction": "sell"}
+    assert abs(scorer.score(vec, []) - 0.5) < 1e-9
+    assert abs(scorer.score({"imbalance": 0.3, "delta": 100.0}, ["absorption"]) - 0.5) < 1e-9
+
+
+def test_batch_replay_matches_streaming_rules():
+    events = [
+        MarketEvent(
+            event_type="dom_snapshot",
+            timestamp=T0 + timedelta(seconds=i),
+            source="test",
+            symbol="ES",
+            payload={"bid": 100.0, "ask": 100.25, "bid_size": 10 + 5 * i, "ask_size": 10},
+        )
+        for i in range(4)
+    ]
+    events.append(MarketEvent(event_type="heartbeat", timestamp=T0, source="test", symbol="ES", payload={}))
+    batch = MicrostructureEngine(EventBus(), ["ES"]).replay_features(events)
+    assert batch.matrix.shape == (4, len(FEATURE_SCHEMA))
+    assert batch.symbols == ["ES"] * 4 and batch.timestamps[-1] == T0 + timedelta(seconds=3)
+
+    orch = StrategyOrchestrator(EventBus(), ["ES"])
+    directions, scores = orch.evaluate_batch(batch.matrix)
+    for row, direction, score in zip(batch.matrix, directions, scores):
+        decision = orch.playbook.evaluate({}, row, [])
+        expected = {"buy": 1, "sell": -1}.get(decision.get("direction"), 0)
+        assert direction == expected
+        assert np.isclose(score, orch.scorer.score(row, []))
+    orch.bus.stop()
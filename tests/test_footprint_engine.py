@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from engines.footprint.advanced import FootprintEngineAdvanced
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _trade(price, size, side, ts=T0, symbol="ES"):
+    return MarketEvent(event_type="trade", timestamp=ts, source="test", symbol=symbol, payload={"price": price, "size": size, "side": side})
+
+
+def test_cells_are_tick_normalized_and_poc_tracked():
+    fp = FootprintEngineAdvanced(bar_seconds=60, tick_size=0.25)
+    fp.on_trade(_trade(100.25, 5, "buy"))
+    fp.on_trade(_trade(100.25000000001, 5, "sell"))
+    bar = fp.on_trade(_trade(100.5, 3, "buy"))
+    assert fp.snapshot("ES") == {100.25: {"buy": 5.0, "sell": 5.0}, 100.5: {"buy": 3.0, "sell": 0.0}}
+    assert bar.poc_price == 100.25
+
+
+def test_only_last_n_bars_retained():
+    fp = FootprintEngineAdvanced(bar_seconds=1, max_bars=3)
+    for i in range(10):
+        fp.on_trade(_trade(100.0, 1, "buy", ts=T0 + timedelta(seconds=i)))
+    history = fp.bars["ES"]
+    assert len(history) == 3
+    assert [b.index for b in history] == [history[0].index, history[0].index + 1, history[0].index + 2]
+
+
+def test_diagonal_and_stacked_imbalance():
+    fp = FootprintEngineAdvanced(tick_size=1.0, imbalance_ratio=3.0)
+    for px in (100, 101, 102, 103):
+        fp.on_trade(_trade(px, 1, "sell"))
+        fp.on_trade(_trade(px, 10, "buy"))
+    bar = fp.current("ES")
+    # every buy level dominates the sell one tick below (100 has nothing below)
+    assert bar.stacked_buy == 4
+    fp.on_trade(_trade(101, 20, "sell"))
+    assert bar.stacked_buy == 2
+
+
+def test_imbalance_heatmap_is_array_view_and_grows():
+    fp = FootprintEngineAdvanced(tick_size=1.0)
+    fp.on_trade(_trade(100, 4, "buy"))
+    fp.on_trade(_trade(60, 1, "sell"))
+    fp.on_trade(_trade(150, 2, "buy"))
+    heat = fp.imbalance_heatmap("ES")
+    bar = fp.current("ES")
+    assert heat.base is bar.delta
+    assert len(heat) == 91 and bar.low_price == 60.0
+    assert heat[0] == -1.0 and heat[40] == 4.0 and heat[-1] == 2.0
+    assert fp.imbalance_heatmap("NQ").size == 0
@@ -13,6 +13,21 @@ def test_heatmap_renders(qtbot):
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
     panel = HeatmapPanel()
     qtbot.addWidget(panel)
-    panel._on_dom(type("evt", (), {"payload": {"dom": [{"price": 100.0, "bid_size": 10, "ask_size": 5}]}}))
+    payload = {"slice": 5, "origin_tick": 300, "rows": [100, 101], "bid": [10.0, 0.0], "ask": [0.0, 5.0], "tick_size": 0.25}
+    panel._on_liq(type("evt", (), {"symbol": "ES", "payload": payload}))
     qtbot.wait(50)
-    assert panel.ladder
+    assert panel.grid.bid[100, 5] == 10.0
+    assert panel._render_image() is not None
+
+
+@pytest.mark.qt
+def test_heatmap_keeps_a_grid_per_symbol(qtbot):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    panel = HeatmapPanel()
+    qtbot.addWidget(panel)
+    for symbol, slice_id, size in (("ES", 5, 10.0), ("NQ", 5, 7.0), ("ES", 6, 12.0)):
+        payload = {"slice": slice_id, "origin_tick": 300, "rows": [100], "bid": [size], "ask": [0.0]}
+        panel._on_liq(type("evt", (), {"symbol": symbol, "payload": payload}))
+    assert panel.symbol == "ES" and panel.grid.bid[100, 5] == 10.0 and panel.grid.bid[100, 6] == 12.0
+    panel.set_symbol("NQ")
+    assert panel.grid.bid[100, 5] == 7.0
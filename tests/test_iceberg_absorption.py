@@ -0,0 +1,83 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from engines.detectors.iceberg_detector import IcebergDetector
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry({"ES": 0.25})
+
+
+def _evt(event_type, payload, seconds=0.0):
+    return MarketEvent(event_type=event_type, timestamp=T0 + timedelta(seconds=seconds), source="test", symbol="ES", payload=payload)
+
+
+def _book(ask_size, seconds=0.0, best_ask=100.25):
+    return _evt("dom_snapshot", {"bids": [[100.0, 50]], "asks": [[best_ask, ask_size], [best_ask + 0.25, 40]]}, seconds)
+
+
+def _detector(**kw):
+    bus = EventBus()
+    det = IcebergDetector(bus, ticks=TICKS, **kw)
+    alerts = []
+    bus.subscribe("alert_event", lambda evt: alerts.append(evt.payload))
+    return det, alerts
+
+
+def test_refill_after_depletion_flags_iceberg():
+    det, alerts = _detector(min_repeats=2, min_size=1)
+    det.on_dom(_book(10))
+    for i in range(2):
+        det.on_trade(_evt("trade", {"price": 100.25, "size": 10, "side": "buy"}, i + 0.1))
+        det.on_dom(_book(10, i + 0.2))
+    time.sleep(0.15)
+    det.bus.stop()
+    assert [a["type"] for a in alerts] == ["iceberg"]
+    assert alerts[0]["price"] == 100.25 and alerts[0]["side"] == "ask" and alerts[0]["displayed"] == 10
+
+
+def test_price_moving_through_level_is_not_a_refill():
+    det, alerts = _detector(min_repeats=1, min_size=1)
+    det.on_dom(_book(10))
+    det.on_trade(_evt("trade", {"price": 100.25, "size": 10, "side": "buy"}, 0.1))
+    det.on_dom(_evt("dom_snapshot", {"bids": [[100.25, 5]], "asks": [[100.5, 40]]}, 0.2))
+    time.sleep(0.1)
+    det.bus.stop()
+    assert alerts == [] and not det.books["ES"].pending
+
+
+def test_absorption_requires_volume_without_progress_and_decays():
+    det, alerts = _detector(min_size=1, absorption_size=100, half_life=10)
+    det.on_dom(_evt("dom_snapshot", {"bids": [[100.0, 500]], "asks": [[100.25, 500]]}))
+    for i in range(3):
+        det.on_trade(_evt("trade", {"price": 100.0, "size": 30, "side": "sell"}, 100 * i))
+    assert det.books["ES"].levels[400].volume < 100  # decayed between prints
+    for i in range(4):
+        det.on_trade(_evt("trade", {"price": 100.0, "size": 30, "side": "sell"}, 300 + i * 0.01))
+    time.sleep(0.15)
+    det.bus.stop()
+    assert [a["type"] for a in alerts] == ["absorption"]
+    assert alerts[0]["side"] == "bid" and alerts[0]["volume"] >= 100
+
+
+def test_level_state_is_bounded():
+    det, _ = _detector(min_size=1, max_levels=8, prints_per_level=4)
+    for i in range(200):
+        det.on_trade(_evt("trade", {"price": 100.0 + 0.25 * (i % 50), "size": 1, "side": "buy"}, i))
+    det.bus.stop()
+    levels = det.books["ES"].levels
+    assert len(levels) == 8
+    assert all(len(level.prints) <= 4 for level in levels.values())
+
+
+def test_refills_outside_window_do_not_alert():
+    det, alerts = _detector(min_repeats=2, min_size=1, refill_window=5)
+    det.on_dom(_book(10))
+    for i in range(3):
+        det.on_trade(_evt("trade", {"price": 100.25, "size": 10, "side": "buy"}, 10 * i + 0.1))
+        det.on_dom(_book(10, 10 * i + 0.2))
+    time.sleep(0.1)
+    det.bus.stop()
+    assert alerts == []
@@ -0,0 +1,98 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from execution.adapters.sim import SimAdapter
+from execution.router import ExecutionRouter
+from ibkr.ibkr_health import IBKRHealth
+from models.market_event import MarketEvent
+from models.order import OrderRequest, OrderSide, OrderType
+from observability.watchdogs import Watchdogs
+from risk.kill_switch import KillSwitch
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry(fixed=0.25)
+
+
+def _book(ms):
+    payload = {"bids": [[100.0, 5]], "asks": [[100.25, 5]]}
+    return MarketEvent(event_type="dom_snapshot", timestamp=T0 + timedelta(milliseconds=ms), source="test", symbol="ES", payload=payload)
+
+
+def _signal():
+    return MarketEvent(event_type="signal", timestamp=T0, source="strategy", symbol="ES", payload={"direction": "buy"})
+
+
+def _order(order_id, price):
+    return OrderRequest(order_id=order_id, symbol="ES", side=OrderSide.BUY, quantity=1, order_type=OrderType.LIMIT, limit_price=price)
+
+
+def _wait(cond, timeout=2.0):
+    deadline = time.time() + timeout
+    while not cond() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_engage_blocks_flow_and_cancels_working_orders():
+    bus = EventBus()
+    adapter = SimAdapter(bus, matching=True, ticks=TICKS)
+    router = ExecutionRouter(bus, adapter)
+    kill_switch = KillSwitch(bus, router)
+    kill_switch.start()
+    states, signals, rejects = [], [], []
+    bus.subscribe("kill_switch", lambda evt: states.append(evt.payload["state"]))
+    bus.subscribe("signal", signals.append)
+    bus.subscribe("order_event", lambda evt: rejects.append(evt.payload["order_id"]) if evt.payload["reason"] == "kill_switch" else None)
+
+    adapter.on_dom(_book(0))
+    for i in range(3):
+        router.submit(_order(f"o{i}", 99.0 - i * 0.25))
+    adapter.on_dom(_book(1))
+    assert len(router.working) == 3
+
+    kill_switch.engage("test")
+    bus.publish(_signal())
+    router.submit(_order("late", 99.0))
+    adapter.on_dom(_book(2))  # cancels land at the simulated exchange
+    _wait(lambda: "flat" in states)
+
+    assert router.working == {} and kill_switch.last_flatten_ms is not None
+    assert kill_switch.flatten_latency.count == 1
+    assert signals == [] and bus.blocked_count >= 1 and rejects == ["late"]
+
+    kill_switch.reset()
+    bus.publish(_signal())
+    _wait(lambda: signals)
+    kill_switch.stop()
+    adapter.stop()
+    bus.stop()
+    assert len(signals) == 1 and states == ["engaged", "flat", "reset"]
+
+
+def test_watchdog_and_ibkr_health_triggers():
+    watchdogs = Watchdogs(max_stale_seconds=0)
+    kill_switch = KillSwitch()
+    kill_switch.watch(watchdogs, ["market_data"])
+    assert kill_switch.check() is None  # never seen yet: not stale
+    watchdogs.heartbeat("market_data")
+    time.sleep(0.01)
+    assert kill_switch.check() == "stale:market_data" and kill_switch.engaged
+
+    bus = EventBus()
+    router = ExecutionRouter(bus, SimAdapter(bus, matching=True, ticks=TICKS))
+    kill_switch = KillSwitch(router=router)
+    kill_switch.watch(watchdogs, ["market_data"], armed=kill_switch.working)
+    assert kill_switch.check() is None  # stale, but nothing working: a quiet market is not an incident
+    router.submit(_order("o", 99.0))
+    assert kill_switch.check() == "stale:market_data"
+    bus.stop()
+
+    health = IBKRHealth()
+    kill_switch = KillSwitch()
+    kill_switch.watch_health(health, max_age=0.005)
+    assert kill_switch.check() is None
+    health.record_tick()
+    assert kill_switch.check() is None
+    time.sleep(0.01)
+    assert kill_switch.check() == "stale:ibkr" and kill_switch.reason == "stale:ibkr"
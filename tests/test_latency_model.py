@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.instrument_detector import TickSizeRegistry
+from engines.detectors.records import parse_book, parse_trade
+from execution.adapters.sim_matching import MatchingEngine
+from execution.latency import EmpiricalLatency, FixedLatency, LatencyProfile, LognormalLatency, build_profiles, summarize
+from models.market_event import MarketEvent
+from models.order import OrderRequest, OrderSide, OrderStatus, OrderType
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry(fixed=0.25)
+
+
+def _at(ms):
+    return T0 + timedelta(milliseconds=ms)
+
+
+def _book(ms):
+    payload = {"bids": [[100.0, 5]], "asks": [[100.25, 5]]}
+    return parse_book(MarketEvent(event_type="dom_snapshot", timestamp=_at(ms), source="test", symbol="ES", payload=payload), TICKS)
+
+
+def _print(price, size, side, ms):
+    payload = {"price": price, "size": size, "side": side}
+    return parse_trade(MarketEvent(event_type="trade", timestamp=_at(ms), source="test", symbol="ES", payload=payload), TICKS)
+
+
+def _order(order_id, price, venue=None):
+    hints = {"venue": venue} if venue else {}
+    return OrderRequest(
+        order_id=order_id, symbol="ES", side=OrderSide.BUY, quantity=1, order_type=OrderType.LIMIT, limit_price=price, routing_hints=hints
+    )
+
+
+def test_lognormal_and_histogram_sampling():
+    lognormal = LognormalLatency(median_ms=2.0, sigma=0.5, floor_ms=1.0, cap_ms=20.0, seed=7)
+    draws = np.array([lognormal.sample() for _ in range(5000)])
+    assert draws.min() >= 1.0 and draws.max() <= 20.0
+    assert np.median(draws) == pytest.approx(3.0, rel=0.05)
+
+    hist = EmpiricalLatency(edges=[0.0, 1.0, 10.0], counts=[0, 4], seed=1)
+    assert all(1.0 <= hist.sample() <= 10.0 for _ in range(200))
+
+
+def test_empirical_from_recorded_acks(tmp_path):
+    path = tmp_path / "ibkr_acks.csv"
+    path.write_text("sent_ts,ack_ts\n1700000000.000,1700000000.004\n2025-01-02T14:30:00+00:00,2025-01-02T14:30:00.010+00:00\n")
+    model = EmpiricalLatency.from_file(str(path), seed=3)
+    assert {round(model.sample(), 3) for _ in range(100)} == {4.0, 10.0}
+
+    jsonl = tmp_path / "mt5.jsonl"
+    jsonl.write_text('{"latency_ms": 12.5}\n{"latency_ms": 12.5}\n')
+    profiles = build_profiles({"mt5": {"send": {"type": "empirical", "path": str(jsonl)}, "ack": 2}})
+    assert profiles["MT5"].send.sample() == 12.5 and profiles["MT5"].fill.sample() == 2.0
+    assert isinstance(profiles["DEFAULT"].send, FixedLatency)
+    assert summarize([1.0, 2.0, 3.0])["max"] == 3.0
+
+
+def test_reports_come_back_on_the_replay_clock_per_venue():
+    slow = LatencyProfile(send=FixedLatency(10), ack=FixedLatency(5), fill=FixedLatency(20))
+    engine = MatchingEngine(ticks=TICKS, latency={"IBKR": slow})
+    engine.on_book(_book(0))
+    engine.submit(_order("a", 100.0, venue="ibkr"))
+    engine.submit(_order("b", 99.75))  # default profile: instant both ways, but queued behind "a"
+    assert engine.on_book(_book(12)) == []  # ack of "a" still on the way back
+
+    out = engine.on_book(_book(15))
+    assert [(e.order_id, e.status, e.timestamp) for e in out] == [("a", OrderStatus.ACK, _at(15)), ("b", OrderStatus.ACK, _at(15))]
+    assert out[0].raw["exchange_ts"] == _at(10).isoformat() and out[0].raw["latency_ms"] == "15.000"
+
+    assert engine.on_trade(_print(100.0, 10, "sell", 30)) == []
+    (fill,) = engine.on_trade(_print(100.5, 1, "buy", 50))
+    assert fill.status == OrderStatus.FILL and fill.timestamp == _at(50) and fill.raw["latency_ms"] == "20.000"
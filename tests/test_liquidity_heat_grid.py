@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from engines.liquidity_map.engine import LiquidityMapEngine
+from engines.liquidity_map.grid import HeatGrid
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry({"ES": 0.25})
+
+
+def _dom(bid_size, seconds):
+    payload = {"bids": [[100.0, bid_size]], "asks": [[100.25, 5]]}
+    return MarketEvent(event_type="dom_snapshot", timestamp=T0 + timedelta(seconds=seconds), source="test", symbol="ES", payload=payload)
+
+
+def _engine(slice_seconds=1.0):
+    bus = EventBus()
+    engine = LiquidityMapEngine(bus, rows=40, columns=8, slice_seconds=slice_seconds, margin=4, ticks=TICKS)
+    published = []
+    engine.bus.publish = lambda evt: published.append(evt.payload)
+    return engine, published
+
+
+def test_time_weighted_columns_published_on_slice_close():
+    engine, published = _engine()
+    engine.on_dom(_dom(10, 0.0))
+    engine.on_dom(_dom(30, 0.5))  # 10 rested for 0.5s
+    assert published == []
+    engine.on_dom(_dom(30, 1.25))  # 30 rested 0.5s in slice 0 and 0.25s in slice 1
+    assert len(published) == 1
+    col = published[0]
+    bid_row = 400 - col["origin_tick"]
+    assert bid_row in col["rows"]
+    assert col["bid"][col["rows"].index(bid_row)] == pytest.approx(10 * 0.5 + 30 * 0.5)
+    assert col["ask"][col["rows"].index(bid_row + 1)] == pytest.approx(5.0)
+    assert col["tick_size"] == 0.25 and col["slice_seconds"] == 1.0
+
+
+def test_non_dyadic_slices_advance_and_conserve_time():
+    engine, published = _engine(slice_seconds=0.1)
+    for i in range(50):
+        engine.on_dom(_dom(10, i * 0.1))
+    assert len(published) == 49  # one column per slice closed, none stuck on a float boundary
+    engine.flush("ES")
+    rested = sum(sum(col["ask"]) for col in published) / 5.0
+    assert rested == pytest.approx(4.9, rel=1e-5)
+
+
+def test_mirror_grid_matches_engine_after_recentre():
+    engine, published = _engine()
+    for i in range(6):
+        payload = {"bids": [[100.0 + i * 5, 10]], "asks": [[100.25 + i * 5, 5]]}
+        engine.on_dom(MarketEvent(event_type="dom_snapshot", timestamp=T0 + timedelta(seconds=i), source="test", symbol="ES", payload=payload))
+    engine.flush("ES")
+    mirror = HeatGrid(40, 8, 1.0)
+    for col in published:
+        mirror.apply_column(col["slice"], col["origin_tick"], col["rows"], col["bid"], col["ask"])
+    grid = engine.state["ES"].grid
+    assert mirror.origin == grid.origin
+    assert mirror.ordered_columns() == grid.ordered_columns()
+    for col in mirror.ordered_columns():
+        assert np.array_equal(mirror.bid[:, col], grid.bid[:, col])
+
+
+def test_grid_shift_clears_scrolled_rows():
+    grid = HeatGrid(rows=4, columns=2)
+    grid.set_origin(10)
+    col = grid.open_slice(0)
+    grid.add(col, {10: 1.0, 13: 4.0}, 1.0, True)
+    grid.set_origin(12)
+    assert grid.bid[:, col].tolist() == [0.0, 4.0, 0.0, 0.0]
+    grid.set_origin(100)
+    assert not grid.bid.any()
@@ -0,0 +1,121 @@
+import time
+from datetime import datetime, timezone
+
+from core.event_bus import EventBus
+from engines.microstructure.engine import MicrostructureEngine
+from engines.microstructure.snapshot import merge_snapshot
+from models.market_event import MarketEvent
+
+
+def _evt(event_type, payload):
+    return MarketEvent(event_type=event_type, timestamp=datetime.now(timezone.utc), source="test", symbol="ES", payload=payload)
+
+
+def _run(engine, events):
+    bus = engine.bus
+    captured = []
+    bus.subscribe("microstructure", lambda evt: captured.append(evt.payload))
+    for evt in events:
+        engine.on_event(evt)
+    time.sleep(0.2)
+    bus.stop()
+    return captured
+
+
+def test_every_n_coalesces_updates():
+    engine = MicrostructureEngine(EventBus(), ["ES"], every_n=3)
+    out = _run(engine, [_evt("tick", {"mid": 100.0 + i}) for i in range(7)])
+    assert len(out) == 2
+    assert out[-1]["snapshot"]["mid"] == 105.0
+    assert engine.coalesced == 5
+
+
+def test_min_interval_holds_back_until_flush():
+    engine = MicrostructureEngine(EventBus(), ["ES"], min_interval_ms=10_000)
+    engine.on_event(_evt("tick", {"mid": 100.0}))
+    engine.on_event(_evt("tick", {"mid": 101.0}))
+    assert engine.published == 1 and engine.coalesced == 1
+    engine.flush()
+    assert engine.published == 2
+    engine.flush()
+    assert engine.published == 2
+    engine.bus.stop()
+
+
+def test_heavy_fields_sent_only_when_version_changes():
+    engine = MicrostructureEngine(EventBus(), ["ES"])
+    out = _run(
+        engine,
+        [
+            _evt("trade", {"price": 100.25, "size": 2, "side": "buy"}),
+            _evt("tick", {"mid": 100.5}),
+        ],
+    )
+    first, second = out[0]["snapshot"], out[1]["snapshot"]
+    assert first["footprint"] and first["footprint_version"] == 1
+    assert "footprint" not in second and second["footprint_version"] == 1
+    assert "liquidity_map" not in second
+
+
+def test_liquidity_map_version_moves_only_when_the_book_changes():
+    engine = MicrostructureEngine(EventBus(), ["ES"])
+    book = {"bid": 100.0, "ask": 100.5, "ladder": {"100.0": {"bid": 5}, "100.5": {"ask": 7}}}
+    out = _run(
+        engine,
+        [
+            _evt("dom_snapshot", book),
+            _evt("dom_snapshot", book),
+            _evt("dom_snapshot", {**book, "ladder": {"100.0": {"bid": 6}, "100.5": {"ask": 7}}}),
+        ],
+    )
+    first, repeat, changed = (p["snapshot"] for p in out)
+    assert first["liquidity_map"] and first["liquidity_map_version"] == 1
+    assert "liquidity_map" not in repeat and repeat["liquidity_map_version"] == 1
+    assert changed["liquidity_map_version"] == 2 and sum(changed["liquidity_map"].values()) == 13
+
+
+def test_delta_mode_sends_changed_fields_only():
+    engine = MicrostructureEngine(EventBus(), ["ES"], delta_mode=True)
+    out = _run(
+        engine,
+        [
+            _evt("dom_snapshot", {"bid": 100.0, "ask": 100.5, "bid_size": 20, "ask_size": 10}),
+            _evt("tick", {"mid": 100.5}),
+        ],
+    )
+    assert all(p["delta"] for p in out)
+    second = out[1]["snapshot"]
+    assert second["mid"] == 100.5
+    assert "bid" not in second and "imbalance" not in second
+    view = {}
+    for p in out:
+        merge_snapshot(view, p["snapshot"])
+    assert view["bid"] == 100.0 and view["mid"] == 100.5
+
+
+def test_timer_flushes_trailing_update():
+    bus = EventBus()
+    engine = MicrostructureEngine(bus, ["ES"], min_interval_ms=20)
+    engine.start()
+    captured = []
+    bus.subscribe("microstructure", lambda evt: captured.append(evt.payload["snapshot"]["mid"]))
+    bus.publish(_evt("tick", {"mid": 100.0}))
+    bus.publish(_evt("tick", {"mid": 101.0}))
+    time.sleep(0.2)
+    engine.stop()
+    bus.stop()
+    assert captured == [100.0, 101.0]
+
+
+def test_timer_flushes_every_n_remainder_without_min_interval():
+    bus = EventBus()
+    engine = MicrostructureEngine(bus, ["ES"], every_n=5, flush_ms=20)
+    engine.start()
+    captured = []
+    bus.subscribe("microstructure", lambda evt: captured.append(evt.payload["snapshot"]["mid"]))
+    for mid in (100.0, 101.0, 102.0):  # fewer than every_n, then the feed pauses
+        bus.publish(_evt("tick", {"mid": mid}))
+    time.sleep(0.2)
+    engine.stop()
+    bus.stop()
+    assert captured == [102.0]
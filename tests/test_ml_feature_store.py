@@ -0,0 +1,99 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+import build_feature_store
+from core.event_bus import EventBus
+from engines.microstructure.book import book_sides
+from core.rolling import RollingStats
+from engines.ml_features import ML_FEATURE_SCHEMA, FeatureStore, MLFeatureBuilder, MLFeatureEngine, build_feature_store as build_store
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _evt(event_type, payload, i=0, symbol="ES"):
+    return MarketEvent(event_type=event_type, timestamp=T0 + timedelta(seconds=i), source="test", symbol=symbol, payload=payload)
+
+
+def _book(bid, ask, bid_size, ask_size, depth=3):
+    dom = [{"price": bid - 0.25 * k, "bid_size": bid_size, "ask_size": 0} for k in range(depth)]
+    dom += [{"price": ask + 0.25 * k, "bid_size": 0, "ask_size": ask_size * (k + 1)} for k in range(depth)]
+    return {"dom": dom}
+
+
+def _col(row, name):
+    return row[ML_FEATURE_SCHEMA.index(name)]
+
+
+def test_rolling_stats_matches_numpy():
+    values = np.random.default_rng(1).normal(size=50)
+    stats = RollingStats(10)
+    for v in values:
+        stats.push(float(v))
+    assert np.isclose(stats.mean, values[-10:].mean())
+    assert np.isclose(stats.std, values[-10:].std())
+    assert stats.count == 10
+
+
+def test_book_sides_orders_levels_best_first():
+    bids, asks = book_sides({"bids": [[99.0, 1], [100.0, 2]], "asks": [{"price": 101.0, "size": 3}, {"price": 100.5, "size": 4}]})
+    assert bids == [(100.0, 2.0), (99.0, 1.0)] and asks == [(100.5, 4.0), (101.0, 3.0)]
+    assert book_sides({"bid": 1.0, "ask": 2.0, "bid_size": 5, "ask_size": 6}) == ([(1.0, 5.0)], [(2.0, 6.0)])
+
+
+def test_builder_computes_book_and_trade_features():
+    builder = MLFeatureBuilder(window=3, long_window=5)
+    row = builder.on_event(_evt("dom_snapshot", _book(100.0, 100.25, 10, 10)))
+    assert _col(row, "mid") == 100.125 and _col(row, "spread") == 0.25
+    assert _col(row, "imbalance_1") == 0.0
+    assert np.isclose(_col(row, "imbalance_5"), (30 - 60) / 90)
+    row = builder.on_event(_evt("dom_snapshot", _book(100.0, 100.25, 30, 10), 1))
+    assert _col(row, "ofi") == 20.0
+    assert _col(row, "microprice") > _col(row, "mid")
+    row = builder.on_event(_evt("trade", {"price": 100.25, "size": 4, "side": "buy"}, 2))
+    row = builder.on_event(_evt("trade", {"price": 100.0, "size": 1, "side": "sell"}, 3))
+    assert _col(row, "trade_delta") == -1.0 and _col(row, "cumulative_delta") == 3.0
+    assert _col(row, "ofi") == 0.0 and _col(row, "ofi_sum") == 20.0
+    assert builder.on_event(_evt("heartbeat", {})) is None
+
+
+def test_live_engine_and_offline_store_agree(tmp_path):
+    events = [_evt("dom_snapshot", _book(100.0 + 0.25 * (i % 3), 100.25 + 0.25 * (i % 3), 5 + i, 7), i) for i in range(6)]
+    events += [_evt("trade", {"price": 100.5, "size": 2, "side": "buy"}, 6), _evt("tick", {"mid": 100.4}, 7, symbol="NQ")]
+
+    bus = EventBus()
+    live = []
+    bus.subscribe("ml_features", lambda evt: live.append(evt.payload["vector"]))
+    engine = MLFeatureEngine(bus)
+    for evt in events:
+        engine.on_event(evt)
+    time.sleep(0.2)
+    engine.stop()
+    bus.stop()
+
+    store = build_store(events)
+    path = tmp_path / "features.npz"
+    store.save(str(path))
+    loaded = FeatureStore.load(str(path))
+    assert sorted(loaded.symbols) == ["ES", "NQ"]
+    assert np.array_equal(loaded.matrix("ES"), np.vstack(live[:7]))
+    assert loaded.timestamps("ES")[-1] == np.datetime64("2025-01-02T14:30:06")
+    assert loaded.column("NQ", "mid").tolist() == [100.4]
+
+
+def test_cli_writes_store(tmp_path):
+    src = tmp_path / "events.json"
+    src.write_text(
+        json.dumps(
+            [
+                {"timestamp": 1_700_000_000 + i, "event_type": "dom_snapshot", "symbol": "ES", "payload": _book(100.0, 100.25, 10, 5)}
+                for i in range(3)
+            ]
+        )
+    )
+    out = tmp_path / "store.npz"
+    assert build_feature_store.main(["--file", str(src), "--out", str(out)]) == 0
+    assert FeatureStore.load(str(out)).matrix("ES").shape == (3, len(ML_FEATURE_SCHEMA))
@@ -1,6 +1,7 @@
 from observability.health import HealthStatus
 from observability.watchdogs import Watchdogs
 from observability.metrics_exporter import MetricsExporter
+from observability.metrics_publisher import MetricsPublisher
 
 
 def test_observability_components():
@@ -16,3 +17,30 @@ def test_observability_components():
     exporter.set_metric("orders", 1)
     rendered = exporter.render_prometheus()
     assert "orders" in rendered
+
+
+def test_metrics_publisher_flattens_sources_into_one_event():
+    published = []
+    bus = type("bus", (), {"publish": lambda self, evt: published.append(evt)})()
+    metrics = MetricsPublisher(bus)
+    metrics.add("strategy_host", lambda: {"rec[ES]": {"processed": 3, "gate": {"passed": 1}}})
+    metrics.add("broken", lambda: 1 / 0)  # logged, the other sources still go out
+    payload = metrics.publish()
+    assert payload == {"strategy_host.rec[ES].processed": 3, "strategy_host.rec[ES].gate.passed": 1}
+    assert published[0].event_type == "metrics" and published[0].payload == payload
+
+
+def test_detector_timings_and_risk_latency_reach_the_metrics_event():
+    from engines.detectors.pipeline import DetectorPipeline
+    from models.order import OrderRequest, OrderSide, OrderType
+    from risk.engine import RiskEngine
+
+    published = []
+    bus = type("bus", (), {"publish": lambda self, evt: published.append(evt), "subscribe": lambda self, *a: None})()
+    risk = RiskEngine({"throttle_max": 100})
+    risk.evaluate(OrderRequest(order_id="o", symbol="ES", side=OrderSide.BUY, quantity=1, order_type=OrderType.MARKET))
+    metrics = MetricsPublisher(bus)
+    metrics.add("detectors", DetectorPipeline(bus).timings)
+    metrics.add("risk", risk.latency_stats)
+    payload = metrics.publish()
+    assert payload["risk.limits.count"] == 1 and "risk.limits.p99_us" in payload
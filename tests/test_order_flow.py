@@ -0,0 +1,82 @@
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from engines.microstructure.engine import MicrostructureEngine
+from engines.microstructure.features import FEATURE_SCHEMA
+from engines.microstructure.order_flow import OrderFlowEngine
+from models.market_event import MarketEvent
+
+
+def _evt(event_type, payload, symbol="ES"):
+    return MarketEvent(event_type=event_type, timestamp=datetime.now(timezone.utc), source="test", symbol=symbol, payload=payload)
+
+
+def _ladder(bid_sizes, ask_sizes, best_bid=100.0, tick=0.25):
+    return {
+        "bids": [{"price": best_bid - tick * i, "size": s} for i, s in enumerate(bid_sizes)],
+        "asks": [{"price": best_bid + tick * (i + 1), "size": s} for i, s in enumerate(ask_sizes)],
+    }
+
+
+def test_multi_level_ofi_attributes_flow_to_tiers():
+    engine = OrderFlowEngine(window=10)
+    engine.on_dom(_evt("dom_snapshot", _ladder([10] * 10, [10] * 10)))
+    st = engine.on_dom(_evt("dom_snapshot", _ladder([10, 10, 10, 25] + [10] * 6, [10] * 9 + [4])))
+    assert st.last_ofi == [0.0, 15.0, 21.0]
+    st = engine.on_dom(_evt("dom_snapshot", _ladder([10, 10, 10, 25] + [10] * 6, [7] + [10] * 8 + [4])))
+    assert st.last_ofi == [3.0, 3.0, 3.0]
+    assert engine.features("ES")["ofi_10"] == 24.0
+
+
+def test_price_moves_follow_ofi_definition():
+    engine = OrderFlowEngine(tiers=(1,), window=5)
+    engine.on_dom(_evt("dom_snapshot", {"bid": 100.0, "ask": 100.5, "bid_size": 8, "ask_size": 6}))
+    # bid improves: full new size counts; ask retreats: old ask size counts as buy flow
+    st = engine.on_dom(_evt("dom_snapshot", {"bid": 100.25, "ask": 100.75, "bid_size": 3, "ask_size": 9}))
+    assert st.last_ofi == [3.0 + 6.0]
+
+
+def test_delta_updates_keep_aggregates_consistent():
+    rng = random.Random(7)
+    engine = OrderFlowEngine(window=1000)
+    for _ in range(500):
+        side = rng.choice(["bid", "ask"])
+        level = rng.randrange(12)
+        op = rng.choice(["insert", "update", "delete"])
+        price = 100.0 - level * 0.25 if side == "bid" else 100.25 + level * 0.25
+        engine.on_dom_delta(_evt("dom_delta", {"side": side, "level": level, "operation": op, "price": price, "size": rng.randint(1, 50)}))
+    st = engine.state["ES"]
+    for t, tier in enumerate(st.tiers):
+        assert st.bid_qty[t] == pytest.approx(sum(st.bid_sz[:tier]))
+        assert st.ask_qty[t] == pytest.approx(sum(st.ask_sz[:tier]))
+        assert st.bid_notional[t] == pytest.approx(sum((p or 0.0) * s for p, s in zip(st.bid_px[:tier], st.bid_sz[:tier])))
+    assert st.updates == 500
+    assert engine.on_dom_delta(_evt("dom_delta", {"added_bid": 5})) is None
+
+
+def test_microprice_and_slopes():
+    engine = OrderFlowEngine(ticks=TickSizeRegistry(fixed=0.25))
+    engine.on_dom(_evt("dom_snapshot", _ladder([30, 10, 10, 10, 10], [10, 20, 20, 20, 20])))
+    f = engine.features("ES")
+    assert f["microprice"] == pytest.approx((100.0 * 10 + 100.25 * 30) / 40)
+    assert f["bid_slope"] == pytest.approx(40 / 4)
+    assert f["ask_slope"] == pytest.approx(80 / 4)
+    bid_vwap = (100.0 * 30 + 99.75 * 10 + 99.5 * 10 + 99.25 * 10 + 99.0 * 10) / 70
+    ask_vwap = (100.25 * 10 + (100.5 + 100.75 + 101.0 + 101.25) * 20) / 90
+    assert f["weighted_microprice"] == pytest.approx((bid_vwap * 90 + ask_vwap * 70) / 160)
+
+
+def test_snapshot_and_vector_carry_order_flow():
+    engine = MicrostructureEngine(EventBus(), ["ES"])
+    engine.on_event(_evt("dom_snapshot", _ladder([10] * 10, [10] * 10)))
+    engine.on_event(_evt("dom_snapshot", _ladder([20] + [10] * 9, [10] * 10)))
+    snap = engine._build_snapshot("ES")
+    assert snap.ofi_1 == snap.ofi_10 == 10.0
+    row = engine.features.extract_row(snap)
+    assert row[FEATURE_SCHEMA.index("ofi_5")] == snap.ofi_5
+    assert row[FEATURE_SCHEMA.index("microprice")] == pytest.approx(snap.microprice)
+    engine.bus.stop()
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from core.rolling import TimeWindowSum
+from engines.microstructure.engine import MicrostructureEngine
+from engines.microstructure.patterns import PatternEngine
+from models.market_event import MarketEvent
+from strategy.pattern_detector import classify_pattern
+from strategy.scoring import SignalScorer
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _evt(event_type, payload, seconds):
+    return MarketEvent(event_type=event_type, timestamp=T0 + timedelta(seconds=seconds), source="test", symbol="ES", payload=payload)
+
+
+def _book(bids, asks, seconds):
+    return _evt("dom_snapshot", {"bids": [[p, s] for p, s in bids], "asks": [[p, s] for p, s in asks]}, seconds)
+
+
+def test_time_window_spills_into_previous_period():
+    prev = TimeWindowSum(5.0)
+    cur = TimeWindowSum(5.0, spill=prev)
+    cur.push(0.0, 10.0)
+    cur.push(3.0, 4.0)
+    cur.expire(6.0)
+    assert (cur.total, prev.total) == (4.0, 10.0)
+    cur.expire(12.0)
+    assert (cur.total, prev.total) == (0.0, 4.0)
+
+
+def test_absorption_and_divergence_from_trades():
+    patterns = PatternEngine(window_seconds=5.0, ticks=TickSizeRegistry(fixed=0.25))
+    for i in range(6):
+        patterns.on_trade(_evt("trade", {"price": 100.0, "size": 100, "side": "buy"}, i * 0.5))
+    features = patterns.features("ES")
+    assert features["delta"] == 600 and features["shift"] == 0.0
+    assert patterns.tags("ES") == ["absorption", "divergence"]
+    assert classify_pattern(features) == "absorption"
+    patterns.on_trade(_evt("trade", {"price": 100.0, "size": 1, "side": "sell"}, 10.0))
+    assert patterns.features("ES")["delta"] == -1  # earlier prints aged out
+
+
+def test_spoof_from_book_diffs_and_vacuum_from_volume_drop():
+    patterns = PatternEngine(window_seconds=5.0, ticks=TickSizeRegistry(fixed=0.25))
+    patterns.on_dom(_book([(99.75, 10), (99.5, 10)], [(100.0, 10), (100.25, 10)], 0.0))
+    patterns.on_dom(_book([(99.75, 200), (99.5, 10)], [(100.0, 5), (100.25, 10)], 1.0))
+    features = patterns.features("ES")
+    assert features["added_liq"] == 190 and features["removed_liq"] == 5
+    assert "spoof" in patterns.tags("ES")
+
+    patterns.on_trade(_evt("trade", {"price": 100.0, "size": 80, "side": "buy"}, 1.5))
+    patterns.on_dom(_book([(99.75, 200), (99.5, 10)], [(100.0, 5), (100.25, 10)], 7.0))
+    assert patterns.features("ES")["volume_drop"] == 80
+    assert "vacuum" in patterns.tags("ES", imbalance=0.8)
+    assert "vacuum" not in patterns.tags("ES", imbalance=0.1)
+
+
+def test_snapshot_tags_feed_scorer():
+    bus = EventBus()
+    engine = MicrostructureEngine(bus, ["ES"])
+    published = []
+    bus.publish = published.append
+    for i in range(6):
+        engine.on_event(_evt("trade", {"price": 100.0, "size": 100, "side": "buy"}, i * 0.5))
+    payload = published[-1].payload
+    assert "absorption" in payload["snapshot"]["tags"]
+    assert payload["snapshot"]["features"]["tag_absorption"] == 1.0
+    # |imbalance| + |delta| * 0.001 + absorption bonus
+    assert SignalScorer().score(payload["vector"], []) == pytest.approx(0.6 + 0.1)
+    bus.stop()
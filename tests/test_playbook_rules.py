@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pytest
+
+from engines.microstructure.features import FEATURE_SCHEMA
+from strategy.playbook import PlaybookEngine
+
+RULES = """
+rules:
+  - name: absorbed_long
+    direction: buy
+    when:
+      - imbalance >= 0.2
+      - tag_absorption == 1
+  - name: spoofed
+    direction: sell
+    action: skip
+    when: liq_spoof > 0
+  - name: fade
+    direction: sell
+    when:
+      - imbalance <= -0.1
+"""
+
+
+def _write(path, text, mtime):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+def _vec(tags=(), **features):
+    return FEATURE_SCHEMA.vector(features, tags)
+
+
+def test_yaml_rules_compile_in_order(tmp_path):
+    path = tmp_path / "playbook.yaml"
+    _write(path, RULES, 1_000)
+    playbook = PlaybookEngine(path=str(path))
+    assert playbook.evaluate({}, _vec(["absorption"], imbalance=0.3), []) == {"action": "enter", "direction": "buy"}
+    assert playbook.evaluate({}, _vec(imbalance=0.3), []) == {"action": None}
+    assert playbook.evaluate({}, _vec(imbalance=-0.5, liq_spoof=1.0), [])["action"] == "skip"
+    assert playbook.evaluate({}, {"imbalance": -0.5}, []) == {"action": "enter", "direction": "sell"}
+
+    matrix = np.vstack([_vec(["absorption"], imbalance=0.3), _vec(imbalance=-0.5, liq_spoof=1.0), _vec(imbalance=-0.5)])
+    assert playbook.evaluate_batch(matrix).tolist() == [1, 0, -1]
+
+
+def test_hot_reload_swaps_rules_and_survives_bad_file(tmp_path):
+    path = tmp_path / "playbook.yaml"
+    _write(path, RULES, 1_000)
+    playbook = PlaybookEngine(path=str(path))
+    assert playbook.maybe_reload() is False
+
+    _write(path, "rules:\n  - direction: buy\n    when: [imbalance >= 0.05]\n", 2_000)
+    assert playbook.maybe_reload() is True
+    assert playbook.evaluate({}, _vec(imbalance=0.06), [])["direction"] == "buy"
+
+    _write(path, "rules:\n  - direction: buy\n    when: [no_such_feature >= 1]\n", 3_000)
+    assert playbook.maybe_reload() is False
+    assert playbook.evaluate({}, _vec(imbalance=0.06), [])["direction"] == "buy"
+
+
+@pytest.mark.parametrize(
+    "rule",
+    [
+        {"direction": "long", "when": ["imbalance >= 0"]},
+        {"direction": "buy", "when": ["imbalance => 0"]},
+        {"direction": "buy", "when": ["__import__('os') >= 0"]},
+        {"direction": "buy"},
+        {"direction": "buy", "action": "exit", "when": ["imbalance >= 0"]},  # a typo'd action would never fire
+    ],
+)
+def test_invalid_rules_are_rejected(rule):
+    playbook = PlaybookEngine()
+    playbook.rules = [rule]
+    with pytest.raises((ValueError, KeyError)):
+        playbook.compile()
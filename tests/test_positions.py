@@ -0,0 +1,103 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from core.event_bus import EventBus
+from execution.adapters.sim import SimAdapter
+from execution.router import ExecutionRouter
+from models.market_event import MarketEvent
+from models.order import OrderEvent, OrderRequest, OrderSide, OrderStatus, OrderType
+from risk.engine import RiskEngine
+from risk.positions import PositionManager
+
+NOW = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _order(order_id, side, qty):
+    return OrderRequest(order_id=order_id, symbol="ES", side=side, quantity=qty, order_type=OrderType.MARKET)
+
+
+def _report(order_id, status, qty=0.0, price=None, raw=None):
+    evt = OrderEvent(order_id=order_id, symbol="ES", status=status, timestamp=NOW, filled_qty=qty, avg_price=price, raw=raw or {})
+    return MarketEvent(event_type="order_event", timestamp=NOW, source="execution", symbol="ES", payload=evt.model_dump())
+
+
+def test_fills_build_position_and_realize_pnl():
+    bus = EventBus()
+    positions = PositionManager(bus, mark_seconds=0)
+    positions.reserve(_order("a", OrderSide.BUY, 3))
+    positions.on_order_event(_report("a", OrderStatus.PARTIAL, 1, 100.0))
+    positions.on_order_event(_report("a", OrderStatus.FILL, 3, (100.0 + 2 * 101.0) / 3))  # cumulative, as IBKR
+    pos = positions.positions["ES"]
+    assert (pos.qty, pos.working) == (3.0, 0.0) and pos.avg_price == pytest.approx(100 + 2 / 3)
+
+    positions.reserve(_order("b", OrderSide.SELL, 5))
+    positions.on_order_event(_report("b", OrderStatus.FILL, 5, 102.0))
+    assert pos.qty == -2.0 and pos.avg_price == 102.0
+    assert pos.realized == pytest.approx(3 * (102.0 - (100 + 2 / 3)))
+
+    published = []
+    bus.publish = published.append
+    positions.on_tick(MarketEvent(event_type="tick", timestamp=NOW, source="test", symbol="ES", payload={"mid": 101.0}))
+    assert pos.unrealized == 0.0  # marked on the timer, not per tick
+    positions.on_timer(MarketEvent(event_type="timer", timestamp=NOW, source="timer", symbol="", payload={"name": "positions_mark"}))
+    assert pos.unrealized == pytest.approx(2.0)
+    assert published[-1].event_type == "position_update" and published[-1].payload["positions"]["ES"]["qty"] == -2.0
+    bus.stop()
+
+
+def test_risk_exposure_reconciled_with_cancels_and_rejects():
+    bus = EventBus()
+    positions = PositionManager(bus, mark_seconds=0)
+    risk = RiskEngine({"symbols": ["ES"], "max_size": 10, "max_exposure": 5, "throttle_max": 100}, positions=positions)
+    assert risk.evaluate(_order("a", OrderSide.BUY, 4)).approved
+    assert risk.evaluate(_order("b", OrderSide.BUY, 2)).reasons == ["exposure_limit"]
+
+    positions.on_order_event(_report("a", OrderStatus.PARTIAL, 1, 100.0))
+    positions.on_order_event(_report("a", OrderStatus.CANCEL))
+    assert positions.exposure("ES") == 1.0
+    assert risk.evaluate(_order("c", OrderSide.BUY, 4)).approved
+    positions.on_order_event(_report("c", OrderStatus.REJECT))
+    assert positions.exposure("ES") == 1.0
+    bus.stop()
+
+
+def test_cumulative_and_repeated_status_reports_apply_once():
+    bus = EventBus()
+    positions = PositionManager(bus, mark_seconds=0)
+    positions.reserve(_order("ib", OrderSide.BUY, 3))
+    for qty, avg in ((1, 100.0), (1, 100.0), (3, 101.0), (3, 101.0)):  # IBKR repeats statuses
+        positions.on_order_event(_report("ib", OrderStatus.PARTIAL, qty, avg))
+    pos = positions.positions["ES"]
+    assert (pos.qty, pos.working) == (3.0, 0.0) and pos.avg_price == pytest.approx(101.0)
+
+    positions.reserve(_order("sim", OrderSide.SELL, 3))  # matching engine: per-fill size, cum_qty in raw
+    positions.on_order_event(_report("sim", OrderStatus.PARTIAL, 1, 103.0, {"cum_qty": "1.0"}))
+    positions.on_order_event(_report("sim", OrderStatus.FILL, 2, 104.0, {"cum_qty": "3.0"}))
+    assert pos.qty == 0.0 and pos.realized == pytest.approx(2.0 + 2 * 3.0)
+
+    positions.on_tick(MarketEvent(event_type="tick", timestamp=NOW, source="test", symbol="ES", payload={"mid": 104.5}))
+    positions.reserve(_order("mkt", OrderSide.BUY, 2))
+    positions.on_order_event(_report("mkt", OrderStatus.FILL, 2, 0.0))  # plain SIM market order: no price
+    assert (pos.qty, pos.avg_price) == (2.0, 104.5) and pos.realized == pytest.approx(8.0)
+    bus.stop()
+
+
+def test_plain_sim_market_fills_count_towards_exposure():
+    bus = EventBus()
+    positions = PositionManager(bus, mark_seconds=0)
+    positions.start()
+    risk = RiskEngine({"symbols": ["ES"], "max_size": 10, "max_exposure": 5, "throttle_max": 100}, positions=positions)
+    router = ExecutionRouter(bus, SimAdapter(bus))
+    bus.publish(MarketEvent(event_type="tick", timestamp=NOW, source="test", symbol="ES", payload={"mid": 100.0}))
+    first = _order("a", OrderSide.BUY, 4)
+    assert risk.evaluate(first).approved
+    router.submit(first)  # MARKET: the plain SimAdapter fills it at 0.0
+    deadline = time.time() + 2.0
+    while "a" in router.working and time.time() < deadline:
+        time.sleep(0.01)
+    assert positions.positions["ES"].qty == 4.0 and positions.exposure("ES") == 4.0
+    assert risk.evaluate(_order("b", OrderSide.BUY, 2)).reasons == ["exposure_limit"]
+    positions.stop()
+    bus.stop()
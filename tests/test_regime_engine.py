@@ -0,0 +1,82 @@
+import time
+from datetime import datetime, timezone
+
+from core.event_bus import EventBus
+from engines.regime.engine import RegimeEngine
+from models.market_event import MarketEvent
+
+
+def _evt(event_type, payload, symbol="ES"):
+    return MarketEvent(event_type=event_type, timestamp=datetime.now(timezone.utc), source="test", symbol=symbol, payload=payload)
+
+
+def _micro(cumulative_delta):
+    return _evt("microstructure", {"snapshot": {"cumulative_delta": cumulative_delta}})
+
+
+def _engine(**kw):
+    bus = EventBus()
+    engine = RegimeEngine(bus, interval_ms=0, **kw)
+    out = []
+    bus.subscribe("regime_update", lambda evt: out.append(evt.payload["regime"]))
+    return engine, out
+
+
+def test_inputs_do_not_publish_and_transitions_need_confirmation():
+    engine, out = _engine(trend_delta=100, delta_window=5, confirm=2)
+    engine.on_vol(_evt("volatility_update", {"regime": "normal", "range_ticks": 20}))
+    for _ in range(50):
+        engine.on_micro(_micro(0.0))
+    engine.evaluate()
+    engine.on_micro(_micro(150.0))
+    engine.evaluate()  # first trending vote
+    time.sleep(0.15)
+    assert out == ["ranging"]
+    engine.evaluate()
+    time.sleep(0.15)
+    assert out == ["ranging", "trending"]
+    assert engine.published == 2 and engine.evaluations == 3
+    engine.stop()
+    engine.bus.stop()
+
+
+def test_hysteresis_keeps_label_between_exit_and_entry():
+    engine, out = _engine(trend_delta=100, delta_window=2, confirm=1, exit_ratio=0.5)
+    engine.on_vol(_evt("volatility_update", {"regime": "normal", "range_ticks": 20}))
+    engine.on_micro(_micro(0.0))
+    engine.evaluate()
+    engine.on_micro(_micro(120.0))
+    engine.evaluate()
+    # flow falls to 60: below entry (100) but above exit (50) -> stays trending
+    engine.on_micro(_micro(180.0))
+    engine.evaluate()
+    engine.evaluate()
+    assert engine.state["ES"].regime == "trending"
+    engine.evaluate()  # window now flat
+    time.sleep(0.15)
+    assert out == ["ranging", "trending", "ranging"]
+    engine.stop()
+    engine.bus.stop()
+
+
+def test_compression_or_tight_range_means_squeezing():
+    engine, out = _engine(confirm=1)
+    engine.on_vol(_evt("volatility_update", {"regime": "compression", "range_ticks": 30}))
+    engine.on_vol(_evt("volatility_update", {"regime": "normal", "range_ticks": 2}, symbol="NQ"))
+    engine.evaluate()
+    assert engine.state["ES"].regime == engine.state["NQ"].regime == "squeezing"
+    engine.stop()
+    engine.bus.stop()
+
+
+def test_timer_drives_evaluation():
+    bus = EventBus()
+    engine = RegimeEngine(bus, interval_ms=20, confirm=1)
+    out = []
+    bus.subscribe("regime_update", lambda evt: out.append(evt.payload))
+    bus.publish(_evt("volatility_update", {"regime": "normal", "range_ticks": 20}))
+    time.sleep(0.2)
+    engine.stop()
+    bus.stop()
+    assert len(out) == 1 and out[0]["regime"] == "ranging" and out[0]["previous"] is None
+    assert engine.evaluations > 3
@@ -0,0 +1,47 @@
+import time
+
+from models.order import OrderRequest, OrderSide, OrderType
+from risk.engine import RiskEngine
+from risk.profile import RiskProfile
+
+
+def _order(qty=1.0, symbol="ES", side=OrderSide.BUY):
+    return OrderRequest(order_id="o", symbol=symbol, side=side, quantity=qty, order_type=OrderType.MARKET)
+
+
+def test_profile_merges_yaml_and_per_symbol_overrides(tmp_path):
+    path = tmp_path / "limits.yaml"
+    path.write_text("symbols: [ES, NQ]\nmax_size: 10\nthrottle_max: 5\nper_symbol:\n  NQ: {max_size: 2}\n")
+    profile = RiskProfile.load({"max_exposure": 100}, path=str(path))
+    assert profile.limits_for("ES").max_size == 10.0 and profile.limits_for("NQ").max_size == 2.0
+    assert profile.limits_for("NQ").max_exposure == 100.0
+    risk = RiskEngine(profile)
+    assert risk.evaluate(_order(3, "ES")).approved
+    assert risk.evaluate(_order(3, "NQ")).reasons == ["size_limit"]
+    assert risk.evaluate(_order(1, "CL")).reasons == ["symbol_not_allowed"]
+
+
+def test_throttle_ring_slides_and_sells_reduce_exposure():
+    risk = RiskEngine({"max_exposure": 1, "throttle_max": 2, "throttle_window": 0.05})
+    assert risk.evaluate(_order(1)).approved
+    assert risk.evaluate(_order(1, side=OrderSide.SELL)).approved
+    assert risk.evaluate(_order(1)).reasons == ["throttle_exceeded"]
+    time.sleep(0.06)
+    verdict = risk.evaluate(_order(1))
+    assert verdict.approved and verdict._decision is None
+    assert verdict.timestamp.tzinfo is not None and verdict.as_dict()["approved"] is True
+    assert verdict._decision is None  # the event payload path never builds the model
+    assert verdict.model_dump()["limits"]["throttle_max"] == 2
+
+
+def test_approve_path_under_ten_microseconds():
+    risk = RiskEngine({"symbols": ["ES"], "max_size": 10, "max_exposure": 1e12, "throttle_max": 10**6})
+    order = _order()
+    n = 20_000
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(n):
+            risk.evaluate(order)
+        best = min(best, (time.perf_counter() - start) / n)
+    assert best < 10e-6, f"{best * 1e6:.2f}us per approval"
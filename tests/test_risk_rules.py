@@ -0,0 +1,81 @@
+from core.event_bus import EventBus
+from models.order import OrderRequest, OrderSide, OrderType
+from risk.engine import RiskEngine
+from risk.positions import PositionManager
+from risk.rules import RiskRule
+from telemetry.metrics import LatencyHistogram
+
+
+def _order(qty=1.0):
+    return OrderRequest(order_id="o", symbol="ES", side=OrderSide.BUY, quantity=qty, order_type=OrderType.MARKET)
+
+
+class Soft(RiskRule):
+    name, hard = "soft", False
+
+    def check(self, order, now):
+        return "soft" if order.quantity > 2 else None
+
+
+def test_latency_histogram_buckets():
+    hist = LatencyHistogram()
+    for ns in (900, 1_100, 1_200, 50_000):
+        hist.record(ns)
+    assert hist.percentile(50) == 2047 and hist.percentile(100) == 50_000
+    assert hist.snapshot()["max_us"] == 50.0
+
+
+def test_rule_chain_short_circuits_and_times_each_rule():
+    bus = EventBus()
+    positions = PositionManager(bus, mark_seconds=0)
+    positions.mids["ES"] = 100.0
+    limits = {"collar_bps": 50, "daily_max_loss": 10, "max_msgs_per_sec": 3, "msg_rate_kill_switch": True, "throttle_max": 100}
+    risk = RiskEngine(limits, positions=positions)
+    risk.rules.insert(0, Soft())
+    assert [r.name for r in risk.rules] == ["soft", "price_collar", "daily_max_loss", "message_rate"]
+
+    far = OrderRequest(order_id="f", symbol="ES", side=OrderSide.BUY, quantity=3, order_type=OrderType.LIMIT, limit_price=101.0)
+    assert risk.evaluate(far).reasons == ["soft", "price_collar"]  # collar is hard: message_rate never ran
+    assert risk.rules[3].latency.count == 0
+
+    assert risk.evaluate(_order(1)).approved and risk.evaluate(_order(1)).approved
+    positions.position("ES").realized = -12.0
+    assert risk.evaluate(_order(1)).reasons == ["daily_max_loss"]
+    assert risk.kill_switch_engaged and risk.kill_switch.reason == "daily_max_loss"
+    positions.position("ES").realized = 0.0
+    risk.reset_kill_switch()
+    assert risk.evaluate(_order(1)).approved
+    assert risk.evaluate(_order(1)).reasons == ["message_rate"]  # 4th order within the second
+    assert risk.kill_switch.reason == "message_rate"
+
+    stats = risk.latency_stats()
+    assert list(stats) == ["limits", "soft", "price_collar", "daily_max_loss", "message_rate"]
+    assert stats["limits"]["count"] == 6 and stats["price_collar"]["rejected"] == 1
+    assert stats["message_rate"]["p99_us"] < 1000
+    bus.stop()
+
+
+def test_message_rate_soft_rejects_without_tripping_by_default():
+    risk = RiskEngine({"max_msgs_per_sec": 1, "throttle_max": 100})
+    assert risk.evaluate(_order(1)).approved
+    assert risk.evaluate(_order(1)).reasons == ["message_rate"]
+    assert not risk.kill_switch_engaged
+
+
+def test_daily_loss_baseline_rolls_at_midnight_not_on_first_order():
+    bus = EventBus()
+    positions = PositionManager(bus, mark_seconds=0)
+    risk = RiskEngine({"daily_max_loss": 10, "throttle_max": 100}, positions=positions)
+    es = positions.position("ES")
+    es.realized = -12.0  # lost before the first order of the session
+    assert risk.evaluate(_order(1)).reasons == ["daily_max_loss"]
+    risk.reset_kill_switch()
+
+    positions._day -= 1  # next UTC day: the mark timer snapshots the baseline
+    positions.mark_to_market()
+    assert positions.pnl_today() == 0.0 and risk.evaluate(_order(1)).approved
+    es.realized = -17.0
+    assert positions.pnl_today() == -5.0 and risk.evaluate(_order(1)).approved
+    es.realized = -22.0
+    assert risk.evaluate(_order(1)).reasons == ["daily_max_loss"]
+    bus.stop()
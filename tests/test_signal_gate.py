@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+from core.event_bus import EventBus
+from models.market_event import MarketEvent
+from strategy.orchestrator import StrategyOrchestrator
+from strategy.signal_gate import SignalGate
+from strategy.simple_strategy import SimpleStrategyEngine
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def test_flat_duplicate_and_cooldown_are_counted_per_reason():
+    gate = SignalGate(cooldown_seconds=2.0)
+    decisions = [
+        gate.allow("ES", "flat", 0.0),
+        gate.allow("ES", "buy", 0.0),
+        gate.allow("ES", "buy", 1.0),  # same direction: held until it flips
+        gate.allow("ES", "sell", 1.5),  # flip inside the cooldown
+        gate.allow("ES", "sell", 2.5),
+        gate.allow("NQ", "sell", 2.5),  # symbols are independent
+    ]
+    assert decisions == [False, True, False, False, True, True]
+    assert gate.counts == {"passed": 3, "flat": 1, "duplicate": 1, "cooldown": 1}
+    assert gate.stats()["by_symbol"]["NQ"]["passed"] == 1 and gate.suppressed == 3
+
+
+def test_dedup_window_lets_a_repeat_through_later():
+    gate = SignalGate(dedup_seconds=5.0)
+    assert gate.allow("ES", "buy", T0)
+    assert not gate.allow("ES", "buy", T0 + timedelta(seconds=4))
+    assert gate.allow("ES", "buy", T0 + timedelta(seconds=5))
+
+
+def _capture(bus):
+    published = []
+    bus.publish = lambda evt: published.append(evt)
+    return published
+
+
+def test_simple_strategy_drops_flat_and_repeats():
+    bus = EventBus()
+    strategy = SimpleStrategyEngine(bus, delta_threshold=10.0)
+    published = _capture(bus)
+    for i, delta in enumerate([0.0, 20.0, 30.0, -15.0]):
+        evt = MarketEvent(event_type="delta_update", timestamp=T0 + timedelta(seconds=i), source="delta_engine", symbol="ES", payload={"delta": delta})
+        strategy.on_delta(evt)
+    assert [e.payload["direction"] for e in published] == ["buy", "sell"]
+    assert strategy.gate.counts["flat"] == 1 and strategy.gate.counts["duplicate"] == 1
+
+
+def test_orchestrator_applies_cooldown_on_event_time():
+    bus = EventBus()
+    orchestrator = StrategyOrchestrator(bus, symbols=["ES"], gate=SignalGate(cooldown_seconds=1.0))
+    published = _capture(bus)
+    for seconds, imbalance in [(0.0, 0.3), (0.5, -0.3), (1.5, -0.3), (2.0, -0.4)]:
+        evt = MarketEvent(
+            event_type="microstructure",
+            timestamp=T0 + timedelta(seconds=seconds),
+            source="microstructure",
+            symbol="ES",
+            payload={"snapshot": {"features": {"imbalance": imbalance}, "tags": []}},
+        )
+        orchestrator.on_microstructure(evt)
+    assert [e.payload["direction"] for e in published] == ["buy", "sell"]
+    assert orchestrator.gate.counts["cooldown"] == 1 and orchestrator.gate.counts["duplicate"] == 1
+    bus.stop()
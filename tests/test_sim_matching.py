@@ -0,0 +1,126 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from engines.detectors.records import parse_book, parse_trade
+from execution.adapters.sim import SimAdapter
+from execution.adapters.sim_matching import MatchingEngine
+from models.market_event import MarketEvent
+from models.order import OrderRequest, OrderSide, OrderStatus, OrderType
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry(fixed=0.25)
+
+
+def _at(ms):
+    return T0 + timedelta(milliseconds=ms)
+
+
+def _book(bids, asks, ms=0):
+    payload = {"bids": [[p, s] for p, s in bids], "asks": [[p, s] for p, s in asks]}
+    return parse_book(MarketEvent(event_type="dom_snapshot", timestamp=_at(ms), source="test", symbol="ES", payload=payload), TICKS)
+
+
+def _print(price, size, side, ms=0):
+    payload = {"price": price, "size": size, "side": side}
+    return parse_trade(MarketEvent(event_type="trade", timestamp=_at(ms), source="test", symbol="ES", payload=payload), TICKS)
+
+
+def _order(order_id, side, qty, price=None, order_type=OrderType.LIMIT):
+    return OrderRequest(order_id=order_id, symbol="ES", side=side, quantity=qty, order_type=order_type, limit_price=price)
+
+
+def _fills(events):
+    return [(e.status, e.filled_qty, e.avg_price) for e in events if e.status in (OrderStatus.PARTIAL, OrderStatus.FILL)]
+
+
+def test_queue_position_advances_on_prints_and_cancels():
+    engine = MatchingEngine(ticks=TICKS)
+    engine.on_book(_book([(100.0, 10)], [(100.25, 10)]))
+    engine.submit(_order("a", OrderSide.BUY, 5, 100.0))
+    assert [e.status for e in engine.on_book(_book([(100.0, 10)], [(100.25, 10)], 1))] == [OrderStatus.ACK]
+
+    assert _fills(engine.on_trade(_print(100.0, 4, "sell", 2))) == []  # 6 still ahead
+    # 2 more traded, level shows 1: the other 3 ahead of us cancelled
+    assert _fills(engine.on_book(_book([(100.0, 1)], [(100.25, 10)], 3))) == []
+    assert _fills(engine.on_trade(_print(100.0, 2, "sell", 4))) == [(OrderStatus.PARTIAL, 1.0, 100.0)]
+    assert _fills(engine.on_trade(_print(100.0, 9, "sell", 5))) == [(OrderStatus.FILL, 4.0, 100.0)]
+    assert engine.resting("ES") == 0
+
+
+def test_marketable_limit_walks_book_then_rests():
+    engine = MatchingEngine(ticks=TICKS)
+    engine.on_book(_book([(100.0, 5)], [(100.25, 2), (100.5, 3), (100.75, 50)]))
+    engine.submit(_order("b", OrderSide.BUY, 10, 100.5))
+    out = engine.on_book(_book([(100.0, 5)], [(100.25, 2), (100.5, 3), (100.75, 50)], 1))
+    assert _fills(out) == [(OrderStatus.PARTIAL, 2.0, 100.25), (OrderStatus.PARTIAL, 3.0, 100.5)]
+    assert out[-1].raw == {"cum_qty": "5.0", "leaves_qty": "5.0", "exchange_ts": T0.isoformat(), "latency_ms": "0.000"}
+    assert engine.resting("ES") == 1  # touching the 100.5 ask we already took
+    # a print through our bid: filled at our price
+    assert _fills(engine.on_trade(_print(100.25, 1, "sell", 2))) == [(OrderStatus.FILL, 5.0, 100.5)]
+
+    engine.submit(_order("m", OrderSide.SELL, 8, order_type=OrderType.MARKET))
+    out = engine.on_book(_book([(100.0, 5)], [(100.25, 10)], 3))
+    assert _fills(out) == [(OrderStatus.PARTIAL, 5.0, 100.0)]
+    assert out[-1].status == OrderStatus.CANCEL and out[-1].reason == "no liquidity"
+
+
+def test_latency_delays_arrival_and_lets_fills_beat_cancels():
+    engine = MatchingEngine(latency_ms=50, ticks=TICKS)
+    engine.on_book(_book([(100.0, 0)], [(100.25, 10)]))
+    engine.submit(_order("c", OrderSide.BUY, 2, 100.0))
+    assert engine.on_trade(_print(100.0, 1, "sell", 20)) == []  # not at the exchange yet
+    out = engine.on_trade(_print(100.0, 1, "sell", 60))
+    assert out[0].status == OrderStatus.ACK and out[0].timestamp == _at(50)
+    assert _fills(out) == [(OrderStatus.PARTIAL, 1.0, 100.0)]
+    engine.cancel("c")
+    assert _fills(engine.on_trade(_print(100.0, 5, "sell", 70))) == [(OrderStatus.FILL, 1.0, 100.0)]
+    assert engine.on_trade(_print(100.0, 1, "sell", 200)) == []  # cancel found nothing left
+
+
+def test_stops_fire_only_when_a_print_crosses_their_trigger():
+    engine = MatchingEngine(ticks=TICKS)
+    engine.on_book(_book([(99.0, 10)], [(101.5, 10)]))
+    stops = (("b1", OrderSide.BUY, 101.0), ("b2", OrderSide.BUY, 101.25), ("b3", OrderSide.BUY, 102.0), ("s1", OrderSide.SELL, 99.0))
+    for order_id, side, stop in stops:
+        engine.submit(OrderRequest(order_id=order_id, symbol="ES", side=side, quantity=1, order_type=OrderType.STOP, stop_price=stop))
+    engine.on_book(_book([(99.0, 10)], [(101.5, 10)], 1))
+    engine.cancel("b2")
+    assert _fills(engine.on_trade(_print(100.0, 1, "buy", 2))) == []
+    out = engine.on_trade(_print(101.25, 1, "buy", 3))
+    assert [(e.order_id, e.status, e.avg_price) for e in out] == [("b1", OrderStatus.FILL, 101.5)]  # b2 was cancelled
+    assert _fills(engine.on_trade(_print(99.0, 1, "sell", 4))) == [(OrderStatus.FILL, 1.0, 99.0)]
+    book = engine.books["ES"]
+    assert book.buy_stops.ticks == [engine.ticks.to_tick("ES", 102.0)] and book.sell_stops.ticks == []
+
+
+def test_ten_thousand_resting_orders():
+    engine = MatchingEngine(ticks=TICKS)
+    engine.on_book(_book([(100.0, 0)], [(200.0, 1)]))
+    for i in range(10_000):
+        engine.submit(_order(f"o{i}", OrderSide.BUY, 1, 100.0 - (i % 100) * 0.25))
+    start = time.perf_counter()
+    engine.on_book(_book([(100.0, 0)], [(200.0, 1)], 1))
+    filled = 0
+    for i in range(2_000):
+        filled += len(_fills(engine.on_trade(_print(100.0 - (i % 50) * 0.25, 3, "sell", 2 + i))))
+    elapsed = time.perf_counter() - start
+    assert engine.resting("ES") == 10_000 - filled and filled > 0
+    assert elapsed < 5.0
+
+
+def test_adapter_matches_against_bus_market_data():
+    bus = EventBus()
+    adapter = SimAdapter(bus, matching=True, ticks=TICKS)
+    events = []
+    bus.subscribe("order_event", lambda evt: events.append(evt.payload["status"]))
+    adapter.on_dom(MarketEvent(event_type="dom_snapshot", timestamp=T0, source="test", symbol="ES", payload={"bids": [[100.0, 1]], "asks": [[100.25, 1]]}))
+    adapter.send(_order("d", OrderSide.BUY, 1, 100.0))
+    adapter.on_trade(MarketEvent(event_type="trade", timestamp=_at(1), source="test", symbol="ES", payload={"price": 100.0, "size": 2, "side": "sell"}))
+    deadline = time.time() + 2
+    while len(events) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    adapter.stop()
+    bus.stop()
+    assert events == [OrderStatus.ACK, OrderStatus.FILL]
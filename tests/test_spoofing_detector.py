@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from engines.detectors.spoofing_detector import SpoofingDetector
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry({"ES": 0.25})
+
+
+def _evt(event_type, payload, seconds=0.0):
+    return MarketEvent(event_type=event_type, timestamp=T0 + timedelta(seconds=seconds), source="test", symbol="ES", payload=payload)
+
+
+def _book(bids, asks, seconds=0.0):
+    return _evt("dom_snapshot", {"bids": bids, "asks": asks}, seconds)
+
+
+def _detector(**kw):
+    bus = EventBus()
+    det = SpoofingDetector(bus, ticks=TICKS, **kw)
+    alerts = []
+    det.bus.publish = lambda evt: alerts.append(evt.payload)
+    return det, alerts
+
+
+ASKS = [[100.25, 10], [100.5, 10]]
+
+
+def test_large_order_pulled_quickly_flags_spoof():
+    det, alerts = _detector(min_size=50, max_lifetime_ms=1000)
+    det.on_dom(_book([[100.0, 10], [99.75, 10], [99.5, 10]], ASKS))
+    det.on_dom(_book([[100.0, 10], [99.75, 200], [99.5, 10]], ASKS, 0.2))
+    det.on_dom(_book([[100.0, 10], [99.75, 5], [99.5, 10]], ASKS, 0.5))
+    assert len(alerts) == 1
+    alert = alerts[0]
+    assert alert["type"] == "spoof" and alert["side"] == "bid" and alert["price"] == 99.75
+    assert alert["size"] == 195 and alert["peak"] == 200
+    assert alert["lifetime_ms"] == 300.0
+
+
+def test_ladder_shift_does_not_misalign_levels():
+    det, alerts = _detector(min_size=50)
+    det.on_dom(_book([[100.0, 200], [99.75, 10]], ASKS))
+    # book shifts one tick: same resting orders, different ladder positions
+    det.on_dom(_book([[100.25, 10], [100.0, 200], [99.75, 10]], [[100.5, 10]], 0.1))
+    assert alerts == []
+    assert det.books["ES"][0].levels[TICKS.to_tick("ES", 100.0)].size == 200
+
+
+def test_traded_size_is_not_a_cancel():
+    det, alerts = _detector(min_size=50)
+    det.on_dom(_book([[100.0, 200], [99.75, 10]], ASKS))
+    det.on_trade(_evt("trade", {"price": 100.0, "size": 180, "side": "sell"}, 0.1))
+    det.on_dom(_book([[100.0, 20], [99.75, 10]], ASKS, 0.2))
+    assert alerts == []
+
+
+def test_old_orders_and_levels_out_of_depth_are_ignored():
+    det, alerts = _detector(min_size=50, max_lifetime_ms=1000)
+    det.on_dom(_book([[100.0, 10], [99.75, 200]], ASKS))
+    det.on_dom(_book([[100.0, 10], [99.75, 0.0]], ASKS, 5.0))
+    det.on_dom(_book([[100.0, 10], [99.75, 10], [99.5, 300]], ASKS, 5.1))
+    det.on_dom(_book([[100.25, 10], [100.0, 10], [99.75, 10]], ASKS, 5.2))
+    assert alerts == []
@@ -0,0 +1,149 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from core.event_bus import EventBus
+from models.market_event import MarketEvent
+from strategy.host import StrategyHost, per_worker
+from strategy.signal_gate import SignalGate
+from strategy.simple_strategy import SimpleStrategyEngine
+
+
+class _Recorder:
+    def __init__(self, bus, symbols=(), gate=None):
+        self.bus = bus
+        self.symbols = list(symbols)
+        self.seen = []
+        self.threads = set()
+        self.gate = gate
+        bus.subscribe("tick", self.on_tick)
+
+    def on_tick(self, evt):
+        if self.gate is not None:
+            self.gate.wait(2.0)
+        self.seen.append(evt.symbol)
+        self.threads.add(threading.current_thread().name)
+        self.bus.publish(evt.model_copy(update={"event_type": "echo", "source": "strategy"}))
+
+
+def _tick(symbol, event_type="tick"):
+    return MarketEvent(event_type=event_type, timestamp=datetime.now(timezone.utc), source="test", symbol=symbol, payload={})
+
+
+def _wait(cond, timeout=5.0):
+    end = time.time() + timeout
+    while time.time() < end and not cond():
+        time.sleep(0.01)
+    return cond()
+
+
+def test_partitions_route_by_symbol_and_republish():
+    bus = EventBus()
+    echoes = []
+    bus.subscribe("echo", lambda evt: echoes.append(evt.symbol))
+    made = []
+    host = StrategyHost(bus)
+    names = host.add("rec", lambda b, syms: made.append(_Recorder(b, syms)) or made[-1], ["tick"], partitions=[["ES"], ["NQ"]])
+    assert names == ["rec[ES]", "rec[NQ]"]
+    for sym in ("ES", "NQ", "ES", "CL"):
+        bus.publish(_tick(sym))
+    assert _wait(lambda: len(echoes) == 3)
+    by_symbols = {tuple(r.symbols): r for r in made}
+    assert by_symbols[("ES",)].seen == ["ES", "ES"] and by_symbols[("NQ",)].seen == ["NQ"]
+    assert by_symbols[("ES",)].threads == {"strategy-rec[ES]"}
+    metrics = host.metrics()
+    assert metrics["rec[ES]"]["processed"] == 2 and metrics["rec[NQ]"]["queue_depth"] == 0
+    host.stop()
+    bus.stop()
+
+
+def test_full_queue_drops_without_blocking_the_bus():
+    bus = EventBus()
+    gate = threading.Event()
+    host = StrategyHost(bus, queue_size=2)
+    host.add("slow", lambda b: _Recorder(b, gate=gate), ["tick"])
+    for _ in range(10):
+        bus.publish(_tick("ES"))
+    assert _wait(lambda: host.metrics()["slow"]["dropped"] >= 7)
+    gate.set()
+    assert _wait(lambda: host.metrics()["slow"]["processed"] == 10 - host.metrics()["slow"]["dropped"])
+    host.stop()
+    bus.stop()
+
+
+def test_process_worker_publishes_back_to_bus():
+    bus = EventBus()
+    signals = []
+    bus.subscribe("strategy_signal", lambda evt: signals.append(evt.payload["direction"]))
+    host = StrategyHost(bus)
+    host.add("simple", SimpleStrategyEngine, ["delta_update"], mode="process")
+    bus.publish(MarketEvent(event_type="delta_update", timestamp=datetime.now(timezone.utc), source="delta_engine", symbol="ES", payload={"delta": 80}))
+    assert _wait(lambda: signals == ["buy"], timeout=30.0)
+    assert _wait(lambda: host.metrics()["simple"]["processed"] == 1)
+    assert _wait(lambda: (host.metrics()["simple"].get("gate") or {}).get("passed") == 1)  # gate counters cross the process
+    host.stop()
+    bus.stop()
+
+
+class _Ticker:
+    def __init__(self, bus, symbols):
+        from core.timer import BusTimer
+
+        self.bus = bus
+        self.name = f"tick-{symbols[0]}"
+        self.timers = []
+        self.threads = set()
+        self._timer = BusTimer(bus, self.name, 0.01)
+        bus.subscribe("timer", self.on_timer)
+
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def on_timer(self, evt):
+        self.timers.append(evt.payload["name"])
+        self.threads.add(threading.current_thread().name)
+
+
+def test_worker_timers_stay_inside_their_partition():
+    bus = EventBus()
+    on_bus = []
+    bus.subscribe("timer", lambda evt: on_bus.append(evt.payload["name"]))
+    made = []
+    host = StrategyHost(bus)
+    host.add("tk", lambda b, syms: made.append(_Ticker(b, syms)) or made[-1], ["tick"], partitions=[["ES"], ["NQ"]])
+    assert _wait(lambda: len(made) == 2 and all(len(t.timers) >= 3 for t in made))
+    host.stop()
+    bus.stop()
+    for ticker in made:
+        assert set(ticker.timers) == {ticker.name} and ticker.threads == {f"strategy-tk[{ticker.name[5:]}]"}
+    assert on_bus == []
+
+
+class _Gated:
+    def __init__(self, bus, symbols, gate):
+        self.gate = gate
+        bus.subscribe("tick", lambda evt: self.gate.allow(evt.symbol, "buy", evt.timestamp))
+
+
+def test_per_worker_builds_a_gate_per_partition_and_reports_its_stats():
+    bus = EventBus()
+    made = []
+    host = StrategyHost(bus)
+
+    def gated(b, syms, gate):
+        made.append(_Gated(b, syms, gate))
+        return made[-1]
+
+    host.add("g", per_worker(gated, gate=SignalGate), ["tick"], partitions=[["ES"], ["NQ"]])
+    for sym in ("ES", "NQ", "ES"):
+        bus.publish(_tick(sym))
+    assert _wait(lambda: all("gate" in m for m in host.metrics().values()))
+    assert made[0].gate is not made[1].gate
+    metrics = host.metrics()
+    assert metrics["g[ES]"]["gate"]["by_symbol"] == {"ES": {"passed": 1, "flat": 0, "duplicate": 1, "cooldown": 0}}
+    assert list(metrics["g[NQ]"]["gate"]["by_symbol"]) == ["NQ"]
+    host.stop()
+    bus.stop()
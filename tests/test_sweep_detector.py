@@ -0,0 +1,83 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from engines.detectors.sweep_detector import SweepDetector
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+TICKS = TickSizeRegistry({"ES": 0.25})
+
+
+def _trade(price, size, ms=0.0, **extra):
+    payload = {"price": price, "size": size, **extra}
+    return MarketEvent(event_type="trade", timestamp=T0 + timedelta(milliseconds=ms), source="test", symbol="ES", payload=payload)
+
+
+def _detector(**kw):
+    bus = EventBus()
+    det = SweepDetector(bus, flush_ms=0, ticks=TICKS, **kw)
+    alerts = []
+    det.bus.publish = lambda evt: alerts.append(evt.payload)
+    return det, alerts
+
+
+def test_contiguous_burst_emits_single_sweep():
+    det, alerts = _detector(gap_ms=10, min_levels=3)
+    for i, (price, size) in enumerate([(100.0, 5), (100.0, 3), (100.25, 10), (100.5, 2)]):
+        det.on_trade(_trade(price, size, i, side="buy"))
+    assert alerts == []
+    det.flush()
+    assert len(alerts) == 1
+    sweep = alerts[0]
+    assert sweep["type"] == "sweep" and sweep["side"] == "buy"
+    assert sweep["levels"] == 3 and sweep["size"] == 20 and sweep["prints"] == 4
+    assert sweep["vwap"] == pytest.approx((100.0 * 8 + 100.25 * 10 + 100.5 * 2) / 20)
+    assert (sweep["start_price"], sweep["end_price"]) == (100.0, 100.5)
+
+
+def test_gap_side_change_and_skipped_levels_break_cluster():
+    det, alerts = _detector(gap_ms=10, min_levels=2)
+    det.on_trade(_trade(100.0, 1, 0, side="buy"))
+    det.on_trade(_trade(100.25, 1, 50, side="buy"))  # too late
+    det.on_trade(_trade(100.0, 1, 51, side="sell"))
+    det.on_trade(_trade(99.5, 1, 52, side="sell"))  # skips 99.75
+    det.flush()
+    assert alerts == []
+
+
+def test_exchange_time_groups_aggtrades_and_tick_rule_infers_side():
+    det, alerts = _detector(gap_ms=1, min_levels=3)
+    # aggTrades of one taker share exchange time even if received apart
+    for i, price in enumerate((100.0, 99.75, 99.5)):
+        det.on_trade(_trade(price, 4, i * 20, side="sell", exchange_ts=1_700_000_000_000))
+    # AllLast-style prints without side: upticks read as buying
+    for i, price in enumerate((99.5, 99.75, 100.0, 100.25)):
+        det.on_trade(_trade(price, 1, 100 + i * 0.1, side="unknown"))
+    det.flush()
+    assert [(a["side"], a["levels"]) for a in alerts] == [("sell", 3), ("buy", 3)]
+
+
+def test_flush_idleness_runs_on_event_time():
+    det, alerts = _detector(gap_ms=10, min_levels=2)
+    det.on_trade(_trade(100.0, 1, 0, side="buy"))
+    det.on_trade(_trade(100.25, 1, 5, side="buy"))
+    time.sleep(0.03)  # wall time passes, as in a slow replay: the sweep is still open
+    assert det.flush(idle=det.gap) == [] and alerts == []
+    det.on_trade(_trade(100.5, 1, 9, side="buy"))
+    det.on_trade(_trade(50.0, 1, 40, side="buy").model_copy(update={"symbol": "NQ"}))
+    assert det.flush(idle=det.gap) == ["ES"] and alerts[0]["levels"] == 3
+
+
+def test_quiet_feed_closes_final_cluster_on_wall_time():
+    det, alerts = _detector(gap_ms=10, min_levels=2, max_idle_ms=20)
+    det.on_trade(_trade(100.0, 1, 0, side="buy"))
+    det.on_trade(_trade(100.25, 1, 5, side="buy"))
+    det.on_timer(MarketEvent(event_type="timer", timestamp=T0, source="timer", symbol="", payload={"name": "sweep_flush"}))
+    assert alerts == []  # not idle yet on either clock
+    time.sleep(0.03)  # no print follows the sweep
+    det.on_timer(MarketEvent(event_type="timer", timestamp=T0, source="timer", symbol="", payload={"name": "sweep_flush"}))
+    assert len(alerts) == 1 and alerts[0]["levels"] == 2
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.event_bus import EventBus
+from core.instrument_detector import TICK_SIZES, TickSizeRegistry, detect_instrument
+from engines.detectors.iceberg_detector import IcebergDetector
+from engines.microstructure.depth import DepthEngine
+from engines.volume_profile.engine import VolumeProfileEngine
+from models.market_event import MarketEvent
+
+
+def _evt(event_type, payload, symbol="XAUUSD"):
+    return MarketEvent(event_type=event_type, timestamp=datetime.now(timezone.utc), source="test", symbol=symbol, payload=payload)
+
+
+def test_registry_resolves_per_instrument_tick_sizes():
+    assert detect_instrument("XAUUSD")["tick_size"] == 0.01
+    assert TICK_SIZES.tick_size("EURUSD") == 0.00001
+    assert TICK_SIZES.tick_size("GCZ4") == 0.1
+    assert TICK_SIZES.tick_size("ESH25") == 0.25
+    assert TICK_SIZES.tick_size("XAUUSD.CFD") == 0.01
+
+
+def test_registry_round_trips_and_absorbs_float_noise():
+    reg = TickSizeRegistry({"ES": 0.25})
+    assert reg.to_tick("ES", 5000.25) == reg.to_tick("ES", 5000.2500000001) == 20001
+    assert reg.to_price("ES", 20001) == 5000.25
+    assert reg.to_tick("XAUUSD", 0.1 + 0.2) == 30
+    reg.register("XAUUSD", 0.1)
+    assert reg.to_price("XAUUSD", reg.to_tick("XAUUSD", 2000.33)) == 2000.3
+    with pytest.raises(ValueError):
+        reg.register("ES", 0)
+
+
+def test_fixed_registry_applies_to_all_symbols():
+    reg = TickSizeRegistry(fixed=0.5)
+    assert reg.tick_size("ANY") == 0.5 and reg.to_tick("ANY", 10.4) == 21
+
+
+def test_volume_profile_keys_by_tick():
+    bus = EventBus()
+    engine = VolumeProfileEngine(bus)
+    engine.on_trade(_evt("trade", {"price": 0.1 + 0.2, "size": 1}))
+    engine.on_trade(_evt("trade", {"price": 0.3, "size": 2}))
+    bus.stop()
+    assert engine.hist["XAUUSD"] == {30: 3.0}
+
+
+def test_iceberg_repeats_keyed_by_tick():
+    bus = EventBus()
+    det = IcebergDetector(bus, min_repeats=5, min_size=1)
+    det.on_trade(_evt("trade", {"price": 2000.1, "size": 2, "side": "buy"}))
+    det.on_trade(_evt("trade", {"price": 2000.1000000002, "size": 2, "side": "buy"}))
+    bus.stop()
+    levels = det.books["XAUUSD"].levels
+    assert list(levels) == [200010] and levels[200010].volume == pytest.approx(4.0, rel=1e-3)
+
+
+def test_depth_liquidity_map_keyed_by_tick():
+    depth = DepthEngine()
+    st = depth.on_dom(_evt("dom_snapshot", {"dom": [{"price": 2000.1, "bid_size": 3, "ask_size": 0}, {"price": "2000.2", "bid_size": 0, "ask_size": 4}]}))
+    assert st.liquidity_map == {200010: 3.0, 200020: 4.0}
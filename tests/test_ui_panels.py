@@ -4,10 +4,12 @@ from PySide6 import QtWidgets, QtCore
 
 from core.event_bus import EventBus
 from models.market_event import MarketEvent
+from risk.kill_switch import KillSwitch
 from ui.event_bridge import EventBridge
 from ui.widgets.dom_panel import DomPanel
 from ui.widgets.delta_panel import DeltaPanel
 from ui.widgets.footprint_panel import FootprintPanel
+from ui.widgets.status_bar_widget import StatusBarWidget
 from ui.widgets.tape_panel import TapePanel
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -64,3 +66,22 @@ def test_delta_footprint_and_tape(qtbot):
     assert delta.stream
     assert fp.model.matrix
     assert tape.model.rows
+
+
+@pytest.mark.qt
+def test_status_bar_shows_kill_switch_and_resets_it(qtbot):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    bus = EventBus()
+    bridge = EventBridge(bus)
+    bridge.start(["kill_switch"])
+    kill_switch = KillSwitch(bus)
+    status = StatusBarWidget()
+    status.connect_bridge(bridge, on_reset_kill_switch=kill_switch.reset)
+    kill_switch.engage("message_rate")
+    qtbot.waitUntil(lambda: status.kill_reset.isEnabled(), timeout=2000)
+    assert "message_rate" in status.kill_label.text()
+    status.kill_reset.click()
+    qtbot.waitUntil(lambda: status.kill_label.text() == "Kill: off", timeout=2000)
+    bridge.stop()
+    bus.stop()
+    assert not kill_switch.engaged and not status.kill_reset.isEnabled()
@@ -0,0 +1,98 @@
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.event_bus import EventBus
+from core.instrument_detector import TickSizeRegistry
+from core.rolling import MonotonicWindow
+from engines.volatility.engine import PercentileThresholds, VolatilityEngine
+from models.market_event import MarketEvent
+
+T0 = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _trade(price, seconds=0.0, symbol="ES"):
+    return MarketEvent(event_type="trade", timestamp=T0 + timedelta(seconds=seconds), source="test", symbol=symbol, payload={"price": price, "size": 1})
+
+
+def test_monotonic_window_matches_brute_force():
+    rng = random.Random(3)
+    win = MonotonicWindow(7)
+    values = []
+    for _ in range(200):
+        v = rng.uniform(0, 100)
+        values.append(v)
+        win.push(v)
+        assert win.max == max(values[-7:]) and win.min == min(values[-7:])
+
+
+def test_realized_and_ewma_in_bps_and_range_in_ticks():
+    bus = EventBus()
+    engine = VolatilityEngine(bus, window=3, ewma_lambda=0.5, ticks=TickSizeRegistry({"ES": 0.25}))
+    prices = [100.0, 100.5, 100.25, 101.0, 100.75]
+    for i, p in enumerate(prices):
+        engine.on_trade(_trade(p, i))
+    bus.stop()
+    rets = np.diff(np.log(prices))
+    snap = engine.snapshot("ES")
+    assert snap["rv_bps"] == pytest.approx(math.sqrt(np.sum(rets[-3:] ** 2)) * 1e4)
+    ewma = 0.0
+    for r in rets:
+        ewma = 0.5 * ewma + 0.5 * r * r
+    assert snap["ewma_bps"] == pytest.approx(math.sqrt(ewma) * 1e4)
+    assert snap["range_ticks"] == (101.0 - 100.25) / 0.25
+    assert snap["atr"] == pytest.approx(0.75)
+
+
+def test_parkinson_and_garman_klass_on_closed_bars():
+    bus = EventBus()
+    engine = VolatilityEngine(bus, bar_seconds=60)
+    for seconds, price in ((0, 100.0), (10, 102.0), (20, 99.0), (50, 101.0), (61, 101.0)):
+        engine.on_trade(_trade(price, seconds))
+    bus.stop()
+    hl, co = math.log(102.0 / 99.0), math.log(101.0 / 100.0)
+    snap = engine.snapshot("ES")
+    assert snap["parkinson_bps"] == pytest.approx(math.sqrt(hl * hl / (4 * math.log(2))) * 1e4)
+    assert snap["garman_klass_bps"] == pytest.approx(math.sqrt(0.5 * hl * hl - (2 * math.log(2) - 1) * co * co) * 1e4)
+
+
+def test_regime_uses_per_instrument_percentiles():
+    thresholds = PercentileThresholds(low_pct=20, high_pct=80, min_samples=5)
+    assert thresholds.classify(10.0) == "normal"
+    thresholds.learn(range(1, 101))
+    assert thresholds.classify(5.0) == "compression"
+    assert thresholds.classify(50.0) == "normal"
+    assert thresholds.classify(95.0) == "expansion"
+
+    bus = EventBus()
+    engine = VolatilityEngine(bus, ewma_lambda=0.5)
+    low, high = engine.learn("ES", np.linspace(1.0, 3.0, 100))
+    engine.learn("NQ", np.linspace(50.0, 90.0, 100))
+    out = []
+    bus.subscribe("volatility_update", lambda evt: out.append((evt.symbol, evt.payload["regime"])))
+    for i, p in enumerate((100.0, 100.2, 100.0, 100.2)):
+        engine.on_trade(_trade(p, i, "ES"))
+        engine.on_trade(_trade(p, i, "NQ"))
+    time.sleep(0.2)
+    bus.stop()
+    assert low < high
+    assert ("ES", "expansion") in out and ("NQ", "compression") in out
+
+
+def test_flat_price_run_does_not_drift_below_zero():
+    bus = EventBus()
+    engine = VolatilityEngine(bus, window=5, bar_seconds=1)
+    out = []
+    bus.subscribe("volatility_update", lambda evt: out.append(evt.payload["rv_bps"]))
+    prices = [100.0, 100.37, 99.81, 100.13, 100.29, 99.97, 100.41] + [100.0] * 60
+    for i, p in enumerate(prices):
+        engine.on_trade(_trade(p, i * 0.7))
+    time.sleep(0.2)
+    bus.stop()
+    snap = engine.snapshot("ES")
+    assert len(out) == len(prices) - 1
+    assert snap["rv_bps"] == pytest.approx(0.0, abs=1e-3) and snap["parkinson_bps"] >= 0.0
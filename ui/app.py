@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import os
 import sys
@@ -14,21 +15,35 @@ from core.config import load_settings
 from core.event_bus import EventBus
 from core.logging import configure_logging
 from engines.microstructure.engine import MicrostructureEngine
+from engines.ml_features import MLFeatureBuilder, MLFeatureEngine
 from engines.ohlc.engine import OHLCEngine
+from engines.bars.engine import BarEngine
 from engines.liquidity_map.engine import LiquidityMapEngine
 from engines.volume_profile.engine import VolumeProfileEngine
 from engines.volatility.engine import VolatilityEngine
 from engines.regime.engine import RegimeEngine
+from engines.delta import DeltaEngine
+from engines.detectors.pipeline import DetectorPipeline
 from engines.detectors.spoofing_detector import SpoofingDetector
+from engines.detectors.sweep_detector import SweepDetector
 from engines.detectors.iceberg_detector import IcebergDetector
 from engines.detectors.large_trade_detector import LargeTradeDetector
 from models.market_event import MarketEvent
 from models.order import OrderRequest, OrderSide, OrderType
+from observability.metrics_publisher import MetricsPublisher
+from observability.watchdogs import Watchdogs
 from risk.engine import RiskEngine
+from risk.kill_switch import KillSwitch
+from risk.positions import PositionManager
+from risk.profile import RiskProfile
 from execution.adapters.sim import SimAdapter
+from execution.latency import build_profiles
 from execution.mt5_adapter import MT5ExecutionAdapter
 from execution.router import ExecutionRouter
+from strategy.host import StrategyHost, per_worker
 from strategy.orchestrator import StrategyOrchestrator
+from strategy.playbook import PlaybookEngine
+from strategy.signal_gate import SignalGate
 from strategy.simple_strategy import SimpleStrategyEngine
 from providers.provider_manager import ProviderManager
 from ui.event_bridge import EventBridge
@@ -79,6 +94,21 @@ def main(argv: List[str] | None = None) -> int:
     }
     provider_manager = ProviderManager(bus, pm_settings)
 
+    # one kill switch for the whole session: it survives engine rebuilds on symbol switches
+    ks_cfg = settings.risk_limits.get("kill_switch") or {}
+    kill_switch = KillSwitch(bus, check_seconds=float(ks_cfg.get("check_seconds", 1.0)))
+    watchdogs = Watchdogs(max_stale_seconds=int(ks_cfg.get("max_stale_seconds", 15)))
+
+    def on_market_heartbeat(evt: MarketEvent) -> None:
+        watchdogs.heartbeat("market_data")
+
+    # off by default: quiet markets, reconnects and symbol switches all leave gaps; when on it is
+    # only armed while orders are working, and the heartbeat is forgotten on every rebuild
+    if ks_cfg.get("watch_market_data", False):
+        bus.subscribe(("trade", "dom_snapshot", "tick"), on_market_heartbeat)
+        kill_switch.watch(watchdogs, ["market_data"], armed=kill_switch.working)
+    kill_switch.start()
+
     exec_mode = settings.execution.get("mode", "sim").upper()
 
     def build_adapter():
@@ -87,39 +117,122 @@ def main(argv: List[str] | None = None) -> int:
             mt5_vol = float(settings.execution.get("mt5_volume_btc", 0.01))
             dry_run = bool(settings.execution.get("dry_run", True))
             return MT5ExecutionAdapter(bus, {"BTCUSDT": mt5_symbol, settings.market_symbol: mt5_symbol}, mt5_vol, dry_run), exec_mode
-        return SimAdapter(bus), "SIM"
+        return (
+            SimAdapter(
+                bus,
+                matching=bool(settings.execution.get("sim_matching", False)),
+                latency_ms=float(settings.execution.get("sim_latency_ms", 0.0)),
+                latency=build_profiles(settings.execution["sim_latency"]) if settings.execution.get("sim_latency") else None,
+            ),
+            "SIM",
+        )
 
     def build_engines(sym_list: list[str]):
-        micro = MicrostructureEngine(bus, sym_list)
+        micro_cfg = settings.ui.get("microstructure") or {}
+        micro = MicrostructureEngine(
+            bus,
+            sym_list,
+            min_interval_ms=float(micro_cfg.get("min_interval_ms", 0.0)),
+            every_n=int(micro_cfg.get("every_n", 1)),
+            delta_mode=bool(micro_cfg.get("delta_mode", False)),
+            pattern_window_seconds=float(micro_cfg.get("pattern_window_seconds", 5.0)),
+        )
         micro.start()
-        ohlc = OHLCEngine(bus, timeframe_seconds=settings.ui.get("ohlc_seconds", 1))
+        bar_cfg = settings.ui.get("bars") or {}
+        bar_type = str(bar_cfg.get("type", "time")).lower()
+        if bar_type == "time":
+            ohlc = OHLCEngine(bus, timeframe_seconds=settings.ui.get("ohlc_seconds", 1))
+        else:
+            ohlc = BarEngine(bus, bar_type=bar_type, threshold=float(bar_cfg.get("size", 100)))
         liq_map_engine = LiquidityMapEngine(bus)
         vol_profile_engine = VolumeProfileEngine(bus)
         vol_engine = VolatilityEngine(bus)
-        regime_engine = RegimeEngine(bus)
-        spoof_detector = SpoofingDetector(bus)
-        iceberg_detector = IcebergDetector(bus)
-        large_trade_detector = LargeTradeDetector(bus)
-        simple_strategy = SimpleStrategyEngine(bus)
-        strategist = StrategyOrchestrator(bus, sym_list)
-        strategist.start()
-        risk_engine = RiskEngine(settings.risk_limits)
+        delta_cfg = settings.ui.get("delta") or {}
+        delta_engine = DeltaEngine(
+            bus,
+            bar_seconds=int(delta_cfg.get("bar_seconds", 60)),
+            rolling_bars=int(delta_cfg.get("rolling_bars", 20)),
+            session_start=str(delta_cfg.get("session_start", "00:00")),
+        )
+        regime_cfg = settings.ui.get("regime") or {}
+        regime_engine = RegimeEngine(
+            bus,
+            interval_ms=float(regime_cfg.get("interval_ms", 250)),
+            trend_delta=float(regime_cfg.get("trend_delta", 200)),
+            confirm=int(regime_cfg.get("confirm", 2)),
+        )
+        ml_cfg = settings.ui.get("ml_features") or {}
+        ml_engine = None
+        if ml_cfg.get("enabled"):
+            ml_engine = MLFeatureEngine(
+                bus,
+                MLFeatureBuilder(window=int(ml_cfg.get("window", 20)), long_window=int(ml_cfg.get("long_window", 200))),
+            )
+        detector_pipeline = DetectorPipeline(bus)
+        spoof_detector = detector_pipeline.register(SpoofingDetector(bus), "spoof")
+        iceberg_detector = detector_pipeline.register(IcebergDetector(bus), "iceberg")
+        large_trade_detector = detector_pipeline.register(LargeTradeDetector(bus), "large_trade")
+        sweep_detector = detector_pipeline.register(SweepDetector(bus), "sweep")
+        playbook_cfg = settings.ui.get("playbook") or {}
+        playbook_path = playbook_cfg.get("path")
+        # factories rather than instances: every hosted worker builds its own playbook and gate
+        make_playbook = PlaybookEngine
+        if playbook_path and os.path.exists(playbook_path):
+            make_playbook = functools.partial(PlaybookEngine, path=playbook_path)
+        reload_seconds = float(playbook_cfg.get("reload_seconds", 1.0))
+        gate_cfg = settings.ui.get("signal_gate") or {}
+        dedup_seconds = gate_cfg.get("dedup_seconds")
+        make_gate = functools.partial(
+            SignalGate,
+            cooldown_seconds=float(gate_cfg.get("cooldown_seconds", 1.0)),
+            dedup_seconds=float(dedup_seconds) if dedup_seconds is not None else None,
+        )
+        metrics = MetricsPublisher(bus, interval_seconds=float((settings.ui.get("metrics") or {}).get("interval_seconds", 1.0)))
+
+        host_cfg = settings.ui.get("strategy_host") or {}
+        host_mode = str(host_cfg.get("mode", "inline")).lower()
+        strategy_host = simple_strategy = strategist = None
+        if host_mode == "inline":
+            simple_strategy = SimpleStrategyEngine(bus, gate=make_gate())
+            strategist = StrategyOrchestrator(bus, sym_list, playbook=make_playbook(), reload_seconds=reload_seconds, gate=make_gate())
+            strategist.start()
+            metrics.add("gate.simple_strategy", simple_strategy.gate.stats)
+            metrics.add("gate.strategist", strategist.gate.stats)
+        else:
+            strategy_host = StrategyHost(bus, queue_size=int(host_cfg.get("queue_size", 1000)))
+            strategy_host.add("simple_strategy", per_worker(SimpleStrategyEngine, gate=make_gate), ["delta_update"], mode=host_mode)
+            strategy_host.add(
+                "strategist",
+                per_worker(functools.partial(StrategyOrchestrator, reload_seconds=reload_seconds), playbook=make_playbook, gate=make_gate),
+                ["microstructure"],  # its playbook_reload timer is looped back inside each worker
+                mode=host_mode,
+                partitions=[[s] for s in sym_list],
+            )
+            metrics.add("strategy_host", strategy_host.metrics)  # worker counters and each worker's gate stats
+        metrics.add("detectors", detector_pipeline.timings)
+        positions = PositionManager(bus, mark_seconds=float(settings.risk_limits.get("mark_seconds", 1.0)))
+        positions.start()
+        risk_engine = RiskEngine(RiskProfile.load(settings.risk_limits), positions=positions, kill_switch=kill_switch)
+        metrics.add("risk", risk_engine.latency_stats)
+        metrics.start()  # after the last add: sources are read on the bus thread
         adapter, mode_adapter = build_adapter()
         router = ExecutionRouter(bus, adapter, mode=mode_adapter)
+        kill_switch.attach(router)
+        watchdogs.last_seen.pop("market_data", None)
 
         def on_signal(evt: MarketEvent) -> None:
             order = build_order_from_signal(evt, default_qty=settings.execution.get("default_qty", 1.0))
-            decision = risk_engine.evaluate(order, account_ctx={})
+            verdict = risk_engine.evaluate(order, account_ctx={})
             bus.publish(
                 MarketEvent(
                     event_type="risk_decision",
-                    timestamp=decision.timestamp,
+                    timestamp=verdict.timestamp,
                     source="risk",
                     symbol=order.symbol,
-                    payload=decision.model_dump(),
+                    payload=verdict.as_dict(),  # plain fields: no RiskDecision built per signal
                 )
             )
-            if decision.approved:
+            if verdict.approved:
                 router.submit(order)
 
         bus.subscribe("signal", on_signal)
@@ -131,12 +244,19 @@ def main(argv: List[str] | None = None) -> int:
             "liq_map_engine": liq_map_engine,
             "vol_profile_engine": vol_profile_engine,
             "vol_engine": vol_engine,
+            "delta_engine": delta_engine,
             "regime_engine": regime_engine,
+            "ml_engine": ml_engine,
+            "detector_pipeline": detector_pipeline,
             "spoof_detector": spoof_detector,
             "iceberg_detector": iceberg_detector,
             "large_trade_detector": large_trade_detector,
+            "sweep_detector": sweep_detector,
             "simple_strategy": simple_strategy,
             "strategist": strategist,
+            "strategy_host": strategy_host,
+            "metrics": metrics,
+            "positions": positions,
             "risk_engine": risk_engine,
             "adapter": adapter,
             "router": router,
@@ -157,12 +277,21 @@ def main(argv: List[str] | None = None) -> int:
             "liq_map_engine",
             "vol_profile_engine",
             "vol_engine",
+            "delta_engine",
             "regime_engine",
+            "ml_engine",
+            "detector_pipeline",
             "spoof_detector",
             "iceberg_detector",
             "large_trade_detector",
+            "sweep_detector",
             "simple_strategy",
             "strategist",
+            "strategy_host",
+            "metrics",
+            "positions",
+            "router",
+            "adapter",
         ):
             eng = bundle.get(key)
             if eng and hasattr(eng, "stop"):
@@ -225,6 +354,7 @@ def main(argv: List[str] | None = None) -> int:
         event_bus=bus,
         pm_settings=pm_settings,
         on_switch_symbol=switch_symbol,
+        on_reset_kill_switch=kill_switch.reset,
     )
     window_ref = window
     if hasattr(window, "execution_mode_label"):
@@ -246,6 +376,7 @@ def main(argv: List[str] | None = None) -> int:
     # shutdown
     bridge.stop()
     stop_engines(engines)
+    kill_switch.stop()
     provider_manager.stop()
     bus.stop()
     log.info("UI shutdown complete")
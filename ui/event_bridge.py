@@ -6,6 +6,7 @@ from typing import Any, Dict, Iterable, List, Optional
 from PySide6 import QtCore
 
 from core.event_bus import EventBus
+from engines.microstructure.snapshot import HEAVY_FIELDS, merge_snapshot
 from models.market_event import MarketEvent
 
 
@@ -28,12 +29,14 @@ class EventBridge(QtCore.QObject):
 
     domUpdated = QtCore.Signal(dict)
     deltaUpdated = QtCore.Signal(dict)
+    divergenceDetected = QtCore.Signal(dict)
     footprintUpdated = QtCore.Signal(dict)
     tapeUpdated = QtCore.Signal(dict)
     microstructureUpdated = QtCore.Signal(dict)
     signalGenerated = QtCore.Signal(dict)
     orderStatusUpdated = QtCore.Signal(dict)
     riskStatusUpdated = QtCore.Signal(dict)
+    killSwitchUpdated = QtCore.Signal(dict)
     metricsUpdated = QtCore.Signal(dict)
     logReceived = QtCore.Signal(str)
     alertReceived = QtCore.Signal(dict)
@@ -44,6 +47,7 @@ class EventBridge(QtCore.QObject):
         self.bus = bus
         self._subscriptions: List[str] = []
         self._logger_handler: Optional[_LogToSignalHandler] = None
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
 
     def start(self, event_types: Optional[Iterable[str]] = None) -> None:
         types = event_types or [
@@ -51,9 +55,12 @@ class EventBridge(QtCore.QObject):
             "dom_delta",
             "trade",
             "microstructure",
+            "delta_update",
+            "delta_divergence",
             "signal",
             "order_event",
             "risk_decision",
+            "kill_switch",
             "metrics",
             "log",
         ]
@@ -124,13 +131,18 @@ class EventBridge(QtCore.QObject):
             self.tapeUpdated.emit(payload)
         elif et == "microstructure":
             snap = payload.get("snapshot", payload)
-            self.microstructureUpdated.emit(snap)
+            # heavy fields arrive only when their version changes; panels get the merged light view
             fp = snap.get("footprint")
+            light = {k: v for k, v in snap.items() if k not in HEAVY_FIELDS}
+            view = merge_snapshot(self._snapshots.setdefault(evt.symbol, {}), light)
+            # the view keeps changing on the bus thread: hand the UI thread its own copy
+            self.microstructureUpdated.emit(dict(view))
             if fp:
                 self.footprintUpdated.emit(fp)
-            features = snap.get("features")
-            if features:
-                self.deltaUpdated.emit(features)
+        elif et == "delta_update":
+            self.deltaUpdated.emit(payload)
+        elif et == "delta_divergence":
+            self.divergenceDetected.emit(payload)
         elif et == "signal":
             self.signalGenerated.emit(payload)
         elif et == "strategy_signal":
@@ -139,6 +151,8 @@ class EventBridge(QtCore.QObject):
             self.orderStatusUpdated.emit(payload)
         elif et == "risk_decision":
             self.riskStatusUpdated.emit(payload)
+        elif et == "kill_switch":
+            self.killSwitchUpdated.emit(payload)
         elif et == "metrics":
             self.metricsUpdated.emit(payload)
         elif et == "log":
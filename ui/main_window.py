@@ -249,6 +249,7 @@ class InstitutionalMainWindow(QtWidgets.QMainWindow):
         event_bus=None,
         pm_settings: Optional[dict] = None,
         on_switch_symbol: Optional[Callable[[str], None]] = None,
+        on_reset_kill_switch: Optional[Callable[[], None]] = None,
         parent=None,
     ) -> None:
         super().__init__(parent)
@@ -305,12 +306,13 @@ class InstitutionalMainWindow(QtWidgets.QMainWindow):
         self.metrics_panel.connect_bridge(bridge)
         self.logs_panel.connect_bridge(bridge)
         self.liquidity_panel.connect_bridge(bridge)
+        self.heatmap_panel.connect_bridge(bridge)
         self.vol_profile_panel.connect_bridge(bridge)
         self.regime_panel.connect_bridge(bridge)
         self.vol_panel.connect_bridge(bridge)
         self.provider_debug.connect_bridge(bridge)
         self.market_watch.connect_bridge(bridge)
-        self.status_widget.connect_bridge(bridge, mode=mode)
+        self.status_widget.connect_bridge(bridge, mode=mode, on_reset_kill_switch=on_reset_kill_switch)
 
         # DockArea layout
         self.area.addDock(Dock("Chart", widget=self.chart))
@@ -326,6 +328,7 @@ class InstitutionalMainWindow(QtWidgets.QMainWindow):
         self.area.addDock(Dock("Strategy", widget=self.strategy_panel), "right", self.area.docks["Chart"])
         self.area.addDock(Dock("Execution", widget=self.execution_panel), "bottom", self.area.docks["Strategy"])
         self.area.addDock(Dock("Liquidity", widget=self.liquidity_panel), "bottom", self.area.docks["Execution"])
+        self.area.addDock(Dock("Heatmap", widget=self.heatmap_panel), "above", self.area.docks["Liquidity"])
         self.area.addDock(Dock("VolumeProfile", widget=self.vol_profile_panel), "bottom", self.area.docks["Liquidity"])
         self.area.addDock(Dock("Regime", widget=self.regime_panel), "bottom", self.area.docks["VolumeProfile"])
         self.area.addDock(Dock("Volatility", widget=self.vol_panel), "bottom", self.area.docks["Regime"])
@@ -485,6 +488,8 @@ class InstitutionalMainWindow(QtWidgets.QMainWindow):
             self._switch_instrument(sym_item.text())
 
     def _switch_instrument(self, symbol: str) -> None:
+        self.liquidity_panel.set_symbol(symbol)
+        self.heatmap_panel.set_symbol(symbol)
         if self._on_switch_symbol:
             self._on_switch_symbol(symbol)
             self.statusBar().showMessage(f"[MarketWatch] User selected {symbol}", 3000)
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from collections import deque
-from datetime import datetime, timezone
 from typing import Deque, Dict, List, Tuple
 
 import pyqtgraph as pg
@@ -16,14 +15,16 @@ from ui.state import UIState
 class DeltaPanel(QtWidgets.QWidget):
     """
     Institutional delta view with stream + cumulative modes and divergence markers.
+    Draws closed bars and divergences published by DeltaEngine; nothing is computed here.
     """
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self.stream: Deque[Tuple[float, float]] = deque(maxlen=2000)
         self.cvd: Deque[Tuple[float, float]] = deque(maxlen=2000)
-        self.price: Deque[Tuple[float, float]] = deque(maxlen=2000)
+        self.divergences: Deque[Dict] = deque(maxlen=200)
         self.mode_cvd = True
+        self.session = None
 
         self.plot = pg.PlotWidget(background=brand.BG_DARK)
         try:
@@ -43,70 +44,52 @@ class DeltaPanel(QtWidgets.QWidget):
 
     def connect_bridge(self, bridge: EventBridge) -> None:
         bridge.deltaUpdated.connect(self.queue_delta)
-        bridge.microstructureUpdated.connect(self.queue_from_snapshot)
+        bridge.divergenceDetected.connect(self.queue_divergence)
 
-        self._pending_delta: Dict | None = None
-        self._pending_snapshot: Dict | None = None
+        self._pending_bars: List[Dict] = []
+        self._dirty = False
         self._throttle = QtCore.QTimer(self)
         self._throttle.setInterval(int(1000 / 60))
         self._throttle.timeout.connect(self._flush)
         self._throttle.start()
 
     def queue_delta(self, data: Dict) -> None:
-        self._pending_delta = data
+        self._pending_bars.append(data)
 
-    def queue_from_snapshot(self, snapshot: Dict) -> None:
-        self._pending_snapshot = snapshot
+    def queue_divergence(self, data: Dict) -> None:
+        self.divergences.append(data)
+        self._dirty = True
 
     def _flush(self) -> None:
         if UIState.is_paused():
             return
-        if self._pending_delta:
-            data = self._pending_delta
-            self._pending_delta = None
+        bars, self._pending_bars = self._pending_bars, []
+        for data in bars:
             self._update_delta(data)
-        if self._pending_snapshot:
-            snap = self._pending_snapshot
-            self._pending_snapshot = None
-            self._update_from_snapshot(snap)
+        if bars or self._dirty:
+            self._dirty = False
+            self._redraw()
 
     def _update_delta(self, data: Dict) -> None:
-        now_ts = datetime.now(timezone.utc).timestamp()
         try:
-            delta_val = float(data.get("delta", data.get("cumulative_delta", 0.0)) or 0.0)
+            ts = float(data.get("bar_start", 0.0))
+            delta_val = float(data.get("delta", 0.0) or 0.0)
+            cvd_val = float(data.get("session_cvd", 0.0) or 0.0)
         except Exception:
-            delta_val = 0.0
-        self.stream.append((now_ts, delta_val))
-        last_cvd = self.cvd[-1][1] if self.cvd else 0.0
-        self.cvd.append((now_ts, last_cvd + delta_val))
-        self._redraw()
-
-    def _update_from_snapshot(self, snapshot: Dict) -> None:
-        now_ts = datetime.now(timezone.utc).timestamp()
-        if "cumulative_delta" in snapshot:
-            try:
-                cvd_val = float(snapshot.get("cumulative_delta", 0.0))
-            except Exception:
-                cvd_val = 0.0
-            self.cvd.append((now_ts, cvd_val))
-        if "price" in snapshot or "mid" in snapshot:
-            try:
-                price = float(snapshot.get("mid") or snapshot.get("price"))
-                self.price.append((now_ts, price))
-            except Exception:
-                pass
-        self._redraw()
-
-    def _detect_divergences(self) -> List[dict]:
-        points = []
-        if len(self.cvd) < 5 or len(self.price) < 5:
-            return points
-        # simple check: last cvd slope vs price slope
-        cvd_slope = self.cvd[-1][1] - self.cvd[-5][1]
-        price_slope = self.price[-1][1] - self.price[-5][1]
-        if cvd_slope * price_slope < 0:  # opposite directions
-            points.append({"pos": self.stream[-1], "brush": pg.mkBrush("#ffb02e")})
-        return points
+            return
+        session = data.get("session")
+        if session != self.session:
+            self.session = session
+            self.cvd.clear()
+        self.stream.append((ts, delta_val))
+        self.cvd.append((ts, cvd_val))
+
+    def _divergence_points(self) -> List[dict]:
+        colors = {"bullish": "#7cffc4", "bearish": "#ffb02e"}
+        return [
+            {"pos": (d.get("bar_start", 0.0), d.get("cvd", 0.0)), "brush": pg.mkBrush(colors.get(d.get("type"), "#ff5f56"))}
+            for d in self.divergences
+        ]
 
     def _redraw(self) -> None:
         if self.stream:
@@ -117,4 +100,4 @@ class DeltaPanel(QtWidgets.QWidget):
             self.curve_cvd.setData(xs, ys)
         else:
             self.curve_cvd.setData([], [])
-        self.divergence_scatter.setData(self._detect_divergences())
+        self.divergence_scatter.setData(self._divergence_points())
@@ -1,65 +1,88 @@
 from __future__ import annotations
 
+import numpy as np
 from PySide6 import QtWidgets, QtCore, QtGui
 from ui.event_bridge import EventBridge
 from ui.themes import brand
 from ui import helpers
 from ui.state import UIState
+from engines.liquidity_map.grid import HeatGrid
+
+_BID_RGB = np.array([18, 216, 250], dtype=np.float64)
+_ASK_RGB = np.array([255, 95, 86], dtype=np.float64)
 
 
 class HeatmapPanel(QtWidgets.QWidget):
+    """
+    Price x time liquidity heatmap. Mirrors the LiquidityMapEngine HeatGrid from its column
+    deltas and rebuilds the image only when a column arrives. One mirror per symbol; only the
+    active one (``set_symbol``, else the first symbol seen) is drawn.
+    """
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
-        self.ladder = []
-        self._pending = None
+        self.grid = HeatGrid()
+        self.grids = {}
+        self.symbol = None
+        self.tick_size = 1.0
+        self._image = None
+        self._dirty = False
         self._timer = QtCore.QTimer(self)
         self._timer.setInterval(int(1000 / 60))
         self._timer.timeout.connect(self.update)
         self._timer.start()
 
     def connect_bridge(self, bridge: EventBridge) -> None:
-        bridge.bus.subscribe("dom_snapshot", self._on_dom)
+        bridge.bus.subscribe("liquidity_update", self._on_liq)
+
+    def set_symbol(self, symbol: str) -> None:
+        if symbol != self.symbol:
+            self.symbol = symbol
+            self.grid = self.grids.setdefault(symbol, HeatGrid(self.grid.rows, self.grid.columns, self.grid.slice_seconds))
+            self._dirty = True
 
-    def _on_dom(self, evt) -> None:
+    def _on_liq(self, evt) -> None:
         payload = evt.payload or {}
-        ladder_raw = payload.get("ladder") or payload.get("dom") or payload.get("levels") or []
-        self.ladder = []
-        if isinstance(ladder_raw, dict):
-            for price, entry in ladder_raw.items():
-                if isinstance(entry, dict):
-                    self.ladder.append((float(price), float(entry.get("bid", 0)), float(entry.get("ask", 0))))
-        elif isinstance(ladder_raw, list):
-            for level in ladder_raw:
-                try:
-                    self.ladder.append((float(level.get("price")), float(level.get("bid", 0)), float(level.get("ask", 0))))
-                except Exception:
-                    continue
-        self.ladder = sorted(self.ladder, key=lambda r: r[0], reverse=True)[:80]
-        self.update()
+        if payload.get("slice") is None or payload.get("origin_tick") is None:
+            return
+        symbol = getattr(evt, "symbol", None)
+        if self.symbol is None:
+            self.set_symbol(symbol)
+        grid = self.grids.setdefault(symbol, HeatGrid(self.grid.rows, self.grid.columns, self.grid.slice_seconds))
+        grid.apply_column(payload["slice"], payload["origin_tick"], payload.get("rows", ()), payload.get("bid", ()), payload.get("ask", ()))
+        if symbol == self.symbol:
+            self.tick_size = float(payload.get("tick_size", self.tick_size) or self.tick_size)
+            self._dirty = True
+
+    def _render_image(self):
+        cols = self.grid.ordered_columns()
+        if not cols:
+            return None
+        bid = self.grid.bid[::-1, cols]  # highest price on top
+        ask = self.grid.ask[::-1, cols]
+        scale = max(float(bid.max()), float(ask.max())) or 1.0
+        bid_n, ask_n = bid / scale, ask / scale
+        intensity = np.maximum(bid_n, ask_n)
+        rgba = np.zeros(bid.shape + (4,), dtype=np.uint8)
+        rgb = np.where((bid_n >= ask_n)[..., None], _BID_RGB, _ASK_RGB)
+        rgba[..., :3] = rgb.astype(np.uint8)
+        rgba[..., 3] = np.where(intensity > 0, 40 + 215 * intensity, 0).astype(np.uint8)
+        rgba = np.ascontiguousarray(rgba)
+        h, w = rgba.shape[:2]
+        image = QtGui.QImage(rgba.data, w, h, 4 * w, QtGui.QImage.Format_RGBA8888)
+        return image.copy()
 
     def paintEvent(self, event) -> None:  # type: ignore[override]
         if UIState.is_paused():
             return
+        if self._dirty:
+            self._image = self._render_image()
+            self._dirty = False
         painter = QtGui.QPainter(self)
         try:
             painter.fillRect(self.rect(), QtGui.QColor(brand.BG_PANEL))
-            if not self.ladder:
+            if self._image is None:
                 return
-            w = self.width()
-            h = self.height()
-            max_size = max(max(b, a) for _, b, a in self.ladder) or 1.0
-            if max_size <= 0:
-                max_size = 1.0
-            row_h = max(2, h // max(1, len(self.ladder)))
-            for i, (price, bid, ask) in enumerate(self.ladder):
-                y = i * row_h
-                bid_w = int((bid / max_size) * (w / 2))
-                ask_w = int((ask / max_size) * (w / 2))
-                bid_rect = QtCore.QRect((w // 2) - bid_w, y, bid_w, row_h - 1)
-                ask_rect = QtCore.QRect(w // 2, y, ask_w, row_h - 1)
-                bid_color = QtGui.QColor(18, 216, 250, int(40 + 180 * (bid / max_size)))
-                ask_color = QtGui.QColor(255, 95, 86, int(40 + 180 * (ask / max_size)))
-                painter.fillRect(bid_rect, bid_color)
-                painter.fillRect(ask_rect, ask_color)
+            painter.drawImage(self.rect(), self._image)
         finally:
             painter.end()
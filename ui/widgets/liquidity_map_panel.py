@@ -5,16 +5,20 @@ from ui import helpers
 from ui.themes import brand
 from ui.event_bridge import EventBridge
 from ui.state import UIState
+from engines.liquidity_map.grid import HeatGrid
 
 
 class LiquidityMapPanel(QtWidgets.QWidget):
+    """Resting liquidity of the latest slice; mirrors one HeatGrid per symbol and shows the active one."""
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
+        self.grid = HeatGrid()
+        self.grids = {}
+        self.symbol = None
         self.resting = {}
         self.prev_resting = {}
         self.setMinimumHeight(120)
-        self._pending = None
-        self._max_history = 50
         self._timer = QtCore.QTimer(self)
         self._timer.setInterval(int(1000 / 60))
         self._timer.timeout.connect(self.update)
@@ -23,12 +27,40 @@ class LiquidityMapPanel(QtWidgets.QWidget):
     def connect_bridge(self, bridge: EventBridge) -> None:
         bridge.bus.subscribe("liquidity_update", self._on_liq)
 
+    def set_symbol(self, symbol: str) -> None:
+        if symbol != self.symbol:
+            self.symbol = symbol
+            self.grid = self.grids.setdefault(symbol, HeatGrid(self.grid.rows, self.grid.columns, self.grid.slice_seconds))
+            self.resting, self.prev_resting = {}, {}
+
     def _on_liq(self, evt):
-        self._pending = evt.payload
-        self.prev_resting = self.resting
-        self.resting = evt.payload.get("resting", {})
+        payload = evt.payload or {}
+        if payload.get("slice") is None or payload.get("origin_tick") is None:
+            return
+        symbol = getattr(evt, "symbol", None)
+        if self.symbol is None:
+            self.set_symbol(symbol)
+        grid = self.grids.setdefault(symbol, HeatGrid(self.grid.rows, self.grid.columns, self.grid.slice_seconds))
+        grid.slice_seconds = float(payload.get("slice_seconds", grid.slice_seconds) or grid.slice_seconds)
+        col = grid.apply_column(payload["slice"], payload["origin_tick"], payload.get("rows", ()), payload.get("bid", ()), payload.get("ask", ()))
+        if symbol != self.symbol:
+            return
+        tick_size = float(payload.get("tick_size", 1.0) or 1.0)
+        prev_col = (payload["slice"] - 1) % grid.columns
+        self.resting = self._column_levels(col, tick_size)
+        self.prev_resting = self._column_levels(prev_col, tick_size) if grid.slices[prev_col] == payload["slice"] - 1 else {}
         self.update()
 
+    def _column_levels(self, col: int, tick_size: float):
+        """Average resting size per price over one slice of the mirrored grid."""
+        grid = self.grid
+        bid, ask = grid.bid[:, col], grid.ask[:, col]
+        span = grid.slice_seconds
+        return {
+            round((grid.origin + int(r)) * tick_size, 10): {"bid": float(bid[r]) / span, "ask": float(ask[r]) / span}
+            for r in ((bid > 0) | (ask > 0)).nonzero()[0].tolist()
+        }
+
     def paintEvent(self, event) -> None:  # type: ignore[override]
         if UIState.is_paused():
             return
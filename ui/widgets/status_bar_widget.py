@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Callable, Dict, Optional
 
 from PySide6 import QtWidgets
 
@@ -9,30 +9,42 @@ from ui.event_bridge import EventBridge
 
 class StatusBarWidget(QtWidgets.QWidget):
     """
-    Compact status indicators for connections, risk and mode.
+    Compact status indicators for connections, risk and mode. The kill switch shows its state,
+    reason and the last flatten latency, with a reset button while it is engaged.
     """
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
+        self._on_reset_kill_switch: Optional[Callable[[], None]] = None
         self.conn_label = QtWidgets.QLabel("Conn: ?")
         self.risk_label = QtWidgets.QLabel("Risk: ?")
         self.mode_label = QtWidgets.QLabel("Mode: ?")
         self.lat_label = QtWidgets.QLabel("Latency: —")
         self.fps_label = QtWidgets.QLabel("FPS: —")
+        self.kill_label = QtWidgets.QLabel("Kill: off")
+        self.kill_reset = QtWidgets.QPushButton("Reset")
+        self.kill_reset.setEnabled(False)
+        self.kill_reset.clicked.connect(self._reset_kill_switch)
 
         layout = QtWidgets.QHBoxLayout()
         layout.addWidget(self.conn_label)
         layout.addWidget(self.risk_label)
+        layout.addWidget(self.kill_label)
+        layout.addWidget(self.kill_reset)
         layout.addWidget(self.mode_label)
         layout.addWidget(self.lat_label)
         layout.addWidget(self.fps_label)
         layout.addStretch()
         self.setLayout(layout)
 
-    def connect_bridge(self, bridge: EventBridge, mode: str = "sim") -> None:
+    def connect_bridge(
+        self, bridge: EventBridge, mode: str = "sim", on_reset_kill_switch: Optional[Callable[[], None]] = None
+    ) -> None:
         self.mode_label.setText(f"Mode: {mode}")
+        self._on_reset_kill_switch = on_reset_kill_switch
         bridge.orderStatusUpdated.connect(self._on_order)
         bridge.riskStatusUpdated.connect(self._on_risk)
+        bridge.killSwitchUpdated.connect(self._on_kill_switch)
 
     def _on_order(self, evt: Dict) -> None:
         broker = evt.get("source", "exec")
@@ -41,3 +53,18 @@ class StatusBarWidget(QtWidgets.QWidget):
     def _on_risk(self, evt: Dict) -> None:
         status = "OK" if evt.get("approved", True) else "HALT"
         self.risk_label.setText(f"Risk: {status}")
+
+    def _on_kill_switch(self, evt: Dict) -> None:
+        state = evt.get("state")
+        if state == "engaged":
+            self.kill_label.setText(f"Kill: ON ({evt.get('reason', '?')}, {evt.get('working', 0)} working)")
+            self.kill_reset.setEnabled(self._on_reset_kill_switch is not None)
+        elif state == "flat":
+            self.kill_label.setText(f"{self.kill_label.text()} flat in {float(evt.get('latency_ms', 0.0)):.1f} ms")
+        elif state == "reset":
+            self.kill_label.setText("Kill: off")
+            self.kill_reset.setEnabled(False)
+
+    def _reset_kill_switch(self) -> None:
+        if self._on_reset_kill_switch is not None:
+            self._on_reset_kill_switch()